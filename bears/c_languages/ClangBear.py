@@ -1,5 +1,7 @@
 from clang.cindex import Index, LibclangError
 
+from bears.c_languages.TranslationUnitCache import get_translation_unit_cache
+
 from coalib.bears.LocalBear import LocalBear
 from coalib.results.Diff import Diff
 from coalib.results.Result import Result
@@ -65,6 +67,44 @@ def sourcerange_from_clang_range(range):
                                    range.end.column)
 
 
+def walk_cursors(cursor, filename=None, stop_kinds=frozenset()):
+    """
+    Iterates over a clang cursor and all cursors below it in depth first
+    order. An explicit stack is used instead of recursion, so deep ASTs do
+    not hit the recursion limit.
+
+    :param cursor:     The ``cindex.Cursor`` to start at.
+    :param filename:   If given, cursors located in another file are skipped
+                       together with all cursors below them before their
+                       children are retrieved, so included headers are not
+                       traversed.
+    :param stop_kinds: A frozenset of ``cindex.CursorKind`` objects. Cursors
+                       of these kinds are yielded, but the cursors below them
+                       are not.
+    :return:           An iterator yielding the stack of each cursor, i.e. a
+                       list of tuples holding the cursors from ``cursor``
+                       down to the current one and their child number. The
+                       same list is updated in place, copy it to keep it.
+    """
+    stack = []
+    pending = [(cursor, 0, 0)]
+    while pending:
+        current, child_num, depth = pending.pop()
+        if filename is not None:
+            file = current.location.file
+            if file is not None and file.name != filename:
+                continue
+
+        del stack[depth:]
+        stack.append((current, child_num))
+        yield stack
+
+        if current.kind not in stop_kinds:
+            children = list(current.get_children())
+            pending.extend((children[index], index, depth + 1)
+                           for index in range(len(children) - 1, -1, -1))
+
+
 class ClangBear(LocalBear):
     LANGUAGES = {'C', 'C++', 'Objective-C', 'Objective-C++', 'OpenMP',
                  'OpenCL', 'CUDA'}
@@ -88,11 +128,10 @@ class ClangBear(LocalBear):
         :param clang_cli_options: Any options that will be passed through to
                                   Clang.
         """
-        index = Index.create()
-        diagnostics = index.parse(
+        diagnostics = get_translation_unit_cache().parse(
             filename,
             args=clang_cli_options,
-            unsaved_files=[(filename, ''.join(file))]).diagnostics
+            content=''.join(file)).diagnostics
         for diag in diagnostics:
             severity = {0: RESULT_SEVERITY.INFO,
                         1: RESULT_SEVERITY.INFO,
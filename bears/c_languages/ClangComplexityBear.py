@@ -1,10 +1,12 @@
-from clang.cindex import Index, CursorKind
+from clang.cindex import CursorKind
 
 from coalib.bears.LocalBear import LocalBear
 from coalib.results.Result import Result
 from coalib.results.SourceRange import SourceRange
 from coalib.bearlib import deprecate_settings
-from bears.c_languages.ClangBear import clang_available, ClangBear
+from bears.c_languages.ClangBear import (
+    clang_available, ClangBear, walk_cursors)
+from bears.c_languages.TranslationUnitCache import get_translation_unit_cache
 
 
 class ClangComplexityBear(LocalBear):
@@ -21,9 +23,10 @@ class ClangComplexityBear(LocalBear):
     CAN_DETECT = {'Complexity'}
 
     check_prerequisites = classmethod(clang_available)
-    _decisive_cursor_kinds = {
+    _decisive_cursor_kinds = frozenset({
         CursorKind.IF_STMT, CursorKind.WHILE_STMT, CursorKind.FOR_STMT,
-        CursorKind.DEFAULT_STMT, CursorKind.CASE_STMT}
+        CursorKind.DEFAULT_STMT, CursorKind.CASE_STMT})
+    _function_cursor_kinds = frozenset({CursorKind.FUNCTION_DECL})
 
     def function_key_points(self, cursor, top_function_level=False):
         """
@@ -34,17 +37,18 @@ class ClangComplexityBear(LocalBear):
         """
         decisions, exits = 0, 0
 
-        for child in cursor.get_children():
-            if child.kind in self._decisive_cursor_kinds:
+        stack = walk_cursors(cursor)
+        # The cursor itself is not counted.
+        next(stack)
+        for parents in stack:
+            kind = parents[-1][0].kind
+            if kind in self._decisive_cursor_kinds:
                 decisions += 1
-            elif child.kind == CursorKind.RETURN_STMT:
+            elif kind == CursorKind.RETURN_STMT:
                 exits += 1
-                if top_function_level:
+                if top_function_level and len(parents) == 2:
                     # There is no point to move forward, so just return.
                     return decisions, exits
-            child_decisions, child_exits = self.function_key_points(child)
-            decisions += child_decisions
-            exits += child_exits
 
         if top_function_level:
             # Implicit return statement.
@@ -57,23 +61,18 @@ class ClangComplexityBear(LocalBear):
         Calculates cyclomatic complexities of functions.
         """
 
-        file = cursor.location.file
-
-        if file is not None and file.name != filename:
-            # There is nothing to do in another file.
-            return
-
-        if cursor.kind == CursorKind.FUNCTION_DECL:
-            child = next((child for child in cursor.get_children()
-                          if child.kind != CursorKind.PARM_DECL),
-                         None)
-            if child:
-                decisions, exits = self.function_key_points(child, True)
-                complexity = max(1, decisions - exits + 2)
-                yield cursor, complexity
-        else:
-            for child in cursor.get_children():
-                yield from self.complexities(child, filename)
+        # There is nothing to do in another file.
+        for parents in walk_cursors(cursor, filename,
+                                    self._function_cursor_kinds):
+            cursor = parents[-1][0]
+            if cursor.kind in self._function_cursor_kinds:
+                child = next((child for child in cursor.get_children()
+                              if child.kind != CursorKind.PARM_DECL),
+                             None)
+                if child:
+                    decisions, exits = self.function_key_points(child, True)
+                    complexity = max(1, decisions - exits + 2)
+                    yield cursor, complexity
 
     @deprecate_settings(cyclomatic_complexity='max_complexity')
     def run(self, filename, file,
@@ -95,7 +94,8 @@ class ClangComplexityBear(LocalBear):
                                 explanation of why the limit was exceeded."
         """
 
-        root = Index.create().parse(filename).cursor
+        root = get_translation_unit_cache().parse(
+            filename, content=''.join(file)).cursor
         for cursor, complexity in self.complexities(root, filename):
             if complexity > cyclomatic_complexity:
                 affected_code = (SourceRange.from_clang_range(cursor.extent),)
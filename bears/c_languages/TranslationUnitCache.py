@@ -0,0 +1,144 @@
+from collections import OrderedDict
+from functools import lru_cache
+from hashlib import sha256
+import threading
+
+from clang.cindex import Index, TranslationUnit
+
+
+class TranslationUnitCache:
+    """
+    Keeps the most recently used clang translation units of a process, so a
+    file checked by several clang based bears is only parsed once.
+
+    Entries are keyed by the filename only. Every file is parsed with the
+    union of the parse options all users need, and with the compiler
+    arguments of all users that asked for it so far: if a user passes
+    arguments the translation unit was not parsed with, the file is parsed
+    again with them appended and the new unit replaces the old one. If the
+    content of a file changed since it was parsed, its translation unit is
+    reparsed, reusing the precompiled preamble, i.e. the parsed headers
+    included at the top of the file.
+
+    All users should pass the content of the file as coala read it, since
+    the digest of the content on disk differs from it for files with CRLF
+    line endings or another encoding than UTF-8.
+    """
+
+    # The detailed processing record is needed by ClangASTPrintBear, the
+    # precompiled preamble speeds up reparsing.
+    PARSE_OPTIONS = (TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD |
+                     TranslationUnit.PARSE_PRECOMPILED_PREAMBLE)
+
+    # The number of translation units kept by default. Translation units of
+    # big files may take tens of megabytes each.
+    DEFAULT_MAX_UNITS = 8
+
+    def __init__(self, max_units=DEFAULT_MAX_UNITS):
+        """
+        :param max_units: The maximum number of translation units to keep.
+                          The least recently used one is dropped first.
+        """
+        self.max_units = max_units
+        self.units = OrderedDict()
+        self._index = None
+        self._lock = threading.Lock()
+
+    @property
+    def index(self):
+        """
+        The clang index all translation units are parsed with. It is created
+        on first use.
+        """
+        if self._index is None:
+            self._index = Index.create()
+        return self._index
+
+    @staticmethod
+    def get_digest(filename, content=None):
+        """
+        Computes the hash of the content of a file.
+
+        :param filename: The path of the file.
+        :param content:  The content of the file as string or None to read
+                         it from disk.
+        :return:         The hexadecimal SHA-256 digest or None if the file
+                         cannot be read.
+        """
+        if content is not None:
+            data = content.encode('utf-8', 'surrogateescape')
+        else:
+            try:
+                with open(filename, 'rb') as file:
+                    data = file.read()
+            except OSError:
+                return None
+        return sha256(data).hexdigest()
+
+    def parse(self, filename, args=None, content=None):
+        """
+        Retrieves the translation unit of a file, parsing it if it is not in
+        the cache or was not parsed with all of the given arguments, or
+        reparsing it if its content changed.
+
+        :param filename: The path of the file.
+        :param args:     The compiler arguments to parse the file with. The
+                         returned translation unit may have been parsed with
+                         the arguments of other users in addition.
+        :param content:  The content of the file as string or None to parse
+                         the file on disk.
+        :return:         The ``clang.cindex.TranslationUnit``. It must not be
+                         modified, it is shared with other users of the
+                         cache.
+        """
+        args = tuple(args or ())
+        digest = self.get_digest(filename, content)
+        unsaved_files = [(filename, content)] if content is not None else None
+
+        with self._lock:
+            entry = self.units.get(filename)
+            if entry is not None and digest is not None:
+                unit_digest, unit_args, unit = entry
+                if self._contains_args(unit_args, args):
+                    self.units.move_to_end(filename)
+                    if unit_digest != digest:
+                        unit.reparse(unsaved_files)
+                        self.units[filename] = (digest, unit_args, unit)
+                    return unit
+                args = unit_args + args
+
+            unit = self.index.parse(filename,
+                                    args=list(args),
+                                    unsaved_files=unsaved_files,
+                                    options=self.PARSE_OPTIONS)
+            if digest is not None and self.max_units > 0:
+                self.units[filename] = (digest, args, unit)
+                self.units.move_to_end(filename)
+                while len(self.units) > self.max_units:
+                    self.units.popitem(last=False)
+            return unit
+
+    @staticmethod
+    def _contains_args(unit_args, args):
+        """
+        Checks whether a translation unit was parsed with the given
+        arguments, i.e. whether they appear in order within its arguments.
+
+        :param unit_args: The arguments the translation unit was parsed with.
+        :param args:      The requested arguments.
+        :return:          True if ``args`` is a contiguous part of
+                          ``unit_args``.
+        """
+        return any(unit_args[index:index + len(args)] == args
+                   for index in range(len(unit_args) - len(args) + 1))
+
+
+@lru_cache()
+def get_translation_unit_cache():
+    """
+    Retrieves the ``TranslationUnitCache`` shared by all clang based bears of
+    this process.
+
+    :return: The ``TranslationUnitCache`` instance.
+    """
+    return TranslationUnitCache()
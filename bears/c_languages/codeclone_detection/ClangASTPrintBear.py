@@ -1,6 +1,5 @@
-from clang.cindex import Index, TranslationUnit
-
 from bears.c_languages.ClangBear import clang_available, ClangBear
+from bears.c_languages.TranslationUnitCache import get_translation_unit_cache
 from coalib.bears.GlobalBear import GlobalBear
 
 
@@ -57,9 +56,7 @@ class ClangASTPrintBear(GlobalBear):
         prints out the whole AST for a file to the DEBUG channel.
         """
         for filename, file in sorted(self.file_dict.items()):
-            root = Index.create().parse(
-                filename,
-                options=TranslationUnit.PARSE_DETAILED_PROCESSING_RECORD
-                ).cursor
+            root = get_translation_unit_cache().parse(
+                filename, content=''.join(file)).cursor
 
             self.print_node(root, filename)
@@ -1,9 +1,14 @@
+import heapq
+
 from bears.c_languages.ClangBear import clang_available, ClangBear
 from bears.c_languages.codeclone_detection.ClangFunctionDifferenceBear import (
     ClangFunctionDifferenceBear)
+from bears.c_languages.codeclone_detection.CloneDetectionRoutines import (
+    get_clone_clusters)
 from coalib.bears.GlobalBear import GlobalBear
 from coalib.results.Result import Result
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
+from coalib.results.SourceRange import SourceRange
 
 
 class ClangCloneDetectionBear(GlobalBear):
@@ -16,22 +21,43 @@ class ClangCloneDetectionBear(GlobalBear):
     def run(self,
             dependency_results: dict,
             max_clone_difference: float = 0.185,
+            max_clone_pairs: int = 0,
+            debug_count_matrices: bool = False,
             ):
         '''
         Checks the given code for similar functions that are probably
         redundant.
 
+        Functions that are clones of each other, directly or through another
+        function, are reported together in one result.
+
         :param max_clone_difference: The maximum difference a clone should
                                      have.
+        :param max_clone_pairs:      If set, only this number of the most
+                                     similar function pairs is reported, one
+                                     result per pair, instead of one result
+                                     per group of clones.
+        :param debug_count_matrices: Set to true to attach the count matrices
+                                     of the functions to the results as
+                                     debug message.
         '''
         differences = dependency_results[
             ClangFunctionDifferenceBear.__name__][0].contents
         count_matrices = dependency_results[
             ClangFunctionDifferenceBear.__name__][1].contents
 
+        def get_debug_msg(functions):
+            return ([count_matrices[function] for function in functions]
+                    if debug_count_matrices else '')
+
         self.debug('Creating results...')
-        for function_1, function_2, difference in differences:
-            if difference < max_clone_difference:
+        if max_clone_pairs > 0:
+            clone_pairs = heapq.nsmallest(
+                max_clone_pairs,
+                (difference for difference in differences
+                 if difference[2] < max_clone_difference),
+                key=lambda difference: difference[2])
+            for function_1, function_2, difference in clone_pairs:
                 yield Result.from_values(
                     self,
                     'Code clone found. The other occurrence is at file '
@@ -44,5 +70,20 @@ class ClangCloneDetectionBear(GlobalBear):
                     file=function_1[0],
                     severity=RESULT_SEVERITY.MAJOR,
                     line=function_1[1],
-                    debug_msg=[count_matrices[function_1],
-                               count_matrices[function_2]])
+                    debug_msg=get_debug_msg((function_1, function_2)))
+            return
+
+        for functions, difference in get_clone_clusters(differences,
+                                                        max_clone_difference):
+            yield Result(
+                self,
+                'Code clones found. The functions {functions} are similar. '
+                'The smallest difference is {difference}%.'.format(
+                    functions=', '.join(
+                        '{} (file {}, line {})'.format(function, file, line)
+                        for file, line, function in functions),
+                    difference=difference),
+                affected_code=tuple(SourceRange.from_values(file, line)
+                                    for file, line, _ in functions),
+                severity=RESULT_SEVERITY.MAJOR,
+                debug_msg=get_debug_msg(functions))
@@ -1,7 +1,10 @@
-from clang.cindex import Cursor, Index
+from clang.cindex import Cursor
 
+from bears.c_languages.ClangBear import walk_cursors
+from bears.c_languages.TranslationUnitCache import get_translation_unit_cache
 from bears.c_languages.codeclone_detection.ClangCountingConditions import (
-    get_identifier_name, is_function_declaration, is_literal, is_reference)
+    FUNCTION_DECLARATION_KINDS, get_identifier_name, LITERAL_KINDS,
+    REFERENCE_KINDS)
 from bears.c_languages.codeclone_detection.CountVector import CountVector
 
 
@@ -46,7 +49,7 @@ class ClangCountVectorCreator:
 
         self.count_vectors[identifier].count_reference(self.stack)
 
-    def _get_vector_for_function(self, cursor, child_num=0):
+    def _get_vector_for_function(self, cursor):
         """
         Creates a CountVector object for the given cursor.
 
@@ -61,21 +64,19 @@ class ClangCountVectorCreator:
         :param cursor: Clang cursor to iterate over.
         """
         assert isinstance(cursor, Cursor)
-        self.stack.append((cursor, child_num))
+        for self.stack in walk_cursors(cursor):
+            current = self.stack[-1][0]
+            kind = current.kind
+            if kind in REFERENCE_KINDS:
+                self.count_identifier(get_identifier_name(current),
+                                      CountVector.Category.reference)
+            if kind in LITERAL_KINDS:
+                tokens = list(current.get_tokens())
+                if tokens:
+                    self.count_identifier(tokens[0].spelling,
+                                          CountVector.Category.literal)
 
-        if is_reference(cursor):
-            self.count_identifier(get_identifier_name(cursor),
-                                  CountVector.Category.reference)
-        if is_literal(cursor):
-            tokens = list(cursor.get_tokens())
-            if tokens:
-                self.count_identifier(tokens[0].spelling,
-                                      CountVector.Category.literal)
-
-        for i, child in enumerate(cursor.get_children()):
-            self._get_vector_for_function(child, i)
-
-        self.stack.pop()
+        self.stack = []
 
     def _get_vectors_for_cursor(self, cursor, filename):
         """
@@ -88,26 +89,23 @@ class ClangCountVectorCreator:
                          in all functions.
         """
         assert isinstance(cursor, Cursor)
-        file = cursor.location.file
-        if file is not None:
-            file = file.name
-
-        if str(file) == str(filename) and is_function_declaration(cursor):
-            self._get_vector_for_function(cursor)
-
-            result = {(cursor.extent.start.line,
-                       get_identifier_name(cursor)): self.count_vectors}
-            # Reset local states
-            self.count_vectors = {}
-            self.stack = []
-        else:
-            result = {}
-            for child in cursor.get_children():
-                result.update(self._get_vectors_for_cursor(child, filename))
+        result = {}
+        # Cursors of included files are skipped up front.
+        for stack in walk_cursors(cursor, str(filename),
+                                  FUNCTION_DECLARATION_KINDS):
+            current = stack[-1][0]
+            if current.kind in FUNCTION_DECLARATION_KINDS:
+                self._get_vector_for_function(current)
+
+                result[(current.extent.start.line,
+                        get_identifier_name(current))] = self.count_vectors
+                # Reset local states
+                self.count_vectors = {}
+                self.stack = []
 
         return result
 
-    def get_vectors_for_file(self, filename, include_paths=()):
+    def get_vectors_for_file(self, filename, include_paths=(), content=None):
         """
         Creates a dictionary associating each function name within the given
         file with another dictionary associating each variable name (local to
@@ -115,10 +113,13 @@ class ClangCountVectorCreator:
         will not be analyzed.
 
         :param filename: The path to the file to parse.
+        :param content:  The content of the file as string or None to parse
+                         the file on disk.
         :return:         The dictionary holding CountVectors for all variables
                          in all functions.
         """
         args = ['-I'+path for path in include_paths]
-        root = Index.create().parse(filename, args=args).cursor
+        root = get_translation_unit_cache().parse(
+            filename, args=args, content=content).cursor
 
         return self._get_vectors_for_cursor(root, filename)
@@ -10,6 +10,20 @@ from clang.cindex import CursorKind
 from coalib.misc.Enum import enum
 
 
+FUNCTION_DECLARATION_KINDS = frozenset({CursorKind.FUNCTION_DECL})
+LITERAL_KINDS = frozenset({CursorKind.INTEGER_LITERAL,
+                           CursorKind.FLOATING_LITERAL,
+                           CursorKind.IMAGINARY_LITERAL,
+                           CursorKind.STRING_LITERAL,
+                           CursorKind.CHARACTER_LITERAL,
+                           CursorKind.OBJC_STRING_LITERAL,
+                           CursorKind.CXX_BOOL_LITERAL_EXPR,
+                           CursorKind.CXX_NULL_PTR_LITERAL_EXPR})
+REFERENCE_KINDS = frozenset({CursorKind.VAR_DECL,
+                             CursorKind.PARM_DECL,
+                             CursorKind.DECL_REF_EXPR})
+
+
 def is_function_declaration(cursor):
     """
     Checks if the given clang cursor is a function declaration.
@@ -17,7 +31,7 @@ def is_function_declaration(cursor):
     :param cursor: A clang cursor from the AST.
     :return:       A bool.
     """
-    return cursor.kind == CursorKind.FUNCTION_DECL
+    return cursor.kind in FUNCTION_DECLARATION_KINDS
 
 
 def get_identifier_name(cursor):
@@ -35,14 +49,7 @@ def is_literal(cursor):
     :param cursor: A clang cursor from the AST.
     :return:       True if the cursor is a literal of any kind..
     """
-    return cursor.kind in [CursorKind.INTEGER_LITERAL,
-                           CursorKind.FLOATING_LITERAL,
-                           CursorKind.IMAGINARY_LITERAL,
-                           CursorKind.STRING_LITERAL,
-                           CursorKind.CHARACTER_LITERAL,
-                           CursorKind.OBJC_STRING_LITERAL,
-                           CursorKind.CXX_BOOL_LITERAL_EXPR,
-                           CursorKind.CXX_NULL_PTR_LITERAL_EXPR]
+    return cursor.kind in LITERAL_KINDS
 
 
 def is_reference(cursor):
@@ -53,9 +60,7 @@ def is_reference(cursor):
     :param cursor: A clang cursor from the AST.
     :return:       True if the cursor is a reference.
     """
-    return cursor.kind in [CursorKind.VAR_DECL,
-                           CursorKind.PARM_DECL,
-                           CursorKind.DECL_REF_EXPR]
+    return cursor.kind in REFERENCE_KINDS
 
 
 def _stack_contains_kind(stack, kind):
@@ -1,5 +1,5 @@
-import functools
-from itertools import combinations
+from itertools import islice
+import multiprocessing
 
 from bears.c_languages.ClangBear import clang_available, ClangBear
 from bears.c_languages.codeclone_detection.ClangCountingConditions import (
@@ -7,7 +7,10 @@ from bears.c_languages.codeclone_detection.ClangCountingConditions import (
 from bears.c_languages.codeclone_detection.ClangCountVectorCreator import (
     ClangCountVectorCreator)
 from bears.c_languages.codeclone_detection.CloneDetectionRoutines import (
-    compare_functions, get_count_matrices)
+    compare_count_arrays, get_candidate_pairs, get_count_array,
+    get_count_matrices)
+from bears.c_languages.codeclone_detection.CountMatrixCache import (
+    CountMatrixCache)
 from coala_utils.string_processing.StringConverter import StringConverter
 from coalib.bears.GlobalBear import GlobalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
@@ -45,46 +48,111 @@ in_product: 0,
 in_binary_operation,
 member_accessed"""))
 
+# Number of function pairs compared in one work unit.
+COMPARISON_CHUNK_SIZE = 200
 
-def get_difference(function_pair,
-                   count_matrices,
-                   average_calculation,
-                   poly_postprocessing,
-                   exp_postprocessing):
+
+class FunctionPairComparer:
+    """
+    Compares pairs of functions given by their indices into a list of count
+    arrays. An instance is sent to each worker process once so only the
+    indices need to be sent for each work unit.
+    """
+
+    def __init__(self,
+                 count_arrays,
+                 average_calculation,
+                 poly_postprocessing,
+                 exp_postprocessing):
+        """
+        :param count_arrays:        A list holding the count arrays of all
+                                    functions, see ``get_count_array``.
+        :param average_calculation: If set to true the difference calculation
+                                    function will take the average of all
+                                    variable differences as the difference,
+                                    else it will normalize the function as a
+                                    whole and thus weighting in variables
+                                    dependent on their size.
+        :param poly_postprocessing: If set to true, the difference value of big
+                                    function pairs will be reduced using a
+                                    polynomial approach.
+        :param exp_postprocessing:  If set to true, the difference value of big
+                                    function pairs will be reduced using an
+                                    exponential approach.
+        """
+        self.count_arrays = count_arrays
+        self.average_calculation = average_calculation
+        self.poly_postprocessing = poly_postprocessing
+        self.exp_postprocessing = exp_postprocessing
+
+    def __call__(self, index_pairs):
+        """
+        Retrieves the differences between the given function pairs using the
+        munkres algorithm.
+
+        :param index_pairs: A list of tuples containing two indices into the
+                            count arrays.
+        :return:            A list of tuples containing both indices and the
+                            difference of the functions.
+        """
+        return [(index_1,
+                 index_2,
+                 compare_count_arrays(self.count_arrays[index_1],
+                                      self.count_arrays[index_2],
+                                      self.average_calculation,
+                                      self.poly_postprocessing,
+                                      self.exp_postprocessing))
+                for index_1, index_2 in index_pairs]
+
+
+# The FunctionPairComparer of a worker process, set up by _init_worker.
+_worker_comparer = None
+
+
+def _init_worker(comparer):
+    global _worker_comparer
+    _worker_comparer = comparer
+
+
+def _compare_in_worker(index_pairs):
+    return _worker_comparer(index_pairs)
+
+
+def compare_function_pairs(comparer, index_pairs, processes=1):
     """
-    Retrieves the difference between two functions using the munkres algorithm.
-
-    :param function_pair:       A tuple containing both indices for the
-                                count_matrices dictionary.
-    :param count_matrices:      A dictionary holding CMs.
-    :param average_calculation: If set to true the difference calculation
-                                function will take the average of all variable
-                                differences as the difference, else it will
-                                normalize the function as a whole and thus
-                                weighting in variables dependent on their size.
-    :param poly_postprocessing: If set to true, the difference value of big
-                                function pairs will be reduced using a
-                                polynomial approach.
-    :param exp_postprocessing:  If set to true, the difference value of big
-                                function pairs will be reduced using an
-                                exponential approach.
-    :return:                    A tuple containing both function ids and their
-                                difference.
+    Compares function pairs in work units of ``COMPARISON_CHUNK_SIZE`` pairs,
+    optionally spread over several processes.
+
+    :param comparer:    The ``FunctionPairComparer`` to use.
+    :param index_pairs: An iterable of tuples containing two indices into the
+                        count arrays of the comparer.
+    :param processes:   The number of processes to use. The comparison is
+                        done within this process if 1, all CPUs are used if
+                        0.
+    :return:            An iterator yielding a list of tuples containing both
+                        indices and their difference for each work unit, in
+                        the order of ``index_pairs``.
     """
-    function_1, function_2 = function_pair
-    return (function_1,
-            function_2,
-            compare_functions(count_matrices[function_1],
-                              count_matrices[function_2],
-                              average_calculation,
-                              poly_postprocessing,
-                              exp_postprocessing))
+    index_pairs = iter(index_pairs)
+    chunks = iter(
+        lambda: list(islice(index_pairs, COMPARISON_CHUNK_SIZE)), [])
+
+    if processes == 1:
+        yield from map(comparer, chunks)
+        return
+
+    with multiprocessing.Pool(processes or None,
+                              _init_worker,
+                              (comparer,)) as pool:
+        # imap keeps the order of the work units
+        yield from pool.imap(_compare_in_worker, chunks)
 
 
 class ClangFunctionDifferenceBear(GlobalBear):
     check_prerequisites = classmethod(clang_available)
     LANGUAGES = ClangBear.LANGUAGES
-    REQUIREMENTS = ClangBear.REQUIREMENTS | {PipRequirement('munkres3', '1.0')}
+    REQUIREMENTS = ClangBear.REQUIREMENTS | {PipRequirement('munkres3', '1.0'),
+                                             PipRequirement('numpy', '1.13')}
 
     def run(self,
             counting_conditions: counting_condition_dict = default_cc_dict,
@@ -92,6 +160,11 @@ class ClangFunctionDifferenceBear(GlobalBear):
             poly_postprocessing: bool = True,
             exp_postprocessing: bool = False,
             extra_include_paths: path_list = (),
+            max_clone_difference: float = 0.185,
+            comparison_processes: int = 1,
+            parsing_processes: int = 1,
+            count_matrix_cache_dir: str = '',
+            clones_only: bool = False,
             ):
         """
         Retrieves similarities for code clone detection. Those can be reused in
@@ -130,39 +203,119 @@ class ClangFunctionDifferenceBear(GlobalBear):
         :param exp_postprocessing:  If set to true, the difference value of big
                                     function pairs will be reduced using an
                                     exponential approach.
+        :param max_clone_difference:
+                                    Function pairs that are guaranteed to
+                                    differ at least by this value are not
+                                    compared and left out of the
+                                    differences. This should be the value
+                                    used by the ``ClangCloneDetectionBear``.
+        :param comparison_processes:
+                                    The number of processes to compare
+                                    function pairs with. All available CPUs
+                                    are used if set to 0.
+        :param parsing_processes:   The number of processes to parse the
+                                    files with. All available CPUs are used
+                                    if set to 0.
+        :param count_matrix_cache_dir:
+                                    A directory to keep the count matrices of
+                                    all files in between runs. Only files that
+                                    changed are parsed again. No cache is
+                                    used if empty.
+        :param clones_only:         If set to true, only function pairs that
+                                    differ by less than
+                                    ``max_clone_difference`` are kept in the
+                                    differences. This keeps them small on
+                                    large code bases.
         """
         self.debug('Using the following counting conditions:')
         for key, val in counting_conditions.items():
             self.debug(' *', key.__name__, '(weighting: {})'.format(val))
 
+        conditions = list(counting_conditions.keys())
+        weightings = list(counting_conditions.values())
+        count_matrix_cache = (
+            CountMatrixCache(count_matrix_cache_dir, conditions, weightings)
+            if count_matrix_cache_dir else None)
+
         self.debug('Creating count matrices...')
         count_matrices = get_count_matrices(
-            ClangCountVectorCreator(list(counting_conditions.keys()),
-                                    list(counting_conditions.values())),
+            ClangCountVectorCreator(conditions, weightings),
             list(self.file_dict.keys()),
             lambda prog: self.debug('{:2.4f}%...'.format(prog)),
             self.section['files'].origin,
-            collect_dirs(extra_include_paths))
+            collect_dirs(extra_include_paths),
+            count_matrix_cache,
+            parsing_processes,
+            self.file_dict)
 
         self.debug('Calculating differences...')
+        differences = self.get_differences(count_matrices,
+                                           max_clone_difference,
+                                           average_calculation,
+                                           poly_postprocessing,
+                                           exp_postprocessing,
+                                           comparison_processes)
+        if clones_only:
+            differences = (difference for difference in differences
+                           if difference[2] < max_clone_difference)
+
+        yield HiddenResult(self, list(differences))
+        yield HiddenResult(self, count_matrices)
+
+    def get_differences(self,
+                        count_matrices,
+                        max_clone_difference,
+                        average_calculation=False,
+                        poly_postprocessing=True,
+                        exp_postprocessing=False,
+                        comparison_processes=1):
+        """
+        Compares all function pairs that may be clones.
 
-        differences = []
+        :param count_matrices:       A dict mapping function keys to their
+                                     count matrices.
+        :param max_clone_difference: Function pairs that are guaranteed to
+                                     differ at least by this value are not
+                                     compared.
+        :param average_calculation:  See ``compare_count_arrays``.
+        :param poly_postprocessing:  See ``compare_count_arrays``.
+        :param exp_postprocessing:   See ``compare_count_arrays``.
+        :param comparison_processes: The number of processes to compare
+                                     function pairs with, see
+                                     ``compare_function_pairs``.
+        :return:                     An iterator yielding tuples containing
+                                     two function keys and their difference
+                                     as soon as they are compared.
+        """
         function_count = len(count_matrices)
         # Thats n over 2, hardcoded to simplify calculation
         combination_length = function_count * (function_count-1) / 2
-        partial_get_difference = functools.partial(
-            get_difference,
-            count_matrices=count_matrices,
-            average_calculation=average_calculation,
-            poly_postprocessing=poly_postprocessing,
-            exp_postprocessing=exp_postprocessing)
-
-        for i, elem in enumerate(
-                map(partial_get_difference,
-                    [(f1, f2) for f1, f2 in combinations(count_matrices, 2)])):
-            if i % 50 == 0:
-                self.debug('{:2.4f}%...'.format(100*i/combination_length))
-            differences.append(elem)
-
-        yield HiddenResult(self, differences)
-        yield HiddenResult(self, count_matrices)
+        functions = list(count_matrices)
+        count_arrays = [get_count_array(count_matrices[function])
+                        for function in functions]
+        comparer = FunctionPairComparer(count_arrays,
+                                        average_calculation,
+                                        poly_postprocessing,
+                                        exp_postprocessing)
+        candidate_pairs = get_candidate_pairs(dict(enumerate(count_arrays)),
+                                              max_clone_difference,
+                                              average_calculation,
+                                              poly_postprocessing,
+                                              exp_postprocessing)
+
+        compared = 0
+        for chunk in compare_function_pairs(comparer,
+                                            candidate_pairs,
+                                            comparison_processes):
+            for index_1, index_2, difference in chunk:
+                yield functions[index_1], functions[index_2], difference
+            compared += len(chunk)
+            # The number of candidate pairs is only known once all are
+            # compared. They come ordered by their first function though, so
+            # all pairs of the functions before the one of the last pair are
+            # done.
+            self.debug('{:2.4f}%...'.format(
+                100*chunk[-1][0]/function_count))
+
+        self.debug('Compared {} of {:.0f} function pairs.'.format(
+            compared, combination_length))
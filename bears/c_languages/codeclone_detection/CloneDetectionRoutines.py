@@ -1,8 +1,10 @@
-import copy
+from itertools import combinations
 import math
+import multiprocessing
 import os
 
 from munkres import Munkres
+import numpy
 
 from coalib.collecting.Collectors import collect_dirs
 from bears.c_languages.codeclone_detection.CountVector import CountVector
@@ -36,11 +38,31 @@ def exclude_function(count_matrix):
             var_count < 2)
 
 
+# The count vector creator and include paths of a parsing worker process,
+# set up by _init_parsing_worker.
+_parsing_worker_state = {}
+
+
+def _init_parsing_worker(count_vector_creator, include_paths):
+    _parsing_worker_state['count_vector_creator'] = count_vector_creator
+    _parsing_worker_state['include_paths'] = include_paths
+
+
+def _get_vectors_in_worker(file):
+    filename, content = file
+    return filename, _parsing_worker_state[
+        'count_vector_creator'].get_vectors_for_file(
+            filename, _parsing_worker_state['include_paths'], content)
+
+
 def get_count_matrices(count_vector_creator,
                        filenames,
                        progress_callback,
                        base_path,
-                       extra_include_paths):
+                       extra_include_paths,
+                       count_matrix_cache=None,
+                       processes=1,
+                       file_dict=None):
     """
     Retrieves matrices holding count vectors for all variables for all
     functions in the given file.
@@ -52,20 +74,64 @@ def get_count_matrices(count_vector_creator,
                                  called after processing each file with the
                                  progress percentage (float) as an argument.
     :param extra_include_paths:  A list containing additional include paths.
+    :param count_matrix_cache:   An optional ``CountMatrixCache`` to retrieve
+                                 the count vectors of unchanged files from.
+    :param processes:            The number of processes to parse the files
+                                 with. Each process gets its own copy of the
+                                 count vector creator. The files are parsed
+                                 within this process if 1, all CPUs are used
+                                 if 0.
+    :param file_dict:            An optional dict holding the lines of the
+                                 files to parse instead of the files on disk.
     :return:                     A dict holding a tuple of (file, line,
                                  function) as key and as value a dict with
                                  variable names as key and count vector
                                  objects as value.
     """
-    result = {}
     maxlen = len(filenames)
     include_paths = collect_dirs([os.path.dirname(base_path) + '/**'])
     include_paths += extra_include_paths
 
-    for i, filename in enumerate(filenames):
-        progress_callback(100*(i/maxlen))
-        count_dict = count_vector_creator.get_vectors_for_file(filename,
-                                                               include_paths)
+    count_dicts = {}
+    keys = {}
+    if count_matrix_cache is not None:
+        for filename in filenames:
+            keys[filename] = count_matrix_cache.get_key(filename,
+                                                        include_paths)
+            count_dict = count_matrix_cache.get(keys[filename])
+            if count_dict is not None:
+                count_dicts[filename] = count_dict
+    uncached = [(filename,
+                 ''.join(file_dict[filename])
+                 if file_dict is not None else None)
+                for filename in filenames
+                if filename not in count_dicts]
+
+    progress_callback(100*(len(count_dicts)/maxlen) if maxlen else 100)
+    if processes == 1 or len(uncached) < 2:
+        _init_parsing_worker(count_vector_creator, include_paths)
+        parsed = map(_get_vectors_in_worker, uncached)
+        pool = None
+    else:
+        pool = multiprocessing.Pool(processes or None,
+                                    _init_parsing_worker,
+                                    (count_vector_creator, include_paths))
+        parsed = pool.imap_unordered(_get_vectors_in_worker, uncached)
+
+    try:
+        for filename, count_dict in parsed:
+            count_dicts[filename] = count_dict
+            if count_matrix_cache is not None:
+                count_matrix_cache.set(keys[filename], count_dict)
+            progress_callback(100*(len(count_dicts)/maxlen))
+    finally:
+        if pool is not None:
+            pool.terminate()
+        _parsing_worker_state.clear()
+
+    result = {}
+    for filename in filenames:
+        count_dict = count_dicts[filename]
         for function in count_dict:
             if not exclude_function(count_dict[function]):
                 result[(filename,
@@ -75,36 +141,6 @@ def get_count_matrices(count_vector_creator,
     return result
 
 
-def pad_count_vectors(cm1, cm2):
-    """
-    Pads the smaller count matrix with zeroed count vectors.
-
-    :param cm1: First cm. Will not be modified.
-    :param cm2: Second cm. Will not be modified.
-    :return:    A tuple holding two cms.
-    """
-    cm1len = len(cm1)
-    cm2len = len(cm2)
-    if cm1len != cm2len:
-        # Copy the smaller matrix as it will be altered
-        if cm1len > cm2len:
-            cm2 = copy.copy(cm2)
-        else:  # make cm1 the larger (or equal) one
-            tmp = cm2
-            cm2 = copy.copy(cm1)
-            cm1 = tmp
-
-        any_count_vector = list(cm1.values())[0]
-        # Fill up smaller count matrix with zero vectors. This way no
-        # padding is needed later and if count vectors are zero on both
-        # side, the difference is zero too which wouldn't be taken into
-        # account with simple padding of ones.
-        for i in range(len(cm1) - len(cm2)):
-            cm2[i] = any_count_vector.create_null_vector(i)
-
-    return cm1, cm2
-
-
 def relative_difference(difference, maxabs):
     if maxabs == 0:
         return 1
@@ -163,20 +199,74 @@ def get_difference(matching_iterator,
     return difference
 
 
-def compare_functions(cm1,
-                      cm2,
-                      average_calculation=False,
-                      poly_postprocessing=True,
-                      exp_postprocessing=False):
+def get_count_array(count_matrix):
     """
-    Compares the functions represented by the given count matrices.
+    Stacks the count vectors of a count matrix into a dense array.
 
-    Postprocessing may be done because small functions are less likely to be
-    clones at the same difference value than big functions which may provide a
-    better refactoring opportunity for the user.
+    :param count_matrix: A dictionary with count vectors representing all
+                         variables for a function.
+    :return:             A two dimensional float array holding one row per
+                         variable and one column per counting condition.
+    """
+    return numpy.array([cv.count_vector for cv in count_matrix.values()],
+                       dtype=float).reshape(
+        len(count_matrix),
+        len(next(iter(count_matrix.values()), ())))
 
-    :param cm1:                 Count vector dict for the first function.
-    :param cm2:                 Count vector dict for the second function.
+
+def get_difference_matrices(ca1, ca2):
+    """
+    Calculates the differences and maxabs normalization values between all
+    count vectors of two count arrays at once. This is equivalent to calling
+    ``CountVector.difference`` and ``CountVector.maxabs`` for each pair of
+    variables.
+
+    :param ca1: The count array of the first function.
+    :param ca2: The count array of the second function.
+    :return:    A tuple of two arrays holding the differences and the maxabs
+                values, the field i/j refers to the variable i of the first
+                and j of the second function.
+    """
+    ca1 = ca1[:, numpy.newaxis, :]
+    ca2 = ca2[numpy.newaxis, :, :]
+    return (numpy.sqrt(numpy.square(ca1 - ca2).sum(axis=2)),
+            numpy.sqrt(numpy.square(numpy.maximum(ca1, ca2)).sum(axis=2)))
+
+
+def pad_count_arrays(ca1, ca2):
+    """
+    Pads the smaller count array with zeroed count vectors.
+
+    :param ca1: First count array. Will not be modified.
+    :param ca2: Second count array. Will not be modified.
+    :return:    A tuple holding two count arrays of the same shape, the
+                larger one first.
+    """
+    if len(ca1) < len(ca2):
+        ca1, ca2 = ca2, ca1
+
+    # Fill up smaller count array with zero vectors. This way no padding is
+    # needed later and if count vectors are zero on both side, the
+    # difference is zero too which wouldn't be taken into account with
+    # simple padding of ones.
+    if len(ca1) != len(ca2):
+        ca2 = numpy.concatenate(
+            (ca2, numpy.zeros((len(ca1) - len(ca2), ca2.shape[1]))))
+
+    return ca1, ca2
+
+
+def compare_count_arrays(ca1,
+                         ca2,
+                         average_calculation=False,
+                         poly_postprocessing=True,
+                         exp_postprocessing=False):
+    """
+    Compares the functions represented by the given count arrays.
+
+    :param ca1:                 Count array for the first function, see
+                                ``get_count_array``.
+    :param ca2:                 Count array for the second function.
     :param average_calculation: If set to true the difference calculation
                                 function will take the average of all variable
                                 differences as the difference, else it will
@@ -191,14 +281,10 @@ def compare_functions(cm1,
     :return:                    The difference between these functions, 0 is
                                 identical and 1 is not similar at all.
     """
-    assert 0 not in (len(cm1), len(cm2))
-
-    cm1, cm2 = pad_count_vectors(cm1, cm2)
+    assert 0 not in (len(ca1), len(ca2))
 
-    diff_table = [(cv1,
-                   [(cv2, cv1.difference(cv2), cv1.maxabs(cv2))
-                    for cv2 in cm2.values()])
-                  for cv1 in cm1.values()]
+    ca1, ca2 = pad_count_arrays(ca1, ca2)
+    differences, maxabs = get_difference_matrices(ca1, ca2)
 
     # The cost matrix holds the difference between the two variables i and
     # j in the i/j field. This is a representation of a bipartite weighted
@@ -206,17 +292,214 @@ def compare_functions(cm1,
     # (rows) and the nodes representing the second function on the other
     #  side (columns). The fields in the matrix are the weighted nodes
     # connecting each element from one side to the other.
-    cost_matrix = [[relative_difference(difference, maxabs)
-                    for cv2, difference, maxabs in lst]
-                   for cv1, lst in diff_table]
+    with numpy.errstate(divide='ignore', invalid='ignore'):
+        cost_matrix = numpy.where(maxabs == 0, 1, differences / maxabs)
 
     # The munkres algorithm will calculate a matching such that the sum of
     # the taken fields is minimal. It thus will associate each variable
     # from one function to one on the other function.
-    matching = munkres.compute(cost_matrix)
+    matching = munkres.compute(cost_matrix.tolist())
 
-    return get_difference([(diff_table[x][1][y][1], diff_table[x][1][y][2])
+    return get_difference([(float(differences[x, y]), float(maxabs[x, y]))
                            for x, y in matching],
                           average_calculation,
                           poly_postprocessing,
                           exp_postprocessing)
+
+
+class CountArraySignatures:
+    """
+    Cheap per function signatures of count arrays, used to calculate a lower
+    bound of the difference ``compare_count_arrays`` would yield for a
+    function pair without running the munkres algorithm.
+
+    The bound follows from the triangle inequality: the summed differences of
+    any matching are at least the difference of the summed count vectors,
+    while the summed maxabs values are at most the summed norms of all count
+    vectors of both functions. Since both postprocessing factors decrease
+    with growing norm sums, using the upper bound of the norm sum keeps the
+    bound valid with postprocessing.
+    """
+
+    def __init__(self, count_arrays):
+        """
+        :param count_arrays: A list of count arrays, see ``get_count_array``.
+        """
+        row_norms = [numpy.sqrt(numpy.square(ca).sum(axis=1))
+                     for ca in count_arrays]
+        self.sums = numpy.array([ca.sum(axis=0) for ca in count_arrays])
+        self.norm_sums = numpy.array([norms.sum() for norms in row_norms])
+        self.max_norms = numpy.array([norms.max() for norms in row_norms])
+        self.lengths = numpy.array([len(ca) for ca in count_arrays])
+
+    def get_lower_bounds(self,
+                         index,
+                         average_calculation=False,
+                         poly_postprocessing=True,
+                         exp_postprocessing=False):
+        """
+        Calculates lower bounds of the differences between one function and
+        all functions following it.
+
+        :param index:               The index of the function.
+        :param average_calculation: See ``compare_count_arrays``.
+        :param poly_postprocessing: See ``compare_count_arrays``.
+        :param exp_postprocessing:  See ``compare_count_arrays``.
+        :return:                    An array holding the lower bounds of the
+                                    differences to the functions at
+                                    ``index + 1`` and following.
+        """
+        others = slice(index + 1, None)
+        sum_difference = numpy.sqrt(numpy.square(
+            self.sums[others] - self.sums[index]).sum(axis=1))
+        norm_sum = self.norm_sums[others] + self.norm_sums[index]
+        if average_calculation:
+            maxabs_sum = (
+                numpy.maximum(self.lengths[others], self.lengths[index]) *
+                (self.max_norms[others] + self.max_norms[index]))
+        else:
+            maxabs_sum = norm_sum
+
+        with numpy.errstate(divide='ignore', invalid='ignore'):
+            bounds = numpy.where(maxabs_sum == 0,
+                                 0,
+                                 sum_difference / maxabs_sum)
+            if poly_postprocessing:
+                bounds *= numpy.where(norm_sum == 0,
+                                      1,
+                                      (3*norm_sum+1)/(4*norm_sum))
+            if exp_postprocessing:
+                bounds *= numpy.where(norm_sum == 0,
+                                      1,
+                                      numpy.exp(1-norm_sum)/4 + 0.75)
+
+        # Functions without any counts have a difference of 1.
+        return numpy.minimum(bounds, 1)
+
+
+def get_candidate_pairs(count_arrays,
+                        max_difference,
+                        average_calculation=False,
+                        poly_postprocessing=True,
+                        exp_postprocessing=False):
+    """
+    Retrieves all pairs of functions that may differ less than the given
+    value. Pairs that are guaranteed to differ at least by ``max_difference``
+    according to ``CountArraySignatures`` are skipped.
+
+    :param count_arrays:        A dictionary holding the count arrays of all
+                                functions.
+    :param max_difference:      The difference at which a pair is not of
+                                interest anymore, or None to retrieve all
+                                pairs.
+    :param average_calculation: See ``compare_count_arrays``.
+    :param poly_postprocessing: See ``compare_count_arrays``.
+    :param exp_postprocessing:  See ``compare_count_arrays``.
+    :return:                    An iterator yielding tuples of two function
+                                keys in the order of
+                                ``itertools.combinations``.
+    """
+    functions = list(count_arrays)
+    if max_difference is None:
+        yield from combinations(functions, 2)
+        return
+
+    signatures = CountArraySignatures(list(count_arrays.values()))
+    for index, function in enumerate(functions[:-1]):
+        bounds = signatures.get_lower_bounds(index,
+                                             average_calculation,
+                                             poly_postprocessing,
+                                             exp_postprocessing)
+        # Leave some room for rounding errors of the bound.
+        for other in numpy.flatnonzero(bounds*(1-1e-9) < max_difference):
+            yield function, functions[index + 1 + other]
+
+
+def compare_functions(cm1,
+                      cm2,
+                      average_calculation=False,
+                      poly_postprocessing=True,
+                      exp_postprocessing=False):
+    """
+    Compares the functions represented by the given count matrices.
+
+    Postprocessing may be done because small functions are less likely to be
+    clones at the same difference value than big functions which may provide a
+    better refactoring opportunity for the user.
+
+    :param cm1:                 Count vector dict for the first function.
+    :param cm2:                 Count vector dict for the second function.
+    :param average_calculation: If set to true the difference calculation
+                                function will take the average of all variable
+                                differences as the difference, else it will
+                                normalize the function as a whole and thus
+                                weighting in variables dependent on their size.
+    :param poly_postprocessing: If set to true, the difference value of big
+                                function pairs will be reduced using a
+                                polynomial approach.
+    :param exp_postprocessing:  If set to true, the difference value of big
+                                function pairs will be reduced using an
+                                exponential approach.
+    :return:                    The difference between these functions, 0 is
+                                identical and 1 is not similar at all.
+    """
+    return compare_count_arrays(get_count_array(cm1),
+                                get_count_array(cm2),
+                                average_calculation,
+                                poly_postprocessing,
+                                exp_postprocessing)
+
+
+def get_clone_clusters(differences, max_clone_difference):
+    """
+    Groups functions into clusters of clones: two functions are in the same
+    cluster if they differ by less than ``max_clone_difference`` or are both
+    clones of a third function of the cluster.
+
+    The differences are consumed one by one and only the clusters are kept,
+    so they may be given as a generator.
+
+    :param differences:          An iterable of tuples containing two
+                                 function keys and their difference.
+    :param max_clone_difference: The difference at which two functions are
+                                 not clones anymore.
+    :return:                     A list of tuples containing the sorted keys
+                                 of the functions of a cluster and the
+                                 smallest difference within it, sorted by
+                                 that difference.
+    """
+    parents = {}
+    sizes = {}
+    smallest = {}
+
+    def find(function):
+        parents.setdefault(function, function)
+        while parents[function] != function:
+            # Path halving keeps the trees flat.
+            parents[function] = parents[parents[function]]
+            function = parents[function]
+        return function
+
+    for function_1, function_2, difference in differences:
+        if not difference < max_clone_difference:
+            continue
+
+        root_1, root_2 = find(function_1), find(function_2)
+        if root_1 != root_2:
+            if sizes.get(root_1, 1) < sizes.get(root_2, 1):
+                root_1, root_2 = root_2, root_1
+            parents[root_2] = root_1
+            sizes[root_1] = sizes.get(root_1, 1) + sizes.pop(root_2, 1)
+            difference = min(difference,
+                             smallest.pop(root_2, difference),
+                             smallest.get(root_1, difference))
+        smallest[root_1] = min(difference,
+                               smallest.get(root_1, difference))
+
+    clusters = {}
+    for function in parents:
+        clusters.setdefault(find(function), []).append(function)
+
+    return sorted(((tuple(sorted(functions)), smallest[root])
+                   for root, functions in clusters.items()),
+                  key=lambda cluster: (cluster[1], cluster[0]))
@@ -0,0 +1,103 @@
+from hashlib import sha256
+import json
+import os
+
+from bears.c_languages.codeclone_detection.CountVector import CountVector
+
+
+class CountMatrixCache:
+    """
+    Stores the count matrices of all functions of a file on disk, so files
+    that did not change since the last run need not be parsed again.
+
+    Entries are keyed by the path and content of the file, the include paths
+    and the counting conditions and weightings. Changes of included headers
+    are not detected.
+    """
+
+    # Increase if the format of the cache files changes.
+    VERSION = 1
+
+    def __init__(self, cache_dir, conditions=None, weightings=None):
+        """
+        :param cache_dir:  The directory to store the cache files in. It is
+                           created if it does not exist.
+        :param conditions: The counting conditions as list of function
+                           objects, as given to the
+                           ``ClangCountVectorCreator``.
+        :param weightings: The weightings of the counting conditions, as given
+                           to the ``ClangCountVectorCreator``.
+        """
+        self.cache_dir = cache_dir
+        self.conditions = conditions if conditions is not None else []
+        self.weightings = weightings
+        self.configuration = json.dumps(
+            [self.VERSION,
+             [condition.__name__ for condition in self.conditions],
+             weightings])
+        os.makedirs(cache_dir, exist_ok=True)
+
+    def get_key(self, filename, include_paths):
+        """
+        Calculates the key of the cache entry of a file.
+
+        :param filename:      The path to the file.
+        :param include_paths: The include paths the file is parsed with.
+        :return:              A hexadecimal SHA-256 digest.
+        """
+        key = sha256()
+        key.update(json.dumps([self.configuration,
+                               os.path.abspath(filename),
+                               sorted(include_paths)]).encode())
+        with open(filename, 'rb') as file:
+            key.update(file.read())
+        return key.hexdigest()
+
+    def get(self, key):
+        """
+        Retrieves the cached count matrices of a file.
+
+        :param key: The key of the entry, see ``get_key``.
+        :return:    A dictionary like the one returned by
+                    ``ClangCountVectorCreator.get_vectors_for_file`` or None
+                    if there is no entry for the key.
+        """
+        try:
+            with open(os.path.join(self.cache_dir, key + '.json'),
+                      encoding='utf-8') as file:
+                entry = json.load(file)
+        except (OSError, ValueError):
+            return None
+
+        result = {}
+        for line, function, count_vectors in entry:
+            count_matrix = {}
+            for name, category, count_vector, unweighted in count_vectors:
+                count_matrix[name] = CountVector(name,
+                                                 category,
+                                                 self.conditions,
+                                                 self.weightings)
+                count_matrix[name].count_vector = count_vector
+                count_matrix[name].unweighted = unweighted
+            result[(line, function)] = count_matrix
+
+        return result
+
+    def set(self, key, count_dict):
+        """
+        Stores the count matrices of a file.
+
+        :param key:        The key of the entry, see ``get_key``.
+        :param count_dict: A dictionary like the one returned by
+                           ``ClangCountVectorCreator.get_vectors_for_file``.
+        """
+        entry = [[line,
+                  function,
+                  [[cv.name, cv.category, cv.count_vector, cv.unweighted]
+                   for cv in count_matrix.values()]]
+                 for (line, function), count_matrix in count_dict.items()]
+        path = os.path.join(self.cache_dir, key + '.json')
+        # Write to a temporary file first so readers never see half an entry.
+        with open(path + '.tmp', 'w', encoding='utf-8') as file:
+            json.dump(entry, file, separators=(',', ':'))
+        os.replace(path + '.tmp', path)
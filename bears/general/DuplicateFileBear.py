@@ -1,8 +1,12 @@
-import itertools
+from collections import defaultdict
+from hashlib import sha1
+import json
+import os
 
 from coalib.bears.GlobalBear import GlobalBear
 from coalib.results.Result import Result
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
+from coalib.results.SourceRange import SourceRange
 
 
 class DuplicateFileBear(GlobalBear):
@@ -12,9 +16,18 @@ class DuplicateFileBear(GlobalBear):
     LICENSE = 'AGPL-3.0'
     CAN_DETECT = {'Duplication'}
 
-    def run(self):
+    def run(self, digest_cache_file: str = ''):
         """
         Checks for Duplicate Files
+
+        Files are grouped by their length first and by a hash of their content
+        afterwards, only files within the same group are compared. Each group
+        of identical files is reported once.
+
+        :param digest_cache_file:
+            Path of a file to keep the content hashes in between runs. Hashes
+            of files whose modification time and size did not change are
+            reused from it. No cache is used if empty.
         """
         if not self.file_dict:
             yield Result(self, 'You did not add any file to compare',
@@ -23,16 +36,123 @@ class DuplicateFileBear(GlobalBear):
             yield Result(self, 'You included only one file',
                          severity=RESULT_SEVERITY.MAJOR)
         else:
-            unique_tuples = [file_tuple for file_tuple in
-                             itertools.combinations(self.file_dict, 2)]
-
-            for file_pair in unique_tuples:
-                if (self.file_dict[file_pair[0]] ==
-                        self.file_dict[file_pair[1]]):
-                    first_file_name = file_pair[0]
-                    second_file_name = file_pair[1]
-                    message = ('File ' + first_file_name + ' is identical'
-                               ' to File ' + second_file_name)
-                    yield Result.from_values(origin=self, message=message,
-                                             severity=RESULT_SEVERITY.INFO,
-                                             file=first_file_name)
+            digest_cache = DigestCache(digest_cache_file)
+            for group in self.get_duplicate_groups(digest_cache):
+                first_file_name, *other_file_names = group
+                message = ('File ' + first_file_name + ' is identical to ' +
+                           ' and '.join('File ' + file_name
+                                        for file_name in other_file_names))
+                yield Result(self, message,
+                             affected_code=tuple(
+                                 SourceRange.from_values(file_name)
+                                 for file_name in group),
+                             severity=RESULT_SEVERITY.INFO)
+            digest_cache.save()
+
+    def get_duplicate_groups(self, digest_cache):
+        """
+        Finds all groups of files with identical content.
+
+        :param digest_cache:
+            The ``DigestCache`` to look up and store content hashes in.
+        :return:
+            A list of lists of filenames, in the order of ``file_dict``. Each
+            list holds at least two files with identical content.
+        """
+        by_length = defaultdict(list)
+        for filename, file in self.file_dict.items():
+            by_length[sum(map(len, file))].append(filename)
+
+        groups = []
+        for same_length in by_length.values():
+            if len(same_length) < 2:
+                continue
+
+            by_digest = defaultdict(list)
+            for filename in same_length:
+                digest = digest_cache.get_digest(filename,
+                                                 self.file_dict[filename])
+                by_digest[digest].append(filename)
+
+            for same_digest in by_digest.values():
+                # Confirm the hash matches, a collision must not be reported.
+                while len(same_digest) > 1:
+                    content = self.file_dict[same_digest[0]]
+                    group = [filename for filename in same_digest
+                             if self.file_dict[filename] == content]
+                    if len(group) > 1:
+                        groups.append(group)
+                    same_digest = [filename for filename in same_digest
+                                   if self.file_dict[filename] != content]
+
+        order = {filename: index
+                 for index, filename in enumerate(self.file_dict)}
+        return sorted(groups, key=lambda group: order[group[0]])
+
+
+class DigestCache:
+    """
+    Computes content hashes of files and optionally keeps them in a JSON file,
+    keyed by the path, the modification time and the size of the files.
+    """
+
+    def __init__(self, cache_file=''):
+        """
+        :param cache_file: Path of the JSON file holding the hashes of a
+                           previous run. Nothing is cached if empty.
+        """
+        self.cache_file = cache_file
+        self.digests = {}
+        if cache_file:
+            try:
+                with open(cache_file, 'r', encoding='utf-8') as _file:
+                    self.digests = json.load(_file)
+            except (OSError, ValueError):
+                pass
+
+    @staticmethod
+    def compute_digest(file):
+        """
+        Computes the hash of the content of a file.
+
+        :param file: The lines of the file.
+        :return:     The hexadecimal SHA-1 digest.
+        """
+        digest = sha1()
+        for line in file:
+            digest.update(line.encode('utf-8', 'surrogateescape'))
+        return digest.hexdigest()
+
+    def get_digest(self, filename, file):
+        """
+        Retrieves the hash of a file, from the cache if the file did not
+        change on disk since it was stored.
+
+        :param filename: The name of the file.
+        :param file:     The lines of the file.
+        :return:         The hexadecimal SHA-1 digest.
+        """
+        if not self.cache_file:
+            return self.compute_digest(file)
+
+        try:
+            stat = os.stat(filename)
+        except OSError:
+            return self.compute_digest(file)
+
+        key = [stat.st_mtime_ns, stat.st_size]
+        cached = self.digests.get(filename)
+        if cached is not None and cached[:2] == key:
+            return cached[2]
+
+        digest = self.compute_digest(file)
+        self.digests[filename] = key + [digest]
+        return digest
+
+    def save(self):
+        """
+        Writes the hashes to the cache file if there is one.
+        """
+        if self.cache_file:
+            with open(self.cache_file, 'w', encoding='utf-8') as _file:
+                json.dump(self.digests, _file)
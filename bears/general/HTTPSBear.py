@@ -1,5 +1,11 @@
+from functools import lru_cache
+import threading
 from urllib.parse import urlparse
 
+import requests
+
+from bears.general.LinkChecker import get_link_checker, get_timeout_function
+from bears.general.LinkStatusCache import get_link_status_cache
 from bears.general.URLHeadBear import URLHeadBear
 from coalib.bears.LocalBear import LocalBear
 from coalib.results.Result import Result
@@ -22,12 +28,20 @@ class HTTPSBear(LocalBear):
     HTTP_PREFIX = 'http'
 
     def run(self, filename, file, dependency_results=dict(),
-            network_timeout: typed_dict(str, int, DEFAULT_TIMEOUT) = dict()):
+            network_timeout: typed_dict(str, int, DEFAULT_TIMEOUT) = dict(),
+            link_status_cache: str = '',
+            max_concurrent_requests: int = 8,
+            max_requests_per_host: int = 2,
+            requests_per_second_per_host: float = 0,
+            max_retries: int = 3):
         """
         Find http links in any text file and check if the https version of
         link is valid. If so, an option is provided for replacing them with
         https.
 
+        Every host is probed for https once with the first of its links, the
+        other links of hosts that do not serve https at all are not requested.
+
         An https link is considered valid if the server responds with a 2xx
         code.
 
@@ -45,45 +59,208 @@ class HTTPSBear(LocalBear):
                                       '*'. The timeout of all the websites not
                                       in the dict will be the value of the key
                                       '*'.
+        :param link_status_cache:     Keep the outcome of requests to links
+                                      to look it up instead of sending the
+                                      same request again, see
+                                      ``URLHeadBear``. No cache is used if
+                                      empty.
+        :param max_concurrent_requests:
+                                      The maximum number of HEAD requests
+                                      sent at the same time.
+        :param max_requests_per_host: The maximum number of HEAD requests
+                                      sent at the same time to a single host.
+        :param requests_per_second_per_host:
+                                      The maximum number of HEAD requests
+                                      sent per second to a single host.
+                                      Unlimited if 0.
+        :param max_retries:           The maximum number of times a HEAD
+                                      request is retried when the server
+                                      responds with HTTP 429 or with HTTP 503
+                                      and a ``Retry-After`` header.
         """
+        http_links = []
         for result in dependency_results.get(URLHeadBear.name, []):
             line_number, link, code, context = result.contents
-            if link.startswith(self.HTTPS_PREFIX):
-                continue
+            if not link.startswith(self.HTTPS_PREFIX):
+                http_links.append((line_number, link))
 
-            https_link = self.HTTPS_PREFIX + link[len(self.HTTP_PREFIX):]
-            host = urlparse(https_link).netloc
-            network_timeout = {
-                urlparse(url).netloc if not url == '*' else '*': timeout
-                for url, timeout in network_timeout.items()}
-            https_response = URLHeadBear.get_head_response(
-                https_link,
-                network_timeout.get(host)
-                if host in network_timeout
-                else network_timeout.get('*')
-                if '*' in network_timeout
-                else HTTPSBear.DEFAULT_TIMEOUT)
-
-            try:
-                https_code = https_response.status_code
-            except AttributeError:  # pragma: no cover
-                continue
+        https_responses = get_https_prober(
+            max_concurrent_requests, max_requests_per_host,
+            requests_per_second_per_host, max_retries).probe_all(
+                [self.get_https_link(link) for _, link in http_links],
+                get_timeout_function(network_timeout,
+                                     HTTPSBear.DEFAULT_TIMEOUT),
+                get_link_status_cache(link_status_cache))
+
+        for line_number, link in http_links:
+            result = self.get_https_result(
+                self, filename, file, line_number, link,
+                https_responses.get(self.get_https_link(link)))
+            if result is not None:
+                yield result
+
+    @classmethod
+    def get_https_link(cls, link):
+        """
+        :param link: An http link.
+        :return:     The https version of the link.
+        """
+        return cls.HTTPS_PREFIX + link[len(cls.HTTP_PREFIX):]
+
+    @classmethod
+    def get_https_result(cls, origin, filename, file, line_number, link,
+                         https_response):
+        """
+        Creates the result suggesting to use the https version of a link.
+
+        :param origin:         The origin of the result.
+        :param filename:       The name of the file containing the link.
+        :param file:           The lines of the file.
+        :param line_number:    The line number of the link.
+        :param link:           The http link.
+        :param https_response: The response to the https version of the link
+                               or the exception raised by its request. None
+                               if it was not requested.
+        :return:               A ``Result`` with a diff replacing the link or
+                               None if the https link does not respond with
+                               a 2xx code.
+        """
+        try:
+            https_code = https_response.status_code
+        except AttributeError:
+            return None
+
+        if not https_code or not 200 <= https_code < 300:
+            return None
+
+        diff = Diff(file)
+        current_line = file[line_number - 1]
+        start = current_line.find(link)
+        end = start + len(link)
+        replacement = (current_line[:start] + 'https' +
+                       link[len(cls.HTTP_PREFIX):] + current_line[end:])
+        diff.change_line(line_number, current_line, replacement)
 
-            if not https_code or not 200 <= https_code < 300:
+        return Result.from_values(
+            origin=origin,
+            message='https can be used instead of http',
+            diffs={filename: diff},
+            file=filename,
+            line=line_number,
+            severity=RESULT_SEVERITY.NORMAL)
+
+
+class HTTPSProber:
+    """
+    Requests the https version of links, remembering which hosts do not serve
+    https at all.
+    """
+
+    def __init__(self, link_checker):
+        """
+        :param link_checker: The ``LinkChecker`` to send the requests with.
+        """
+        self.link_checker = link_checker
+        # Maps hosts to whether they could be connected to with https.
+        self.hosts = {}
+        self._lock = threading.Lock()
+
+    def probe_all(self, https_links, get_timeout, status_cache=None):
+        """
+        Sends HEAD requests to https links concurrently.
+
+        The first link of each host not seen before is requested first. If
+        the host refuses the connection or the TLS handshake fails, the host
+        is considered to not serve https and none of its other links are
+        requested, in this or later calls. Timeouts and other errors are not
+        remembered, the other links of the host are requested anyway.
+
+        :param https_links:  A list of https links.
+        :param get_timeout:  A function returning the timeout in seconds for
+                             a host.
+        :param status_cache: An optional ``LinkStatusCache`` to look up the
+                             responses in.
+        :return:             A dict mapping the links that were requested to
+                             the ``requests.models.Response`` or the
+                             exception raised by the request.
+        """
+        links_by_host = {}
+        for link in https_links:
+            links_by_host.setdefault(urlparse(link).netloc, []).append(link)
+
+        with self._lock:
+            unknown_hosts = [host for host in links_by_host
+                             if host not in self.hosts]
+        responses = self.link_checker.head_all(
+            (links_by_host[host][0] for host in unknown_hosts),
+            get_timeout,
+            status_cache)
+        with self._lock:
+            self._record_hosts(unknown_hosts, links_by_host, responses)
+            remaining_links = [link
+                               for host, links in links_by_host.items()
+                               if self.hosts.get(host, True)
+                               for link in links
+                               if link not in responses]
+        responses.update(self.link_checker.head_all(
+            remaining_links, get_timeout, status_cache))
+        with self._lock:
+            self._record_hosts(unknown_hosts, links_by_host, responses)
+        return responses
+
+    def _record_hosts(self, hosts, links_by_host, responses):
+        """
+        Records whether hosts serve https, given the responses to their
+        links. Hosts are only recorded once, and only if a response or an
+        error showing that they do not serve https was received.
+
+        :param hosts:         The hosts to record.
+        :param links_by_host: A dict mapping hosts to their links.
+        :param responses:     A dict mapping links to the return value of
+                              ``LinkChecker.head``.
+        """
+        for host in hosts:
+            if host in self.hosts:
                 continue
+            host_responses = [responses[link] for link in links_by_host[host]
+                              if link in responses]
+            if any(not isinstance(response, Exception)
+                   for response in host_responses):
+                self.hosts[host] = True
+            elif any(map(self.lacks_https, host_responses)):
+                self.hosts[host] = False
+
+    @staticmethod
+    def lacks_https(response):
+        """
+        Checks whether the outcome of a request shows that its host does not
+        serve https, i.e. the connection was refused or the TLS handshake
+        failed. Timeouts may be transient and do not count.
+
+        :param response: The return value of ``LinkChecker.head``.
+        :return:         True if the host does not serve https.
+        """
+        return (isinstance(response, requests.exceptions.ConnectionError) and
+                not isinstance(response, requests.exceptions.Timeout))
+
+
+@lru_cache()
+def get_https_prober(max_workers=8, max_per_host=2, requests_per_second=0,
+                     max_retries=3):
+    """
+    Retrieves an ``HTTPSProber`` shared by all files of a run, so every host
+    is only probed once.
 
-            diff = Diff(file)
-            current_line = file[line_number - 1]
-            start = current_line.find(link)
-            end = start + len(link)
-            replacement = (current_line[:start] + 'https' +
-                           link[len(self.HTTP_PREFIX):] + current_line[end:])
-            diff.change_line(line_number, current_line, replacement)
-
-            yield Result.from_values(
-                origin=self,
-                message='https can be used instead of http',
-                diffs={filename: diff},
-                file=filename,
-                line=line_number,
-                severity=RESULT_SEVERITY.NORMAL)
+    :param max_workers:  The maximum number of requests running at the same
+                         time.
+    :param max_per_host: The maximum number of requests running at the same
+                         time against a single host.
+    :param requests_per_second:
+                         The maximum number of requests per second to a
+                         single host, unlimited if 0.
+    :param max_retries:  The maximum number of retries of requests rejected
+                         with HTTP 429 or 503.
+    :return:             The ``HTTPSProber`` instance.
+    """
+    return HTTPSProber(get_link_checker(max_workers, max_per_host,
+                                        requests_per_second, max_retries))
@@ -1,14 +1,16 @@
-from coala_utils.string_processing.Core import unescaped_search_for
+from bisect import bisect_left, bisect_right
+from collections import Counter, defaultdict, namedtuple
+from itertools import accumulate
+
 from coalib.bears.LocalBear import LocalBear
 from coalib.bearlib import deprecate_settings
-from coalib.bearlib.languages.LanguageDefinition import LanguageDefinition
 from coalib.bearlib.spacing.SpacingHelper import SpacingHelper
 from coalib.results.SourceRange import SourceRange
 from coalib.results.Result import Result, RESULT_SEVERITY
-from coalib.results.AbsolutePosition import AbsolutePosition
 from coalib.results.Diff import Diff
 
 from bears.general.AnnotationBear import AnnotationBear
+from bears.general.LanguageSpec import get_language_spec, unescaped_finditer
 
 
 class IndentationBear(LocalBear):
@@ -66,35 +68,25 @@ class IndentationBear(LocalBear):
             Full path of external directory containing the coalang
             file for language.
         """
-        lang_settings_dict = LanguageDefinition(
-            language, coalang_dir=coalang_dir)
+        language_spec = get_language_spec(language, coalang_dir)
         annotation_dict = dependency_results[AnnotationBear.name][0].contents
-        # sometimes can't convert strings with ':' to dict correctly
-        if ':' in dict(lang_settings_dict['indent_types']).keys():
-            indent_types = dict(lang_settings_dict['indent_types'])
-            indent_types[':'] = ''
-        else:
-            indent_types = dict(lang_settings_dict['indent_types'])
-
-        encapsulators = (dict(lang_settings_dict['encapsulators']) if
-                         'encapsulators' in lang_settings_dict else {})
+        annotation_index = AnnotationIndex(annotation_dict)
+        indent_types = language_spec.indent_types
+        encapsulators = language_spec.encapsulators
 
         encaps_pos = []
         for encapsulator in encapsulators:
             encaps_pos += self.get_specified_block_range(
                 file, filename,
                 encapsulator, encapsulators[encapsulator],
-                annotation_dict)
-        encaps_pos = tuple(sorted(encaps_pos, key=lambda x: x.start.line))
-
-        comments = dict(lang_settings_dict['comment_delimiter'])
-        comments.update(
-            dict(lang_settings_dict['multiline_comment_delimiters']))
+                annotation_index)
+        encaps_pos = RangeIndex(sorted(encaps_pos, key=lambda x: x.start.line))
 
         try:
             indent_levels = self.get_indent_levels(
                 file, filename,
-                indent_types, annotation_dict, encaps_pos, comments)
+                indent_types, annotation_index, encaps_pos,
+                language_spec.comments)
         # This happens only in case of unmatched indents or
         # ExpectedIndentError.
         except (UnmatchedIndentError, ExpectedIndentError) as e:
@@ -166,7 +158,7 @@ class IndentationBear(LocalBear):
 
         :param file:            A tuple of strings.
         :param filename:        Name of file.
-        :param encaps_pos:      A tuple ofSourceRanges of code regions
+        :param encaps_pos:      A RangeIndex of SourceRanges of code regions
                                 trapped in between a matching pair of
                                 encapsulators.
         :param annotation_dict: A dictionary containing sourceranges of all the
@@ -186,7 +178,7 @@ class IndentationBear(LocalBear):
                           file,
                           filename,
                           indent_types,
-                          annotation_dict,
+                          annotation_index,
                           encapsulators,
                           comments):
         """
@@ -197,10 +189,11 @@ class IndentationBear(LocalBear):
         :param filename:        Name of the file that needs to be checked.
         :param indent_types:    A dictionary with keys as start of indent and
                                 values as their corresponding closing indents.
-        :param annotation_dict: A dictionary containing sourceranges of all the
-                                strings and comments within a file.
-        :param encapsulators:   A tuple of sourceranges of all encapsulators of
-                                a language.
+        :param annotation_index:
+                                An AnnotationIndex over all the strings and
+                                comments within a file.
+        :param encapsulators:   A RangeIndex of sourceranges of all
+                                encapsulators of a language.
         :param comments:        A dict containing all the types of comment
                                 specifiers in a language.
         :return:                A tuple containing the levels of indentation of
@@ -212,29 +205,24 @@ class IndentationBear(LocalBear):
                 ranges += self.get_specified_block_range(
                     file, filename,
                     indent_specifier, indent_types[indent_specifier],
-                    annotation_dict)
+                    annotation_index)
             else:
                 ranges += self.get_unspecified_block_range(
                     file, filename,
-                    indent_specifier, annotation_dict, encapsulators, comments)
+                    indent_specifier, annotation_index, encapsulators,
+                    comments)
 
-        ranges = sorted(ranges, key=lambda x: x.start.line)
+        starts = Counter(_range.start.line for _range in ranges)
+        ends = Counter(_range.end.line for _range in ranges)
         indent_levels = []
         indent, next_indent = 0, 0
         for line in range(0, len(file)):
             indent = next_indent
-            for _range in ranges:
-                if _range.start.line == line + 1:
-                    next_indent += 1
-
-                first_ch = file[line].lstrip()[:1]
-                if(_range.end.line == line + 1 and
-                   first_ch in indent_types.values()):
-                    indent -= 1
-                    next_indent -= 1
-
-                elif _range.end.line == line + 1:
-                    next_indent -= 1
+            next_indent += starts[line + 1] - ends[line + 1]
+
+            first_ch = file[line].lstrip()[:1]
+            if first_ch in indent_types.values():
+                indent -= ends[line + 1]
             indent_levels.append(indent)
 
         return tuple(indent_levels)
@@ -244,7 +232,7 @@ class IndentationBear(LocalBear):
                                   filename,
                                   open_specifier,
                                   close_specifier,
-                                  annotation_dict):
+                                  annotation_index):
         """
         Gets a sourceranges of all the indentation blocks present inside the
         file.
@@ -256,8 +244,9 @@ class IndentationBear(LocalBear):
                                 block has begun.
         :param close_specifier: A character or string indicating that the block
                                 has ended.
-        :param annotation_dict: A dictionary containing sourceranges of all the
-                                strings and comments within a file.
+        :param annotation_index:
+                                An AnnotationIndex over all the strings and
+                                comments within a file.
         :return:                A tuple with the first source range being
                                 the range of the outermost indentation while
                                 last being the range of the most
@@ -267,10 +256,10 @@ class IndentationBear(LocalBear):
         """
         ranges = []
 
-        open_pos = list(self.get_valid_sequences(
-            file, open_specifier, annotation_dict))
-        close_pos = list(self.get_valid_sequences(
-            file, close_specifier, annotation_dict))
+        open_pos = self.get_valid_sequences(
+            file, open_specifier, annotation_index)
+        close_pos = self.get_valid_sequences(
+            file, close_specifier, annotation_index)
 
         number_of_encaps = len(open_pos)
         if number_of_encaps != len(close_pos):
@@ -279,34 +268,26 @@ class IndentationBear(LocalBear):
         if number_of_encaps == 0:
             return ()
 
+        # Merge both sorted position lists, an opening specifier is handled
+        # before a closing one at the same position.
         stack = []
-        text = ''.join(file)
-        open_counter = close_counter = position = 0
-        op_limit = cl_limit = False
-        for position in range(len(text)):
-            if not op_limit:
-                if open_pos[open_counter].position == position:
-                    stack.append(open_pos[open_counter])
-                    open_counter += 1
-                    if open_counter == number_of_encaps:
-                        op_limit = True
-
-            if not cl_limit:
-                if close_pos[close_counter].position == position:
-                    try:
-                        op = stack.pop()
-                    except IndexError:
-                        raise UnmatchedIndentError(open_specifier,
-                                                   close_specifier)
-                    ranges.append(SourceRange.from_values(
-                        filename,
-                        start_line=op.line,
-                        start_column=op.column,
-                        end_line=close_pos[close_counter].line,
-                        end_column=close_pos[close_counter].column))
-                    close_counter += 1
-                    if close_counter == number_of_encaps:
-                        cl_limit = True
+        open_counter = 0
+        for close in close_pos:
+            while (open_counter < number_of_encaps and
+                   open_pos[open_counter].position <= close.position):
+                stack.append(open_pos[open_counter])
+                open_counter += 1
+
+            try:
+                op = stack.pop()
+            except IndexError:
+                raise UnmatchedIndentError(open_specifier, close_specifier)
+            ranges.append(SourceRange.from_values(
+                filename,
+                start_line=op.line,
+                start_column=op.column,
+                end_line=close.line,
+                end_column=close.column))
 
         return tuple(ranges)
 
@@ -314,7 +295,7 @@ class IndentationBear(LocalBear):
                                     file,
                                     filename,
                                     indent_specifier,
-                                    annotation_dict,
+                                    annotation_index,
                                     encapsulators,
                                     comments):
         """
@@ -325,21 +306,22 @@ class IndentationBear(LocalBear):
         :param filename:         Name of the file that needs to be checked.
         :param indent_specifier: A character or string indicating that the
                                  indentation should begin.
-        :param annotation_dict: A dictionary containing sourceranges of all the
-                                strings and comments within a file.
-        :param encapsulators:   A tuple of sourceranges of all encapsulators of
-                                a language.
+        :param annotation_index:
+                                An AnnotationIndex over all the strings and
+                                comments within a file.
+        :param encapsulators:   A RangeIndex of sourceranges of all
+                                encapsulators of a language.
         :param comments:        A dict containing all the types of comments
                                 specifiers in a language.
         :return:                A tuple of SourceRanges of blocks without
                                 un-indent specifiers.
         """
-        specifiers = list(self.get_valid_sequences(
+        specifiers = self.get_valid_sequences(
             file,
             indent_specifier,
-            annotation_dict,
+            annotation_index,
             encapsulators,
-            check_ending=True))
+            check_ending=True)
         _range = []
         for specifier in specifiers:
             current_line = specifier.line
@@ -347,7 +329,7 @@ class IndentationBear(LocalBear):
             unindent_line = get_first_unindent(indent,
                                                file,
                                                current_line,
-                                               annotation_dict,
+                                               annotation_index,
                                                encapsulators,
                                                comments)
 
@@ -364,67 +346,152 @@ class IndentationBear(LocalBear):
     @staticmethod
     def get_valid_sequences(file,
                             sequence,
-                            annotation_dict,
+                            annotation_index,
                             encapsulators=None,
                             check_ending=False):
         """
         A vaild sequence is a sequence that is outside of comments or strings.
 
-        :param file:            File that needs to be checked in the form of
-                                a list of strings.
-        :param sequence:        Sequence whose validity is to be checked.
-        :param annotation_dict: A dictionary containing sourceranges of all the
-                                strings and comments within a file.
-        :param encapsulators:   A tuple of SourceRanges of code regions
-                                trapped in between a matching pair of
-                                encapsulators.
-        :param check_ending:    Check whether sequence falls at the end of the
-                                line.
-        :return:                A tuple of AbsolutePosition's of all occurances
-                                of sequence outside of string's and comments.
+        :param file:             File that needs to be checked in the form of
+                                 a list of strings.
+        :param sequence:         Sequence whose validity is to be checked.
+        :param annotation_index: An AnnotationIndex over all the strings and
+                                 comments within a file.
+        :param encapsulators:    A RangeIndex of SourceRanges of code regions
+                                 trapped in between a matching pair of
+                                 encapsulators.
+        :param check_ending:     Check whether sequence falls at the end of
+                                 the line.
+        :return:                 A tuple of SequencePosition's of all
+                                 occurances of sequence outside of string's
+                                 and comments.
         """
         file_string = ''.join(file)
-        # tuple since order is important
-        sequence_positions = tuple()
-
-        for sequence_match in unescaped_search_for(sequence, file_string):
-            valid = True
-            sequence_position = AbsolutePosition(
-                                    file, sequence_match.start())
-            sequence_line_text = file[sequence_position.line - 1]
-
-            # ignore if within string
-            for string in annotation_dict['strings']:
-                if(gt_eq(sequence_position, string.start) and
-                   lt_eq(sequence_position, string.end)):
-                    valid = False
-
-            # ignore if within comments
-            for comment in annotation_dict['comments']:
-                if(gt_eq(sequence_position, comment.start) and
-                   lt_eq(sequence_position, comment.end)):
-                    valid = False
-
-                if(comment.start.line == sequence_position.line and
-                        comment.end.line == sequence_position.line and
-                        check_ending):
+        line_starts = [0]
+        line_starts.extend(accumulate(len(line) for line in file))
+        # list since order is important
+        sequence_positions = []
+
+        for sequence_match in unescaped_finditer(sequence, file_string):
+            position = sequence_match.start()
+            line = bisect_right(line_starts, position)
+            sequence_position = SequencePosition(
+                position, line, position - line_starts[line - 1] + 1)
+            sequence_line_text = file[line - 1]
+
+            # ignore if within string or comments
+            valid = not (
+                annotation_index.strings.covers(sequence_position) or
+                annotation_index.comments.covers(sequence_position))
+
+            if check_ending:
+                for comment in annotation_index.comments.on_line(line):
                     sequence_line_text = sequence_line_text[
                         :comment.start.column - 1] + sequence_line_text[
                         comment.end.column-1:]
 
-            if encapsulators:
-                for encapsulator in encapsulators:
-                    if(gt_eq(sequence_position, encapsulator.start) and
-                       lt_eq(sequence_position, encapsulator.end)):
-                        valid = False
+            if encapsulators and encapsulators.covers(sequence_position):
+                valid = False
 
             if not sequence_line_text.rstrip().endswith(':') and check_ending:
                 valid = False
 
             if valid:
-                sequence_positions += (sequence_position,)
+                sequence_positions.append(sequence_position)
+
+        return tuple(sequence_positions)
+
+
+SequencePosition = namedtuple('SequencePosition', 'position line column')
+
+
+class RangeIndex:
+    """
+    An index over SourceRanges which tells whether a position or a line is
+    covered by any of the ranges by bisection instead of visiting every
+    range. The ranges may overlap or nest.
+
+    Iterating over the index yields the ranges in the order they were given.
+    """
+
+    def __init__(self, ranges):
+        """
+        :param ranges: An iterable of SourceRanges.
+        """
+        self.ranges = tuple(ranges)
+
+        by_start = sorted(self.ranges,
+                          key=lambda x: (x.start.line, x.start.column))
+        self._starts = [(x.start.line, x.start.column) for x in by_start]
+        self._max_ends = list(accumulate(
+            ((x.end.line, x.end.column) for x in by_start), max))
+
+        by_line = sorted(self.ranges, key=lambda x: x.start.line)
+        self._start_lines = [x.start.line for x in by_line]
+        self._max_end_lines = list(accumulate(
+            (x.end.line for x in by_line), max))
 
-        return sequence_positions
+        self._single_line_ranges = defaultdict(list)
+        for _range in self.ranges:
+            if _range.start.line == _range.end.line:
+                self._single_line_ranges[_range.start.line].append(_range)
+
+    def __len__(self):
+        return len(self.ranges)
+
+    def __getitem__(self, item):
+        return self.ranges[item]
+
+    def __iter__(self):
+        return iter(self.ranges)
+
+    def covers(self, position):
+        """
+        Checks whether a position lies within any of the ranges, both ends
+        included.
+
+        :param position: An object with a ``line`` and a ``column``.
+        :return:         True if any range covers the position.
+        """
+        position = (position.line, position.column)
+        index = bisect_right(self._starts, position)
+        return index > 0 and self._max_ends[index - 1] >= position
+
+    def covers_line(self, line):
+        """
+        Checks whether a line lies within any of the ranges starting on an
+        earlier line.
+
+        :param line: The line number (initial 1).
+        :return:     True if a range starts before and ends on or after the
+                     line.
+        """
+        index = bisect_left(self._start_lines, line)
+        return index > 0 and self._max_end_lines[index - 1] >= line
+
+    def on_line(self, line):
+        """
+        Gets the ranges that start and end on the given line.
+
+        :param line: The line number (initial 1).
+        :return:     A list of SourceRanges in the order they were given.
+        """
+        return self._single_line_ranges.get(line, [])
+
+
+class AnnotationIndex:
+    """
+    RangeIndexes over the strings and comments found by the AnnotationBear,
+    built once per file and shared by all lookups of the IndentationBear.
+    """
+
+    def __init__(self, annotation_dict):
+        """
+        :param annotation_dict: A dictionary containing sourceranges of all
+                                the strings and comments within a file.
+        """
+        self.strings = RangeIndex(annotation_dict['strings'])
+        self.comments = RangeIndex(annotation_dict['comments'])
 
 
 def get_indent_of_specifier(file, current_line, encapsulators):
@@ -453,7 +520,7 @@ def get_indent_of_specifier(file, current_line, encapsulators):
 def get_first_unindent(indent,
                        file,
                        start_line,
-                       annotation_dict,
+                       annotation_index,
                        encapsulators,
                        comments):
     """
@@ -463,10 +530,12 @@ def get_first_unindent(indent,
     :param file:            A tuple of strings.
     :param start_line:      The line from where to start searching for
                             unindent.
-    :param annotation_dict: A dictionary containing sourceranges of all the
-                            strings and comments within a file.
-    :param encapsulators:   A tuple of SourceRanges of code regions trapped in
-                            between a matching pair of encapsulators.
+    :param annotation_index:
+                            An AnnotationIndex over all the strings and
+                            comments within a file.
+    :param encapsulators:   A RangeIndex of SourceRanges of code regions
+                            trapped in between a matching pair of
+                            encapsulators.
     :param comments:        A dict containing all the types of comments
                             specifiers in a language.
     :return:                The line where unindent is found (intial 0).
@@ -474,23 +543,15 @@ def get_first_unindent(indent,
     line_nr = start_line
 
     while line_nr < len(file):
-        valid = True
-
-        for comment in annotation_dict['comments']:
-            if(comment.start.line < line_nr + 1 and
-               comment.end.line >= line_nr + 1):
-                valid = False
+        valid = not (annotation_index.comments.covers_line(line_nr + 1) or
+                     encapsulators.covers_line(line_nr + 1))
 
+        if annotation_index.comments:
             first_char = file[line_nr].lstrip()[0] if file[line_nr].strip()\
                 else ''
             if first_char in comments:
                 valid = False
 
-        for encapsulator in encapsulators:
-            if(encapsulator.start.line < line_nr + 1 and
-               encapsulator.end.line >= line_nr + 1):
-                valid = False
-
         line_indent = len(file[line_nr]) - len(file[line_nr].lstrip())
         if line_indent <= indent and valid:
             return line_nr
@@ -499,22 +560,6 @@ def get_first_unindent(indent,
     return line_nr
 
 
-# TODO remove these once https://github.com/coala/coala/issues/2377
-# gets a fix
-def lt_eq(absolute, source):
-    if absolute.line == source.line:
-        return absolute.column <= source.column
-
-    return absolute.line < source.line
-
-
-def gt_eq(absolute, source):
-    if absolute.line == source.line:
-        return absolute.column >= source.column
-
-    return absolute.line > source.line
-
-
 def get_element_indent(file, encaps):
     """
     Gets indent of elements inside encapsulator.
@@ -1,13 +1,14 @@
-import requests
-
 from difflib import SequenceMatcher
 
+from bears.general.LinkChecker import get_link_checker, get_timeout_function
+from bears.general.LinkStatusCache import get_link_status_cache
 from bears.general.URLHeadBear import URLHeadBear
 from coalib.results.Diff import Diff
 from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
 from coalib.results.Result import Result
+from coalib.settings.Setting import typed_dict
 
 
 class InvalidLinkBear(LocalBear):
@@ -23,6 +24,13 @@ class InvalidLinkBear(LocalBear):
     def run(self, filename, file,
             dependency_results=dict(),
             follow_redirects: bool = False,
+            network_timeout: typed_dict(str, int, DEFAULT_TIMEOUT) = dict(),
+            max_concurrent_requests: int = 8,
+            max_requests_per_host: int = 2,
+            requests_per_second_per_host: float = 0,
+            max_retries: int = 3,
+            link_status_cache: str = '',
+            max_redirects: int = 30,
             ):
         """
         Find links in any text file and check if they are valid.
@@ -40,60 +48,128 @@ class InvalidLinkBear(LocalBear):
 
         :param dependency_results: Results given by URLBear.
         :param follow_redirects: Set to true to autocorrect redirects.
+        :param network_timeout:  A dict mapping URLs and timeout to be used
+                                 for that URL, see ``URLHeadBear``.
+        :param max_concurrent_requests:
+                                 The maximum number of HEAD requests sent at
+                                 the same time.
+        :param max_requests_per_host:
+                                 The maximum number of HEAD requests sent at
+                                 the same time to a single host.
+        :param requests_per_second_per_host:
+                                 The maximum number of HEAD requests sent per
+                                 second to a single host. Unlimited if 0.
+        :param max_retries:      The maximum number of times a HEAD request
+                                 is retried when the server responds with
+                                 HTTP 429 or with HTTP 503 and a
+                                 ``Retry-After`` header.
+        :param link_status_cache:
+                                 Keep the outcome of requests to links to
+                                 look it up instead of sending the same
+                                 request again, see ``URLHeadBear``. No cache
+                                 is used if empty.
+        :param max_redirects:    The maximum number of redirects to follow for
+                                 links responding with a 3xx status code.
         """
-        for result in dependency_results.get(URLHeadBear.name, []):
+        results = dependency_results.get(URLHeadBear.name, [])
+        redirect_chains = {result.link: result.redirect_chain
+                           for result in results}
+        unfollowed = {result.link: result.head_response
+                      for result in results
+                      if result.redirect_chain is None and
+                      result.http_status_code is not None and
+                      300 <= result.http_status_code < 400}
+        if follow_redirects and unfollowed:
+            # URLHeadBear did not record the redirect chains of these links.
+            # They are followed with the shared link checker, so the requests
+            # are scheduled and cached like the ones of URLHeadBear.
+            redirect_chains.update(get_link_checker(
+                max_concurrent_requests, max_requests_per_host,
+                requests_per_second_per_host, max_retries
+                ).get_redirect_chains(
+                    unfollowed,
+                    get_timeout_function(network_timeout,
+                                         self.DEFAULT_TIMEOUT),
+                    get_link_status_cache(link_status_cache),
+                    max_redirects))
+
+        for result in results:
             line_number, link, code, context = result.contents
-            if context is context.xml_namespace:
-                if code and 200 <= code < 300:
-                    pass
-                else:
-                    yield Result.from_values(
-                        origin=self,
-                        message=('XML Namespace - '
-                                 '{url}').format(url=link),
-                        file=filename,
-                        line=line_number,
-                        severity=RESULT_SEVERITY.INFO)
-            elif code is None:
+            yield from self.get_link_results(
+                self, filename, file, line_number, link, code, context,
+                redirect_chains.get(link), follow_redirects)
+
+    @staticmethod
+    def get_link_results(origin, filename, file, line_number, link, code,
+                         context, redirect_chain, follow_redirects):
+        """
+        Creates the results for a single occurrence of a link.
+
+        :param origin:           The origin of the results.
+        :param filename:         The name of the file containing the link.
+        :param file:             The lines of the file.
+        :param line_number:      The line number of the link.
+        :param link:             The link.
+        :param code:             The HTTP status code of the HEAD request to
+                                 the link or None if it failed.
+        :param context:          The ``LINK_CONTEXT`` of the link.
+        :param redirect_chain:   The redirect chain of the link as recorded
+                                 in ``URLHeadResult`` or None if it could
+                                 not be resolved.
+        :param follow_redirects: Whether to autocorrect redirects.
+        """
+        if context is context.xml_namespace:
+            if code and 200 <= code < 300:
+                pass
+            else:
                 yield Result.from_values(
-                    origin=self,
-                    message=('Broken link - unable to connect to '
+                    origin=origin,
+                    message=('XML Namespace - '
                              '{url}').format(url=link),
                     file=filename,
                     line=line_number,
-                    severity=RESULT_SEVERITY.MAJOR)
-            elif not 200 <= code < 300:
-                # HTTP status 404, 410 or 50x
-                if code in (404, 410) or 500 <= code < 600:
+                    severity=RESULT_SEVERITY.INFO)
+        elif code is None:
+            yield Result.from_values(
+                origin=origin,
+                message=('Broken link - unable to connect to '
+                         '{url}').format(url=link),
+                file=filename,
+                line=line_number,
+                severity=RESULT_SEVERITY.MAJOR)
+        elif not 200 <= code < 300:
+            # HTTP status 404, 410 or 50x
+            if code in (404, 410) or 500 <= code < 600:
+                yield Result.from_values(
+                    origin=origin,
+                    message=('Broken link - HTTP Error: {code} '
+                             'generated when connecting to {url}'
+                             ).format(url=link, code=code),
+                    file=filename,
+                    line=line_number,
+                    severity=RESULT_SEVERITY.NORMAL)
+            if follow_redirects and 300 <= code < 400:  # HTTP status 30x
+                if redirect_chain is None:
+                    return
+                redirect_url = redirect_chain[-1]
+                matcher = SequenceMatcher(
+                    None, redirect_url, link)
+                if (matcher.real_quick_ratio() > 0.7 and
+                        matcher.ratio()) > 0.7:
+                    diff = Diff(file)
+                    current_line = file[line_number - 1]
+                    start = current_line.find(link)
+                    end = start + len(link)
+                    replacement = current_line[:start] + \
+                        redirect_url + current_line[end:]
+                    diff.change_line(line_number,
+                                     current_line,
+                                     replacement)
+
                     yield Result.from_values(
-                        origin=self,
-                        message=('Broken link - HTTP Error: {code} '
-                                 'generated when connecting to {url}'
-                                 ).format(url=link, code=code),
+                        origin,
+                        'This link redirects to ' + redirect_url,
+                        diffs={filename: diff},
                         file=filename,
                         line=line_number,
                         severity=RESULT_SEVERITY.NORMAL)
-                if follow_redirects and 300 <= code < 400:  # HTTP status 30x
-                    redirect_url = requests.head(link,
-                                                 allow_redirects=True).url
-                    matcher = SequenceMatcher(
-                        None, redirect_url, link)
-                    if (matcher.real_quick_ratio() > 0.7 and
-                            matcher.ratio()) > 0.7:
-                        diff = Diff(file)
-                        current_line = file[line_number - 1]
-                        start = current_line.find(link)
-                        end = start + len(link)
-                        replacement = current_line[:start] + \
-                            redirect_url + current_line[end:]
-                        diff.change_line(line_number,
-                                         current_line,
-                                         replacement)
-
-                        yield Result.from_values(
-                            self,
-                            'This link redirects to ' + redirect_url,
-                            diffs={filename: diff},
-                            file=filename,
-                            line=line_number,
-                            severity=RESULT_SEVERITY.NORMAL)
@@ -0,0 +1,331 @@
+from bisect import bisect_right
+from functools import lru_cache
+from itertools import accumulate
+from types import MappingProxyType
+import re
+
+from coalib.bearlib.languages.LanguageDefinition import LanguageDefinition
+from coalib.results.SourceRange import SourceRange
+
+
+class AnnotationScanner:
+    """
+    Finds strings and comments of a language in a single pass over a file.
+
+    All start delimiters are compiled into one regex alternation, so the
+    scanner jumps straight from one possible annotation start to the next
+    instead of probing every position of the text. A scanner only depends on
+    the delimiters, thus it can be built once and reused for many files.
+    """
+
+    def __init__(self,
+                 string_delimiters,
+                 multiline_string_delimiters,
+                 comment_delimiter,
+                 multiline_comment_delimiters):
+        """
+        :param string_delimiters:
+            A dictionary containing the various ways to  define single-line
+            strings in a language.
+        :param multiline_string_delimiters:
+            A dictionary containing the various ways to define multi-line
+            strings in a language.
+        :param comment_delimiter:
+            A dictionary containing the various ways to define single-line
+            comments in a language.
+        :param multiline_comment_delimiters:
+            A dictionary containing the various ways to define multi-line
+            comments in a language.
+        """
+        # Ordered by precedence, the first kind yielding a range at a
+        # position wins.
+        self.annotation_kinds = (
+            (True, tuple(multiline_string_delimiters.items()),
+             self._get_multiline),
+            (True, tuple(string_delimiters.items()),
+             self._get_singleline_string),
+            (False, tuple(multiline_comment_delimiters.items()),
+             self._get_multiline),
+            (False, tuple(comment_delimiter.items()),
+             self._get_singleline_comment))
+
+        starts = {start
+                  for _, delimiters, _ in self.annotation_kinds
+                  for start, _ in delimiters
+                  if start}
+        self.start_regex = (
+            re.compile('|'.join(re.escape(start) for start in
+                                sorted(starts, key=len, reverse=True)))
+            if starts else None)
+
+    def scan(self, file, filename):
+        """
+        Finds ranges of all annotations.
+
+        :param file:
+            A tuple of strings, with each string being a line in the file.
+        :param filename:
+            The name of the file.
+        :return:
+            Two tuples first containing a tuple of strings, the second a tuple
+            of comments.
+        :raises NoCloseError:
+            If an annotation is opened but never closed.
+        """
+        strings_range = []
+        comments_range = []
+        if self.start_regex is None:
+            return (), ()
+
+        text = ''.join(file)
+        line_starts = [0]
+        line_starts.extend(accumulate(len(line) for line in file))
+
+        def to_source_range(start, end=None):
+            start_line = bisect_right(line_starts, start)
+            start_column = start - line_starts[start_line - 1] + 1
+            if end is None:
+                return SourceRange.from_values(filename,
+                                               start_line,
+                                               start_column)
+            end_line = bisect_right(line_starts, end)
+            return SourceRange.from_values(filename,
+                                           start_line,
+                                           start_column,
+                                           end_line,
+                                           end - line_starts[end_line - 1] + 1)
+
+        match = self.start_regex.search(text)
+        while match:
+            position = match.start()
+            for is_string, delimiters, func in self.annotation_kinds:
+                _range = end_position = None
+                for start, end in delimiters:
+                    if text.startswith(start, position):
+                        ret_val = func(to_source_range, text,
+                                       start, end, position)
+                        if ret_val:
+                            _range, end_position = ret_val
+                if end_position and _range:
+                    (strings_range if is_string
+                     else comments_range).append(_range)
+                    position = end_position
+                    break
+            match = self.start_regex.search(text, position + 1)
+
+        return tuple(strings_range), tuple(comments_range)
+
+    @staticmethod
+    def _get_multiline(to_source_range,
+                       text,
+                       annotation_start,
+                       annotation_end,
+                       position):
+        """
+        Gets sourcerange and end position of an annotation that can span
+        multiple lines.
+
+        :param to_source_range:
+            A function converting absolute positions to a SourceRange.
+        :param text:
+            The whole file as one string.
+        :param annotation_start:
+            The string specifying the start of the annotation.
+        :param annotation_end:
+            The string specifying the end of the annotation.
+        :param position:
+            An integer identifying the position where the annotation started.
+        :return:
+            A SourceRange object holding the range of the multi-line annotation
+            and the end_position of the annotation as an integer.
+        """
+        end_end = get_end_position(annotation_end,
+                                   text,
+                                   position + len(annotation_start) - 1)
+        if end_end == -1:
+            raise NoCloseError(annotation_start, to_source_range(position))
+
+        return to_source_range(position, end_end), end_end
+
+    @staticmethod
+    def _get_singleline_string(to_source_range,
+                               text,
+                               string_start,
+                               string_end,
+                               position):
+        """
+        Gets sourcerange of a single-line string and its end position.
+
+        :param to_source_range:
+            A function converting absolute positions to a SourceRange.
+        :param text:
+            The whole file as one string.
+        :param string_start:
+            The string which specifies how a string starts.
+        :param string_end:
+            The string which specifies how a string ends.
+        :param position:
+            An integer identifying the position where the string started.
+        :return:
+            A SourceRange object identifying the range of the single-line
+            string and the end_position of the string as an integer.
+        """
+        end_position = get_end_position(string_end,
+                                        text,
+                                        position + len(string_start) - 1)
+        if end_position == -1:
+            raise NoCloseError(string_start, to_source_range(position))
+        newline = get_end_position('\n', text, position)
+        if newline == -1:
+            newline = len(text)
+        if newline > end_position:
+            return to_source_range(position, end_position), end_position
+
+    @staticmethod
+    def _get_singleline_comment(to_source_range,
+                                text,
+                                comment,
+                                _,
+                                position):
+        """
+        Gets Sourcerange of a single-line comment where the start is the
+        start of comment and the end is the end of line.
+
+        :param to_source_range:
+            A function converting absolute positions to a SourceRange.
+        :param text:
+            The whole file as one string.
+        :param comment:
+            The string which specifies the comment.
+        :param position:
+            An integer identifying the position where the string started.
+        :return:
+            A SourceRange object identifying the range of the single-line
+            comment and the end_position of the comment as an integer.
+        """
+        end_position = get_end_position('\n',
+                                        text,
+                                        position + len(comment) - 1)
+        if end_position == -1:
+            end_position = len(text) - 1
+        return to_source_range(position, end_position), end_position
+
+
+@lru_cache(maxsize=None)
+def _get_marker_regex(marker):
+    return re.compile(re.escape(marker))
+
+
+def unescaped_finditer(marker, text, start=0):
+    """
+    Finds all occurrences of ``marker`` in ``text`` which are not escaped by
+    a backslash. This is like ``unescaped_search_for`` from
+    ``coala_utils``, but it does not copy the text to search in.
+
+    :param marker:
+        The string to search for.
+    :param text:
+        The text to search in.
+    :param start:
+        The position to start searching at. Backslashes before it are not
+        taken into account when checking whether the marker is escaped.
+    :return:
+        An iterator over the match objects of the unescaped occurrences.
+    """
+    for match in _get_marker_regex(marker).finditer(text, start):
+        index = match.start() - 1
+        while index >= start and text[index] == '\\':
+            index -= 1
+        if (match.start() - 1 - index) % 2 == 0:
+            yield match
+
+
+def get_end_position(end_marker, text, position):
+    """
+    Finds the first unescaped occurrence of ``end_marker`` after
+    ``position``.
+
+    :param end_marker:
+        The string to search for.
+    :param text:
+        The text to search in.
+    :param position:
+        The position after which the search starts.
+    :return:
+        The position of the last character of the marker or -1 if it could
+        not be found.
+    """
+    for match in unescaped_finditer(end_marker, text, position + 1):
+        return match.end() - 1
+
+    return -1
+
+
+class NoCloseError(Exception):
+
+    def __init__(self, annotation, code):
+        Exception.__init__(self, annotation + ' has no closure')
+        self.code = code
+
+
+class LanguageSpec:
+    """
+    The delimiters and indent specifiers of a language as needed by the
+    ``AnnotationBear`` and the ``IndentationBear``, read from the coalang file
+    once and frozen so a single instance can be shared between files and
+    bears.
+
+    Use ``get_language_spec`` to retrieve cached instances.
+    """
+
+    def __init__(self, language_definition):
+        """
+        :param language_definition:
+            The ``LanguageDefinition`` to read the specification from.
+        """
+        def frozen(key):
+            return MappingProxyType(dict(language_definition[key])
+                                    if key in language_definition else {})
+
+        self.string_delimiters = frozen('string_delimiters')
+        self.multiline_string_delimiters = frozen(
+            'multiline_string_delimiters')
+        self.comment_delimiter = frozen('comment_delimiter')
+        self.multiline_comment_delimiters = frozen(
+            'multiline_comment_delimiters')
+        self.encapsulators = frozen('encapsulators')
+
+        indent_types = dict(frozen('indent_types'))
+        # sometimes can't convert strings with ':' to dict correctly
+        if ':' in indent_types:
+            indent_types[':'] = ''
+        self.indent_types = MappingProxyType(indent_types)
+
+        comments = dict(self.comment_delimiter)
+        comments.update(self.multiline_comment_delimiters)
+        self.comments = MappingProxyType(comments)
+
+        self.annotation_scanner = AnnotationScanner(
+            self.string_delimiters,
+            self.multiline_string_delimiters,
+            self.comment_delimiter,
+            self.multiline_comment_delimiters)
+
+
+@lru_cache(maxsize=None)
+def get_language_spec(language, coalang_dir=None):
+    """
+    Retrieves the ``LanguageSpec`` of a language, parsing its coalang file
+    only on the first request in this process. Use
+    ``get_language_spec.cache_info()`` to see the cache hits and misses.
+
+    :param language:
+        The name of the language, optionally followed by a version.
+    :param coalang_dir:
+        External directory for coalang file.
+    :return:
+        The ``LanguageSpec`` of the language.
+    :raises FileNotFoundError:
+        If there is no coalang file for the language.
+    """
+    return LanguageSpec(LanguageDefinition(language, coalang_dir=coalang_dir))
@@ -0,0 +1,135 @@
+from bears.general.HTTPSBear import get_https_prober, HTTPSBear
+from bears.general.InvalidLinkBear import InvalidLinkBear
+from bears.general.LinkChecker import get_link_checker, get_timeout_function
+from bears.general.LinkStatusCache import get_link_status_cache
+from bears.general.URLBear import URLBear
+from coalib.bearlib import deprecate_settings
+from coalib.bears.GlobalBear import GlobalBear
+from coalib.settings.Setting import typed_dict, typed_list
+from dependency_management.requirements.PipRequirement import PipRequirement
+
+
+class LinkCheckBear(GlobalBear):
+    DEFAULT_TIMEOUT = 15
+    LANGUAGES = {'All'}
+    REQUIREMENTS = {PipRequirement('requests', '2.12')}
+    AUTHORS = {'The coala developers'}
+    AUTHORS_EMAILS = {'coala-devel@googlegroups.com'}
+    LICENSE = 'AGPL-3.0'
+    CAN_DETECT = {'Documentation'}
+    CAN_FIX = {'HTTP Links'}
+
+    @deprecate_settings(link_ignore_regex='ignore_regex',
+                        network_timeout=('timeout', lambda t: {'*': t}))
+    def run(self,
+            network_timeout: typed_dict(str, int, DEFAULT_TIMEOUT) = dict(),
+            link_ignore_regex: str = r'([.\/]example\.com|\{|\$)',
+            link_ignore_list: typed_list(str) = '',
+            follow_redirects: bool = False,
+            check_https: bool = True,
+            max_concurrent_requests: int = 8,
+            max_requests_per_host: int = 2,
+            requests_per_second_per_host: float = 0,
+            max_retries: int = 3,
+            link_status_cache: str = '',
+            max_redirects: int = 30,
+            ):
+        """
+        Find links in all files and check if they are valid and whether
+        http links can be replaced with https.
+
+        This yields the same results as ``InvalidLinkBear`` and ``HTTPSBear``,
+        but collects the links of all files first, so every distinct link is
+        requested only once and the requests of all files are sent
+        concurrently.
+
+        Warning: This bear will make HEAD requests to all URLs mentioned in
+        your codebase, which can potentially be destructive. As an example,
+        this bear would naively just visit the URL from a line that goes like
+        `do_not_ever_open = 'https://api.acme.inc/delete-all-data'` wiping out
+        all your data.
+
+        :param network_timeout:   A dict mapping URLs and timeout to be
+                                  used for that URL. All the URLs that have
+                                  the same host as that of URLs provided
+                                  will be passed that timeout. It can also
+                                  contain a wildcard timeout entry with key
+                                  '*'. The timeout of all the websites not
+                                  in the dict will be the value of the key
+                                  '*'.
+        :param link_ignore_regex: A regex for urls to ignore.
+        :param link_ignore_list:  Comma separated url globs to ignore.
+        :param follow_redirects:  Set to true to autocorrect redirects.
+        :param check_https:       Set to false to not check whether http
+                                  links can be replaced with https.
+        :param max_concurrent_requests:
+                                  The maximum number of HEAD requests sent at
+                                  the same time.
+        :param max_requests_per_host:
+                                  The maximum number of HEAD requests sent at
+                                  the same time to a single host.
+        :param requests_per_second_per_host:
+                                  The maximum number of HEAD requests sent per
+                                  second to a single host. Unlimited if 0.
+        :param max_retries:       The maximum number of times a HEAD request
+                                  is retried when the server responds with
+                                  HTTP 429 or with HTTP 503 and a
+                                  ``Retry-After`` header.
+        :param link_status_cache: Keep the outcome of requests to links to
+                                  look it up instead of sending the same
+                                  request again, see ``URLHeadBear``. No
+                                  cache is used if empty.
+        :param max_redirects:     The maximum number of redirects to follow
+                                  for links responding with a 3xx status
+                                  code.
+        """
+        occurrences = [
+            (filename, line_number, link, context)
+            for filename, file in self.file_dict.items()
+            for line_number, link, context in URLBear.analyze_links_in_file(
+                file, link_ignore_regex, link_ignore_list)]
+
+        get_timeout = get_timeout_function(network_timeout,
+                                           self.DEFAULT_TIMEOUT)
+        link_checker = get_link_checker(max_concurrent_requests,
+                                        max_requests_per_host,
+                                        requests_per_second_per_host,
+                                        max_retries)
+        status_cache = get_link_status_cache(link_status_cache)
+        head_responses = link_checker.head_all(
+            (link for _, _, link, _ in occurrences), get_timeout,
+            status_cache)
+
+        redirect_chains = {}
+        if follow_redirects and max_redirects > 0:
+            redirect_chains = link_checker.get_redirect_chains(
+                head_responses, get_timeout, status_cache, max_redirects)
+
+        https_responses = {}
+        if check_https:
+            https_responses = get_https_prober(
+                max_concurrent_requests, max_requests_per_host,
+                requests_per_second_per_host, max_retries).probe_all(
+                    [HTTPSBear.get_https_link(link)
+                     for link in head_responses
+                     if not link.startswith(HTTPSBear.HTTPS_PREFIX)],
+                    get_timeout,
+                    status_cache)
+
+        self.debug('Link check metrics:', link_checker.scheduler.metrics)
+
+        for filename, line_number, link, context in occurrences:
+            file = self.file_dict[filename]
+            response = head_responses[link]
+            code = (None if isinstance(response, Exception)
+                    else response.status_code)
+            yield from InvalidLinkBear.get_link_results(
+                self, filename, file, line_number, link, code, context,
+                redirect_chains.get(link), follow_redirects)
+
+            if check_https and not link.startswith(HTTPSBear.HTTPS_PREFIX):
+                result = HTTPSBear.get_https_result(
+                    self, filename, file, line_number, link,
+                    https_responses.get(HTTPSBear.get_https_link(link)))
+                if result is not None:
+                    yield result
@@ -0,0 +1,252 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+from http.cookiejar import DefaultCookiePolicy
+import threading
+from urllib.parse import urljoin, urlparse
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from bears.general.RequestScheduler import RequestScheduler
+
+
+class LinkChecker:
+    """
+    Sends HEAD requests to many URLs concurrently.
+
+    Requests to the same host share a session, so connections are kept alive
+    and reused. All requests are sent through a ``RequestScheduler``, which
+    limits their concurrency and rate and retries rejected ones.
+    """
+
+    def __init__(self, max_workers=8, max_per_host=2, requests_per_second=0,
+                 max_retries=3):
+        """
+        :param max_workers:         The maximum number of requests running at
+                                    the same time.
+        :param max_per_host:        The maximum number of requests running at
+                                    the same time against a single host.
+        :param requests_per_second: The maximum number of requests per second
+                                    to a single host, unlimited if 0.
+        :param max_retries:         The maximum number of retries of requests
+                                    rejected with HTTP 429 or 503.
+        """
+        self.max_workers = max_workers
+        self.max_per_host = max_per_host
+        self.scheduler = RequestScheduler(max_workers, max_per_host,
+                                          requests_per_second, max_retries)
+        self._sessions = {}
+        self._lock = threading.Lock()
+
+    def get_session(self, host):
+        """
+        Retrieves the session used for requests to a host, creating it on
+        first use.
+
+        The session does not keep cookies, so every response is the same as
+        the one of a request without a session.
+
+        :param host: The network location of the URLs, e.g. ``coala.io``.
+        :return:     A ``requests.Session`` instance.
+        """
+        with self._lock:
+            if host not in self._sessions:
+                session = requests.Session()
+                session.cookies.set_policy(
+                    DefaultCookiePolicy(allowed_domains=[]))
+                adapter = HTTPAdapter(pool_maxsize=self.max_per_host)
+                session.mount('http://', adapter)
+                session.mount('https://', adapter)
+                self._sessions[host] = session
+            return self._sessions[host]
+
+    def head(self, url, timeout, status_cache=None):
+        """
+        Sends a HEAD request without following redirects.
+
+        :param url:          The URL to request.
+        :param timeout:      The timeout of the request in seconds.
+        :param status_cache: An optional ``LinkStatusCache`` to look up the
+                             outcome in before sending the request and to
+                             store it in afterwards.
+        :return:             The ``requests.models.Response`` or the
+                             ``requests.exceptions.RequestException`` raised
+                             by the request.
+        """
+        if status_cache is not None:
+            response = status_cache.get_response(url)
+            if response is not None:
+                return response
+
+        host = urlparse(url).netloc
+        session = self.get_session(host)
+
+        def request():
+            try:
+                return session.head(url, allow_redirects=False,
+                                    timeout=timeout)
+            except requests.exceptions.RequestException as exc:
+                return exc
+
+        response = self.scheduler.send(host, request)
+
+        if status_cache is not None:
+            status_cache.set_response(url, response)
+        return response
+
+    def head_all(self, urls, get_timeout, status_cache=None):
+        """
+        Sends HEAD requests to all given URLs concurrently. Every URL is only
+        requested once.
+
+        :param urls:         An iterable of URLs to request.
+        :param get_timeout:  A function returning the timeout in seconds for
+                             a host.
+        :param status_cache: An optional ``LinkStatusCache``, see ``head``.
+        :return:             A dict mapping each URL to the return value of
+                             ``head`` for it.
+        """
+        urls = list(dict.fromkeys(urls))
+        timeouts = [get_timeout(urlparse(url).netloc) for url in urls]
+        return dict(zip(urls, self._map(self.head,
+                                        urls,
+                                        timeouts,
+                                        [status_cache] * len(urls))))
+
+    def follow_redirects(self, url, timeout, status_cache=None, max_hops=30,
+                         response=None):
+        """
+        Sends HEAD requests to a URL and all URLs it redirects to.
+
+        :param url:          The URL to request first.
+        :param timeout:      The timeout of each request in seconds.
+        :param status_cache: An optional ``LinkStatusCache``, see ``head``.
+        :param max_hops:     The maximum number of redirects to follow.
+        :param response:     The return value of ``head`` for ``url`` if it
+                             was already requested.
+        :return:             A list of the return values of ``head`` for
+                             each URL of the redirect chain, starting with
+                             ``url``. The last element is a redirect itself
+                             if there are more than ``max_hops`` redirects.
+        """
+        if response is None:
+            response = self.head(url, timeout, status_cache)
+        responses = [response]
+        while (len(responses) <= max_hops and
+               not isinstance(responses[-1], Exception) and
+               responses[-1].is_redirect):
+            url = urljoin(url, responses[-1].headers['Location'])
+            responses.append(self.head(url, timeout, status_cache))
+        return responses
+
+    def follow_all_redirects(self, responses, get_timeout, status_cache=None,
+                             max_hops=30):
+        """
+        Follows the redirects of all given responses concurrently.
+
+        :param responses:    A dict mapping URLs to the return value of
+                             ``head`` for them, like the one returned by
+                             ``head_all``. Only responses with a 3xx status
+                             code are followed.
+        :param get_timeout:  A function returning the timeout in seconds for
+                             a host.
+        :param status_cache: An optional ``LinkStatusCache``, see ``head``.
+        :param max_hops:     The maximum number of redirects to follow per
+                             URL.
+        :return:             A dict mapping each URL with a 3xx status code
+                             to the return value of ``follow_redirects``
+                             for it.
+        """
+        urls = [url for url, response in responses.items()
+                if not isinstance(response, Exception) and
+                300 <= response.status_code < 400]
+        return dict(zip(urls, self._map(
+            self.follow_redirects,
+            urls,
+            [get_timeout(urlparse(url).netloc) for url in urls],
+            [status_cache] * len(urls),
+            [max_hops] * len(urls),
+            [responses[url] for url in urls])))
+
+    def get_redirect_chains(self, responses, get_timeout, status_cache=None,
+                            max_hops=30):
+        """
+        Follows the redirects of all given responses concurrently and
+        collects the URLs of the redirect chains.
+
+        :param responses:    A dict mapping URLs to the return value of
+                             ``head`` for them, see ``follow_all_redirects``.
+        :param get_timeout:  A function returning the timeout in seconds for
+                             a host.
+        :param status_cache: An optional ``LinkStatusCache``, see ``head``.
+        :param max_hops:     The maximum number of redirects to follow per
+                             URL.
+        :return:             A dict mapping each URL with a 3xx status code
+                             whose redirects could be resolved to a tuple of
+                             the URLs of its redirect chain, starting with
+                             the URL itself and ending with the final target.
+        """
+        redirect_chains = {}
+        for url, chain in self.follow_all_redirects(
+                responses, get_timeout, status_cache, max_hops).items():
+            if not (isinstance(chain[-1], Exception) or
+                    chain[-1].is_redirect):
+                redirect_chains[url] = tuple(response.url
+                                             for response in chain)
+        return redirect_chains
+
+    def _map(self, function, *iterables):
+        """
+        Calls a function with the elements of the iterables as arguments in
+        up to ``max_workers`` threads, like the builtin ``map``.
+        """
+        count = len(iterables[0])
+        if count < 2 or self.max_workers < 2:
+            return list(map(function, *iterables))
+
+        with ThreadPoolExecutor(min(self.max_workers, count)) as executor:
+            return list(executor.map(function, *iterables))
+
+
+def get_timeout_function(network_timeout, default_timeout):
+    """
+    Builds a function returning the timeout of requests to a host.
+
+    :param network_timeout: A dict mapping URLs to the timeout of requests to
+                            their host, like the ``network_timeout`` setting
+                            of ``URLHeadBear``. The key ``*`` sets the timeout
+                            of all other hosts.
+    :param default_timeout: The timeout of hosts not in ``network_timeout``
+                            if there is no ``*`` key.
+    :return:                A function taking a host, returning its timeout.
+    """
+    network_timeout = {urlparse(url).netloc
+                       if not url == '*' else '*': timeout
+                       for url, timeout in network_timeout.items()}
+    default_timeout = network_timeout.get('*', default_timeout)
+
+    def get_timeout(host):
+        return network_timeout.get(host, default_timeout)
+
+    return get_timeout
+
+
+@lru_cache()
+def get_link_checker(max_workers=8, max_per_host=2, requests_per_second=0,
+                     max_retries=3):
+    """
+    Retrieves a ``LinkChecker`` shared by all bears and files of a run, so its
+    connections are reused and its limits apply to all requests.
+
+    :param max_workers:         The maximum number of requests running at the
+                                same time.
+    :param max_per_host:        The maximum number of requests running at the
+                                same time against a single host.
+    :param requests_per_second: The maximum number of requests per second to
+                                a single host, unlimited if 0.
+    :param max_retries:         The maximum number of retries of requests
+                                rejected with HTTP 429 or 503.
+    :return:                    The ``LinkChecker`` instance.
+    """
+    return LinkChecker(max_workers, max_per_host, requests_per_second,
+                       max_retries)
@@ -0,0 +1,182 @@
+from collections import namedtuple
+from functools import lru_cache
+import sqlite3
+import threading
+import time
+from urllib.parse import urlsplit, urlunsplit
+
+import requests
+
+
+LinkStatus = namedtuple('LinkStatus',
+                        'status_code redirect_target timestamp error_class '
+                        'error_message')
+
+
+def normalize_url(url):
+    """
+    Normalizes a URL, so URLs that point to the same resource share an entry
+    of the ``LinkStatusCache``.
+
+    The scheme and host are lowercased, default ports of http and https,
+    also for VCS URLs like ``git+https``, and the fragment are removed and an
+    empty path is replaced by ``/``.
+
+    :param url: The URL to normalize.
+    :return:    The normalized URL.
+    """
+    parts = urlsplit(url)
+    scheme = parts.scheme.lower()
+    netloc = parts.netloc.lower()
+    for default_port in (('http', ':80'), ('https', ':443')):
+        if (scheme.rpartition('+')[2] == default_port[0] and
+                netloc.endswith(default_port[1])):
+            netloc = netloc[:-len(default_port[1])]
+    return urlunsplit((scheme, netloc, parts.path or '/', parts.query, ''))
+
+
+class LinkStatusCache:
+    """
+    Stores the outcome of HEAD requests to URLs, so every URL is requested
+    only once within a run and, if a cache file is given, across runs.
+
+    Entries expire depending on the class of their status code, e.g. a
+    server error is retried much earlier than a successful response.
+    """
+
+    # Time to live of the entries in seconds, per status code class.
+    DEFAULT_TTLS = {'2xx': 24 * 60 * 60,
+                    '3xx': 24 * 60 * 60,
+                    '4xx': 60 * 60,
+                    '5xx': 5 * 60,
+                    'error': 5 * 60}
+
+    def __init__(self, cache_file=':memory:', ttls=None):
+        """
+        :param cache_file: The path of the SQLite database to keep the
+                           entries in between runs. Entries are only kept in
+                           memory if ``:memory:``.
+        :param ttls:       A dict overriding some of the ``DEFAULT_TTLS``.
+        """
+        self.ttls = dict(self.DEFAULT_TTLS, **(ttls or {}))
+        self.statuses = {}
+        self._lock = threading.Lock()
+        self._database = None
+        if cache_file != ':memory:':
+            self._database = sqlite3.connect(cache_file, timeout=30,
+                                             check_same_thread=False)
+            self._database.execute(
+                'CREATE TABLE IF NOT EXISTS link_status (url TEXT PRIMARY '
+                'KEY, status_code INTEGER, redirect_target TEXT, timestamp '
+                'REAL, error_class TEXT, error_message TEXT)')
+            self._database.commit()
+
+    def get_ttl(self, status):
+        """
+        :param status: A ``LinkStatus``.
+        :return:       The time to live of the status in seconds.
+        """
+        if status.status_code is None:
+            return self.ttls['error']
+        return self.ttls.get('%dxx' % (status.status_code // 100),
+                             self.ttls['error'])
+
+    def get(self, url):
+        """
+        Retrieves the status of a URL.
+
+        :param url: The URL to look up.
+        :return:    The ``LinkStatus`` of the URL or None if there is no entry
+                    or it expired.
+        """
+        url = normalize_url(url)
+        with self._lock:
+            status = self.statuses.get(url)
+            if status is None and self._database is not None:
+                row = self._database.execute(
+                    'SELECT status_code, redirect_target, timestamp, '
+                    'error_class, error_message FROM link_status '
+                    'WHERE url = ?',
+                    (url,)).fetchone()
+                if row is not None:
+                    status = self.statuses[url] = LinkStatus(*row)
+
+        if status is None or time.time() - status.timestamp > self.get_ttl(
+                status):
+            return None
+        return status
+
+    def set(self, url, status):
+        """
+        Stores the status of a URL.
+
+        :param url:    The URL.
+        :param status: The ``LinkStatus`` of the URL.
+        """
+        url = normalize_url(url)
+        with self._lock:
+            self.statuses[url] = status
+            if self._database is not None:
+                self._database.execute(
+                    'INSERT OR REPLACE INTO link_status '
+                    'VALUES (?, ?, ?, ?, ?, ?)',
+                    (url,) + tuple(status))
+                self._database.commit()
+
+    def get_response(self, url):
+        """
+        Retrieves the outcome of a HEAD request to a URL.
+
+        :param url: The URL to look up.
+        :return:    A ``requests.models.Response`` or
+                    ``requests.exceptions.RequestException`` like the one of
+                    the request, or None if there is no valid entry.
+        """
+        status = self.get(url)
+        if status is None:
+            return None
+
+        if status.error_class is not None:
+            error_class = getattr(requests.exceptions, status.error_class,
+                                  requests.exceptions.RequestException)
+            return error_class(status.error_message)
+
+        response = requests.models.Response()
+        response.url = url
+        response.status_code = status.status_code
+        if status.redirect_target is not None:
+            response.headers['Location'] = status.redirect_target
+        return response
+
+    def set_response(self, url, response):
+        """
+        Stores the outcome of a HEAD request to a URL.
+
+        :param url:      The URL.
+        :param response: The ``requests.models.Response`` or
+                         ``requests.exceptions.RequestException`` of the
+                         request.
+        """
+        if isinstance(response, Exception):
+            status = LinkStatus(None, None, time.time(),
+                                type(response).__name__, str(response))
+        else:
+            status = LinkStatus(response.status_code,
+                                response.headers.get('Location'),
+                                time.time(),
+                                None,
+                                None)
+        self.set(url, status)
+
+
+@lru_cache()
+def get_link_status_cache(cache_file=':memory:'):
+    """
+    Retrieves a ``LinkStatusCache`` shared by all bears and files of a run.
+
+    :param cache_file: The path of the SQLite database to keep the entries
+                       in, or ``:memory:`` to only keep them in memory.
+    :return:           The ``LinkStatusCache`` instance or None if
+                       ``cache_file`` is empty.
+    """
+    return LinkStatusCache(cache_file) if cache_file else None
@@ -1,14 +1,26 @@
+from concurrent.futures import ThreadPoolExecutor
+from functools import lru_cache
+import sqlite3
+import threading
+import time
+from urllib.parse import urlparse
+
 import requests
+from requests.adapters import HTTPAdapter
 
+from bears.general.LinkChecker import get_link_checker, get_timeout_function
+from bears.general.LinkStatusCache import get_link_status_cache, normalize_url
 from bears.general.URLHeadBear import URLHeadBear
 
 from coalib.bears.LocalBear import LocalBear
 from coalib.results.Result import Result
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
+from coalib.settings.Setting import typed_dict
 
 from dependency_management.requirements.PipRequirement import PipRequirement
 
 from memento_client import MementoClient
+from memento_client.memento_client import DEFAULT_TIMEGATE_BASE_URI
 
 
 class MementoBear(LocalBear):
@@ -37,17 +49,30 @@ class MementoBear(LocalBear):
         return True
 
     @staticmethod
-    def get_redirect_urls(link):
-        urls = []
-
-        resp = requests.head(link, allow_redirects=True)
-        for redirect in resp.history:
-            urls.append(redirect.url)
+    def get_redirect_urls(link, status_cache=None):
+        """
+        Retrieves the URLs a link redirects through.
 
-        return urls
+        :param link:         The link (str) to follow.
+        :param status_cache: An optional ``LinkStatusCache`` to look up the
+                             responses in.
+        :return:             A list of the link and all URLs it redirects to,
+                             without the final one.
+        """
+        responses = get_link_checker().follow_redirects(link, None,
+                                                        status_cache)
+        return [response.url for response in responses[:-1]]
 
     def run(self, filename, file, dependency_results=dict(),
             follow_redirects: bool = True,
+            max_concurrent_requests: int = 8,
+            requests_per_second_per_host: float = 0,
+            memento_cache: str = '',
+            network_timeout: typed_dict(str, int, DEFAULT_TIMEOUT) = dict(),
+            max_requests_per_host: int = 2,
+            max_retries: int = 3,
+            link_status_cache: str = '',
+            max_redirects: int = 30,
             ):
         """
         Find links in any text file and check if they are archived.
@@ -63,19 +88,91 @@ class MementoBear(LocalBear):
         `do_not_ever_open = 'https://api.acme.inc/delete-all-data'` wiping out
         all your data.
 
-        :param dependency_results: Results given by URLHeadBear.
-        :param follow_redirects:   Set to true to check all redirect urls.
+        :param dependency_results:      Results given by URLHeadBear.
+        :param follow_redirects:        Set to true to check all redirect
+                                        urls.
+        :param max_concurrent_requests: The maximum number of archive lookups
+                                        and HEAD requests running at the same
+                                        time.
+        :param requests_per_second_per_host:
+                                        The maximum number of archive lookups
+                                        or HEAD requests started per second
+                                        for a single host. Unlimited if 0.
+        :param memento_cache:           Keep whether links are archived to
+                                        look it up instead of asking the
+                                        archives again, in all files. Set to
+                                        ``:memory:`` to keep it for this run
+                                        only or to the path of an SQLite
+                                        database to keep it in between runs.
+                                        Archived links are looked up again
+                                        after a month, links that are not
+                                        archived after a day. No cache is
+                                        used if empty.
+        :param network_timeout:         A dict mapping URLs and timeout to be
+                                        used for that URL, see
+                                        ``URLHeadBear``.
+        :param max_requests_per_host:   The maximum number of archive lookups
+                                        or HEAD requests running at the same
+                                        time against a single host.
+        :param max_retries:             The maximum number of times a HEAD
+                                        request is retried when the server
+                                        responds with HTTP 429 or with HTTP
+                                        503 and a ``Retry-After`` header.
+        :param link_status_cache:       Keep the outcome of requests to links
+                                        to look it up instead of sending the
+                                        same request again, see
+                                        ``URLHeadBear``. No cache is used if
+                                        empty.
+        :param max_redirects:           The maximum number of redirects to
+                                        follow for links responding with a
+                                        3xx status code.
         """
-        self._mc = MementoClient()
+        link_checker = get_link_checker(max_concurrent_requests,
+                                        max_requests_per_host,
+                                        requests_per_second_per_host,
+                                        max_retries)
+        results = [result
+                   for result in dependency_results.get(URLHeadBear.name, [])
+                   if result.http_status_code and
+                   200 <= result.http_status_code < 400]
+
+        redirect_chains = {}
+        if follow_redirects:
+            redirect_chains = {result.link: result.redirect_chain
+                               for result in results}
+            unfollowed = {result.link: result.head_response
+                          for result in results
+                          if result.redirect_chain is None and
+                          300 <= result.http_status_code < 400}
+            if unfollowed:
+                # URLHeadBear did not record the redirect chains of these
+                # links. They are followed with the shared link checker, so
+                # the requests are scheduled and cached like the ones of
+                # URLHeadBear.
+                redirect_chains.update(link_checker.get_redirect_chains(
+                    unfollowed,
+                    get_timeout_function(network_timeout,
+                                         self.DEFAULT_TIMEOUT),
+                    get_link_status_cache(link_status_cache),
+                    max_redirects))
 
-        for result in dependency_results.get(URLHeadBear.name, []):
+        links = []
+        for result in results:
             line_number, link, code, context = result.contents
+            # The redirect chain ends with the final target, which is not a
+            # redirect itself.
+            redirect_urls = (redirect_chains.get(link) or ())[:-1]
+            links.append((line_number, link, redirect_urls))
 
-            if not (code and 200 <= code < 400):
-                continue
+        archived = get_memento_archive(
+            max_concurrent_requests, memento_cache, max_requests_per_host,
+            requests_per_second_per_host, max_retries).check_all(
+                [url
+                 for _, link, redirect_urls in links
+                 for url in (link,) + tuple(redirect_urls)])
 
-            status = MementoBear.check_archive(self._mc, link)
-            if not status:
+        for line_number, link, redirect_urls in links:
+            if not archived[link]:
                 yield Result.from_values(
                     self,
                     ('This link is not archived yet, visit '
@@ -86,19 +183,184 @@ class MementoBear(LocalBear):
                     severity=RESULT_SEVERITY.INFO
                 )
 
-            if follow_redirects and 300 <= code < 400:  # HTTP status 30x
-                redirect_urls = MementoBear.get_redirect_urls(link)
-
-                for url in redirect_urls:
-                    status = MementoBear.check_archive(self._mc, url)
-                    if not status:
-                        yield Result.from_values(
-                            self,
-                            ('This link redirects to %s and not archived yet, '
-                             'visit https://web.archive.org/save/%s to get it '
-                             'archived.'
-                             % (url, url)),
-                            file=filename,
-                            line=line_number,
-                            severity=RESULT_SEVERITY.INFO
-                        )
+            for url in redirect_urls:
+                if not archived[url]:
+                    yield Result.from_values(
+                        self,
+                        ('This link redirects to %s and not archived yet, '
+                         'visit https://web.archive.org/save/%s to get it '
+                         'archived.'
+                         % (url, url)),
+                        file=filename,
+                        line=line_number,
+                        severity=RESULT_SEVERITY.INFO
+                    )
+
+
+class MementoArchive:
+    """
+    Looks up whether links are archived, with up to ``max_workers`` lookups
+    running at the same time. All lookups share the connections of one
+    session and are scheduled as requests to the TimeGate by a
+    ``RequestScheduler``, by default the one of the ``LinkChecker`` shared by
+    all link bears, so its limits and metrics cover all their requests.
+    """
+
+    def __init__(self, max_workers=8, cache=None,
+                 timegate_uri=DEFAULT_TIMEGATE_BASE_URI,
+                 scheduler=None):
+        """
+        :param max_workers:  The maximum number of lookups running at the
+                             same time.
+        :param cache:        An optional ``ArchiveStatusCache`` to look up
+                             links in before asking the archives.
+        :param timegate_uri: The base URI of the TimeGate to ask.
+        :param scheduler:    The ``RequestScheduler`` to schedule the lookups
+                             with or None to use the one of the default
+                             shared ``LinkChecker``.
+        """
+        self.max_workers = max_workers
+        self.cache = cache
+        self.timegate_uri = timegate_uri
+        self.scheduler = (scheduler if scheduler is not None
+                          else get_link_checker().scheduler)
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_maxsize=max_workers)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+        self._local = threading.local()
+
+    def get_client(self):
+        """
+        Retrieves the ``MementoClient`` of the current thread. The clients
+        are not thread safe, but they all use the same session.
+        """
+        if not hasattr(self._local, 'client'):
+            self._local.client = MementoClient(self.timegate_uri,
+                                               session=self.session)
+        return self._local.client
+
+    def is_archived(self, link):
+        """
+        Checks whether a link is archived.
+
+        :param link: The link (str) to check.
+        :return:     True if the link has been archived.
+        """
+        archived = self.cache.get(link) if self.cache is not None else None
+        if archived is None:
+            with self.scheduler.slot(urlparse(self.timegate_uri).netloc):
+                archived = MementoBear.check_archive(self.get_client(), link)
+            if self.cache is not None:
+                self.cache.set(link, archived)
+        return archived
+
+    def check_all(self, links):
+        """
+        Checks concurrently whether links are archived. Every link is only
+        looked up once.
+
+        :param links: An iterable of links.
+        :return:      A dict mapping each link to whether it is archived.
+        """
+        links = list(dict.fromkeys(links))
+        if len(links) < 2 or self.max_workers < 2:
+            return {link: self.is_archived(link) for link in links}
+
+        with ThreadPoolExecutor(min(self.max_workers, len(links))) as executor:
+            return dict(zip(links, executor.map(self.is_archived, links)))
+
+
+class ArchiveStatusCache:
+    """
+    Stores whether links are archived, in memory and optionally in an SQLite
+    database. Links that are archived stay archived, so those entries are
+    kept much longer than the ones of links that are not archived yet.
+    """
+
+    ARCHIVED_TTL = 30 * 24 * 60 * 60
+    NOT_ARCHIVED_TTL = 24 * 60 * 60
+
+    def __init__(self, cache_file=':memory:'):
+        """
+        :param cache_file: The path of the SQLite database to keep the
+                           entries in between runs. Entries are only kept in
+                           memory if ``:memory:``.
+        """
+        self.statuses = {}
+        self._lock = threading.Lock()
+        self._database = None
+        if cache_file != ':memory:':
+            self._database = sqlite3.connect(cache_file, timeout=30,
+                                             check_same_thread=False)
+            self._database.execute(
+                'CREATE TABLE IF NOT EXISTS archive_status (url TEXT PRIMARY '
+                'KEY, archived INTEGER, timestamp REAL)')
+            self._database.commit()
+
+    def get(self, link):
+        """
+        :param link: The link to look up.
+        :return:     Whether the link is archived or None if there is no
+                     entry or it expired.
+        """
+        link = normalize_url(link)
+        with self._lock:
+            status = self.statuses.get(link)
+            if status is None and self._database is not None:
+                status = self._database.execute(
+                    'SELECT archived, timestamp FROM archive_status WHERE '
+                    'url = ?', (link,)).fetchone()
+                if status is not None:
+                    self.statuses[link] = status
+
+        if status is None:
+            return None
+        archived, timestamp = status
+        ttl = self.ARCHIVED_TTL if archived else self.NOT_ARCHIVED_TTL
+        return bool(archived) if time.time() - timestamp <= ttl else None
+
+    def set(self, link, archived):
+        """
+        :param link:     The link.
+        :param archived: Whether the link is archived.
+        """
+        link = normalize_url(link)
+        status = (int(archived), time.time())
+        with self._lock:
+            self.statuses[link] = status
+            if self._database is not None:
+                self._database.execute(
+                    'INSERT OR REPLACE INTO archive_status VALUES (?, ?, ?)',
+                    (link,) + status)
+                self._database.commit()
+
+
+@lru_cache()
+def get_memento_archive(max_workers=8, cache_file='', max_per_host=2,
+                        requests_per_second=0, max_retries=3):
+    """
+    Retrieves a ``MementoArchive`` shared by all files of a run. Its lookups
+    are scheduled with the ``LinkChecker`` of the other link bears with the
+    same settings.
+
+    :param max_workers:  The maximum number of lookups running at the same
+                         time.
+    :param cache_file:   The path of the SQLite database to keep the archive
+                         status in, ``:memory:`` to only keep it in memory or
+                         empty to not cache it at all.
+    :param max_per_host: The maximum number of requests running at the same
+                         time against a single host.
+    :param requests_per_second:
+                         The maximum number of requests started per second
+                         to a single host, unlimited if 0.
+    :param max_retries:  The maximum number of retries of requests rejected
+                         with HTTP 429 or 503.
+    :return:             The ``MementoArchive`` instance.
+    """
+    return MementoArchive(max_workers,
+                          ArchiveStatusCache(cache_file) if cache_file
+                          else None,
+                          scheduler=get_link_checker(
+                              max_workers, max_per_host,
+                              requests_per_second, max_retries).scheduler)
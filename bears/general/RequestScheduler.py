@@ -0,0 +1,188 @@
+from collections import Counter
+from contextlib import contextmanager
+from email.utils import parsedate_to_datetime
+from itertools import count
+import threading
+import time
+
+
+class TokenBucket:
+    """
+    Limits the rate of events. Tokens are refilled at a constant rate up to
+    the capacity of the bucket and every event takes one.
+    """
+
+    def __init__(self, rate, capacity=None):
+        """
+        :param rate:     The number of tokens added per second.
+        :param capacity: The maximum number of tokens in the bucket, i.e. the
+                         number of events allowed in a burst. Defaults to the
+                         rate, but at least 1.
+        """
+        self.rate = rate
+        self.capacity = capacity if capacity is not None else max(1, rate)
+        self.tokens = self.capacity
+        self.updated = time.monotonic()
+        self._lock = threading.Lock()
+
+    def take(self):
+        """
+        Takes a token out of the bucket. If there is none, the next one is
+        reserved.
+
+        :return: The number of seconds to wait until the token is available.
+        """
+        with self._lock:
+            now = time.monotonic()
+            self.tokens = min(self.capacity,
+                              self.tokens + (now - self.updated) * self.rate)
+            self.updated = now
+            self.tokens -= 1
+            return max(0, -self.tokens / self.rate)
+
+
+def parse_retry_after(value):
+    """
+    Parses the value of a ``Retry-After`` header.
+
+    :param value: The number of seconds or an HTTP date.
+    :return:      The number of seconds to wait or None if the value is
+                  invalid.
+    """
+    try:
+        return max(0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return None
+
+
+class RequestScheduler:
+    """
+    Schedules requests to many hosts: limits the number of requests running
+    at the same time in total and per host, limits the rate of requests per
+    host with a ``TokenBucket`` and retries requests that were rejected with
+    HTTP 429 (Too Many Requests) or 503 (Service Unavailable).
+
+    The ``metrics`` are collected over all requests.
+    """
+
+    def __init__(self, max_concurrent=8, max_per_host=2,
+                 requests_per_second=0, max_retries=3, backoff=1,
+                 max_retry_wait=60):
+        """
+        :param max_concurrent:      The maximum number of requests running at
+                                    the same time.
+        :param max_per_host:        The maximum number of requests running at
+                                    the same time against a single host.
+        :param requests_per_second: The maximum number of requests per second
+                                    to a single host, unlimited if 0.
+        :param max_retries:         The maximum number of retries of a
+                                    request.
+        :param backoff:             The number of seconds to wait before the
+                                    first retry if the server does not send a
+                                    ``Retry-After`` header. It is doubled for
+                                    every further retry.
+        :param max_retry_wait:      Requests are not retried if the server
+                                    asks to wait longer than this number of
+                                    seconds.
+        """
+        self.max_per_host = max_per_host
+        self.requests_per_second = requests_per_second
+        self.max_retries = max_retries
+        self.backoff = backoff
+        self.max_retry_wait = max_retry_wait
+        self.requests = Counter()
+        self.retries = Counter()
+        self.queue_wait = 0.0
+        self._slots = threading.BoundedSemaphore(max_concurrent)
+        self._host_slots = {}
+        self._buckets = {}
+        self._lock = threading.Lock()
+
+    @property
+    def metrics(self):
+        """
+        A dict with the number of ``requests`` and ``retries`` per host and
+        the total ``queue_wait`` time in seconds requests spent waiting for a
+        slot or a token.
+        """
+        with self._lock:
+            return {'requests': dict(self.requests),
+                    'retries': dict(self.retries),
+                    'queue_wait': self.queue_wait}
+
+    @contextmanager
+    def slot(self, host):
+        """
+        Waits until a request to a host may be sent and holds the slot of the
+        request while the context is active.
+
+        :param host: The network location of the request, e.g. ``coala.io``.
+        """
+        start = time.monotonic()
+        with self._lock:
+            if host not in self._host_slots:
+                self._host_slots[host] = threading.BoundedSemaphore(
+                    self.max_per_host)
+                if self.requests_per_second:
+                    self._buckets[host] = TokenBucket(
+                        self.requests_per_second)
+
+        with self._host_slots[host], self._slots:
+            if host in self._buckets:
+                time.sleep(self._buckets[host].take())
+            with self._lock:
+                self.requests[host] += 1
+                self.queue_wait += time.monotonic() - start
+            yield
+
+    def get_retry_delay(self, response, attempt):
+        """
+        Decides whether a request is retried.
+
+        Requests are retried after HTTP 429 and after HTTP 503 with a
+        ``Retry-After`` header, as long as the retries are not used up.
+
+        :param response: The ``requests.models.Response`` or the exception of
+                         the request.
+        :param attempt:  The number of retries of the request so far.
+        :return:         The number of seconds to wait before retrying or
+                         None if the request is not retried.
+        """
+        if isinstance(response, Exception) or attempt >= self.max_retries:
+            return None
+
+        retry_after = response.headers.get('Retry-After')
+        if response.status_code != 429 and not (
+                response.status_code == 503 and retry_after is not None):
+            return None
+
+        delay = (parse_retry_after(retry_after)
+                 if retry_after is not None else None)
+        if delay is None:
+            delay = self.backoff * 2 ** attempt
+        return delay if delay <= self.max_retry_wait else None
+
+    def send(self, host, request):
+        """
+        Sends a request, waiting for a slot first and retrying it if the host
+        asks to.
+
+        :param host:    The network location of the request.
+        :param request: A function sending the request, returning the
+                        ``requests.models.Response`` or an exception.
+        :return:        The return value of the last call of ``request``.
+        """
+        for attempt in count():
+            with self.slot(host):
+                response = request()
+            delay = self.get_retry_delay(response, attempt)
+            if delay is None:
+                return response
+
+            with self._lock:
+                self.retries[host] += 1
+            time.sleep(delay)
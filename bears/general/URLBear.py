@@ -20,6 +20,41 @@ class LINK_CONTEXT(Flag):
     pip_vcs_url = 2
 
 
+URL_REGEX = re.compile(
+    r"""
+    ((git\+|bzr\+|svn\+|hg\+|)  # For VCS URLs
+    https?://                   # http:// or https:// as only these
+                                # are supported by the ``requests``
+                                # library
+    [^.:%\s_/?#[\]@\\]+         # Initial part of domain
+    \.                          # A required dot `.`
+    (
+        ((?:%[A-Fa-f0-9][A-Fa-f0-9])*[^\s()%\'"`<>|\\\[\]]+)
+                                # Path name
+                                # This part allows precentage
+                                # encoding like %3F
+                                # and does not allow
+                                # any parenthesis: balanced or
+                                # unbalanced.
+    |                           # OR
+        \((?:%[A-Fa-f0-9][A-Fa-f0-9])*[^\s()%\'"`<>|\\\[\]]*\)
+                                # Path name contained within ()
+                                # This part allows path names that
+                                # are explicitly enclosed within one
+                                # set of parenthesis.
+                                # An example can be:
+                                # http://wik.org/Hello_(Adele_song)/200
+    )
+    *)
+                                # Thus, the whole part above
+                                # prevents matching of
+                                # Unbalanced parenthesis
+    (?<!\.)(?<!,)               # Exclude trailing `.` or `,` from URL
+    """, re.VERBOSE)
+
+XMLNS_REGEX = re.compile(r'xmlns:?\w*="(.*)"')
+
+
 @generate_repr(('id', hex),
                'origin',
                'affected_code',
@@ -71,58 +106,36 @@ class URLBear(LocalBear):
     @staticmethod
     def extract_links_from_file(file, link_ignore_regex, link_ignore_list):
         link_ignore_regex = re.compile(link_ignore_regex)
-        regex = re.compile(
-            r"""
-            ((git\+|bzr\+|svn\+|hg\+|)  # For VCS URLs
-            https?://                   # http:// or https:// as only these
-                                        # are supported by the ``requests``
-                                        # library
-            [^.:%\s_/?#[\]@\\]+         # Initial part of domain
-            \.                          # A required dot `.`
-            (
-                ((?:%[A-Fa-f0-9][A-Fa-f0-9])*[^\s()%\'"`<>|\\\[\]]+)
-                                        # Path name
-                                        # This part allows precentage
-                                        # encoding like %3F
-                                        # and does not allow
-                                        # any parenthesis: balanced or
-                                        # unbalanced.
-            |                           # OR
-                \((?:%[A-Fa-f0-9][A-Fa-f0-9])*[^\s()%\'"`<>|\\\[\]]*\)
-                                        # Path name contained within ()
-                                        # This part allows path names that
-                                        # are explicitly enclosed within one
-                                        # set of parenthesis.
-                                        # An example can be:
-                                        # http://wik.org/Hello_(Adele_song)/200
-            )
-            *)
-                                        # Thus, the whole part above
-                                        # prevents matching of
-                                        # Unbalanced parenthesis
-            (?<!\.)(?<!,)               # Exclude trailing `.` or `,` from URL
-            """, re.VERBOSE)
+        link_ignore_globs = ((link_ignore_list,)
+                             if isinstance(link_ignore_list, str)
+                             else tuple(link_ignore_list))
+        # Lines end with a newline, except the last one maybe. Every line is
+        # followed by a separator, so no match spans two lines.
+        buffer = '\n'.join(file)
         file_context = {}
-        for line_number, line in enumerate(file):
-            xmlns_regex = re.compile(r'xmlns:?\w*="(.*)"')
-            for match in re.findall(regex, line):
-                link = match[0]
-                link_context = file_context.get(link)
-                if not link_context:
-                    link_context = LINK_CONTEXT.no_context
-                    xmlns_match = xmlns_regex.search(line)
-                    if xmlns_match and link in xmlns_match.groups():
-                        link_context |= LINK_CONTEXT.xml_namespace
-                    if link.startswith(('hg+', 'bzr+', 'git+', 'svn+')):
-                        link_context |= LINK_CONTEXT.pip_vcs_url
-                    file_context[link] = link_context
-                if not (link_ignore_regex.search(link) or
-                        fnmatch(link, link_ignore_list)):
-                    yield link, line_number, link_context
-
-    def analyze_links_in_file(self, file, link_ignore_regex,
-                              link_ignore_list):
-        for link, line_number, link_context in self.extract_links_from_file(
+        line_number = 0
+        next_line_start = len(file[0]) + 1 if file else 0
+        for match in URL_REGEX.finditer(buffer):
+            while match.start() >= next_line_start:
+                line_number += 1
+                next_line_start += len(file[line_number]) + 1
+            link = match.group(1)
+            link_context = file_context.get(link)
+            if not link_context:
+                link_context = LINK_CONTEXT.no_context
+                xmlns_match = XMLNS_REGEX.search(file[line_number])
+                if xmlns_match and link in xmlns_match.groups():
+                    link_context |= LINK_CONTEXT.xml_namespace
+                if link.startswith(('hg+', 'bzr+', 'git+', 'svn+')):
+                    link_context |= LINK_CONTEXT.pip_vcs_url
+                file_context[link] = link_context
+            if not (link_ignore_regex.search(link) or
+                    fnmatch(link, link_ignore_globs)):
+                yield link, line_number, link_context
+
+    @staticmethod
+    def analyze_links_in_file(file, link_ignore_regex, link_ignore_list):
+        for link, line_number, link_context in URLBear.extract_links_from_file(
                 file, link_ignore_regex, link_ignore_list):
 
             if link_context is link_context.pip_vcs_url:
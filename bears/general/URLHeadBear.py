@@ -1,6 +1,7 @@
 import requests
-from urllib.parse import urlparse
 
+from bears.general.LinkChecker import get_link_checker, get_timeout_function
+from bears.general.LinkStatusCache import get_link_status_cache
 from bears.general.URLBear import URLBear, LINK_CONTEXT
 
 from coalib.bears.LocalBear import LocalBear
@@ -41,7 +42,20 @@ class URLHeadResult(HiddenResult):
     def __init__(self, origin, affected_code,
                  link: str,
                  head_response: (requests.models.Response, Exception),
-                 link_context: LINK_CONTEXT):
+                 link_context: LINK_CONTEXT,
+                 redirect_chain: (tuple, None) = None):
+        """
+        :param link:           The link that was requested.
+        :param head_response:  The ``requests.models.Response`` of the HEAD
+                               request to the link or the exception raised by
+                               it.
+        :param link_context:   The ``LINK_CONTEXT`` of the link.
+        :param redirect_chain: A tuple of the URLs of all responses when
+                               following the redirects of the link, starting
+                               with the link and ending with the final
+                               target. None if the link does not redirect or
+                               the chain could not be resolved.
+        """
 
         http_status_code = (head_response.status_code if
                             isinstance(head_response,
@@ -57,6 +71,7 @@ class URLHeadResult(HiddenResult):
         self.http_status_code = http_status_code
         self.link_context = link_context
         self.head_response = head_response
+        self.redirect_chain = redirect_chain
 
 
 class URLHeadBear(LocalBear):
@@ -80,17 +95,18 @@ class URLHeadBear(LocalBear):
                 if isinstance(head_resp, Exception) else True)
 
     @staticmethod
-    def get_head_response(url, timeout):
-        try:
-            head_resp = requests.head(url, allow_redirects=False,
-                                      timeout=timeout)
-            return head_resp
-        except requests.exceptions.RequestException as exc:
-            return exc
+    def get_head_response(url, timeout, status_cache=None):
+        return get_link_checker().head(url, timeout, status_cache)
 
     @deprecate_settings(network_timeout=('timeout', lambda t: {'*': t}))
     def run(self, filename, file, dependency_results=dict(),
             network_timeout: typed_dict(str, int, DEFAULT_TIMEOUT) = dict(),
+            max_concurrent_requests: int = 8,
+            max_requests_per_host: int = 2,
+            requests_per_second_per_host: float = 0,
+            max_retries: int = 3,
+            link_status_cache: str = '',
+            max_redirects: int = 30,
             ):
         """
         Find links in any text file and tells its head response and
@@ -110,22 +126,57 @@ class URLHeadBear(LocalBear):
                                 '*'. The timeout of all the websites not
                                 in the dict will be the value of the key
                                 '*'.
+        :param max_concurrent_requests:
+                                The maximum number of HEAD requests sent at
+                                the same time.
+        :param max_requests_per_host:
+                                The maximum number of HEAD requests sent at
+                                the same time to a single host.
+        :param requests_per_second_per_host:
+                                The maximum number of HEAD requests sent per
+                                second to a single host. Unlimited if 0.
+        :param max_retries:     The maximum number of times a HEAD request is
+                                retried when the server responds with HTTP 429
+                                or with HTTP 503 and a ``Retry-After`` header.
+        :param link_status_cache:
+                                Keep the outcome of requests to links to look
+                                it up instead of sending the same request
+                                again, in all files and bears. Set to
+                                ``:memory:`` to keep it for this run only or
+                                to the path of an SQLite database to keep it
+                                in between runs. Links are requested again
+                                after some time, depending on their status
+                                code. No cache is used if empty.
+        :param max_redirects:   The maximum number of redirects to follow for
+                                links responding with a 3xx status code. The
+                                redirect chain is recorded in the results for
+                                other bears, so they do not need to follow
+                                the redirects again. Redirects are not
+                                followed if set to 0.
         :param link_ignore_regex: A regex for urls to ignore.
         :param link_ignore_list: Comma separated url globs to ignore
         """
-        network_timeout = {urlparse(url).netloc
-                           if not url == '*' else '*': timeout
-                           for url, timeout in network_timeout.items()}
-
-        for result in dependency_results.get(URLBear.name, []):
-            host = urlparse(result.link).netloc
-            head_resp = self.get_head_response(
-                result.link,
-                network_timeout.get(host)
-                if host in network_timeout
-                else network_timeout.get('*')
-                if '*' in network_timeout
-                else URLHeadBear.DEFAULT_TIMEOUT)
-
+        get_timeout = get_timeout_function(network_timeout,
+                                           URLHeadBear.DEFAULT_TIMEOUT)
+        url_results = dependency_results.get(URLBear.name, [])
+        link_checker = get_link_checker(max_concurrent_requests,
+                                        max_requests_per_host,
+                                        requests_per_second_per_host,
+                                        max_retries)
+        status_cache = get_link_status_cache(link_status_cache)
+        head_responses = link_checker.head_all(
+            (result.link for result in url_results), get_timeout,
+            status_cache)
+
+        redirect_chains = (link_checker.get_redirect_chains(
+                               head_responses, get_timeout, status_cache,
+                               max_redirects)
+                           if max_redirects > 0 else {})
+
+        self.debug('Link check metrics:', link_checker.scheduler.metrics)
+
+        for result in url_results:
             yield URLHeadResult(self, result.affected_code, result.link,
-                                head_resp, result.link_context)
+                                head_responses[result.link],
+                                result.link_context,
+                                redirect_chains.get(result.link))
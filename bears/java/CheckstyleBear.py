@@ -1,3 +1,4 @@
+from bears.java.JarWorker import run_linter_in_jar_worker
 from coalib.bearlib.abstractions.Linter import linter
 from coalib.settings.Setting import path
 from dependency_management.requirements.DistributionRequirement import (
@@ -57,11 +58,19 @@ class CheckstyleBear:
             '/checkstyle-6.19-all.jar',
             'checkstyle-6.19.jar')
 
+    def run(self, filename, file, **kwargs):
+        if kwargs.get('persistent_jvm'):
+            results = run_linter_in_jar_worker(self, filename, file, kwargs)
+            if results is not None:
+                return results
+        return super().run(filename, file, **kwargs)
+
     def create_arguments(
             self, filename, file, config_file,
             checkstyle_configs: known_checkstyle_or_path = 'google',
             use_spaces: bool = True,
             indent_size: int = 2,
+            persistent_jvm: bool = False,
             ):
         """
         :param checkstyle_configs:
@@ -81,6 +90,10 @@ class CheckstyleBear:
               <https://github.com/noveogroup/android-check>.
             - geosoft - The Java style followed by GeoSoft. More info at
               <http://geosoft.no/development/javastyle.html>
+        :param persistent_jvm:
+            Set to true to check all files in one long running JVM instead of
+            starting a new one for every file. Needs Java 12 or later and
+            falls back to a JVM per file if that fails.
         """
         check_invalid_configuration(
             checkstyle_configs, use_spaces, indent_size)
@@ -0,0 +1,116 @@
+import java.io.BufferedOutputStream;
+import java.io.BufferedReader;
+import java.io.ByteArrayOutputStream;
+import java.io.FileDescriptor;
+import java.io.FileOutputStream;
+import java.io.IOException;
+import java.io.InputStreamReader;
+import java.io.OutputStream;
+import java.io.PrintStream;
+import java.lang.reflect.InvocationTargetException;
+import java.lang.reflect.Method;
+import java.nio.charset.StandardCharsets;
+import java.security.Permission;
+
+/**
+ * Runs the main method of a Java command line tool for many requests within
+ * one JVM, so the JVM is only started once.
+ *
+ * Usage: java -Djava.security.manager=allow -cp TOOL.jar JarWorker.java
+ * MAIN_CLASS
+ *
+ * Every line read from stdin is a request holding the arguments for the tool,
+ * separated by tabs. For every request a header line with the exit status of
+ * the tool and the number of bytes it wrote to stdout and stderr is written
+ * to stdout, followed by these bytes.
+ */
+public class JarWorker {
+
+    /** Thrown instead of exiting the JVM when the tool calls System.exit. */
+    private static class ExitException extends SecurityException {
+        private final int status;
+
+        ExitException(int status) {
+            super("System.exit(" + status + ")");
+            this.status = status;
+        }
+    }
+
+    /** An output stream whose target is replaced for every request. */
+    private static class RedirectedOutputStream extends OutputStream {
+        private OutputStream target = new ByteArrayOutputStream();
+
+        @Override
+        public void write(int b) throws IOException {
+            target.write(b);
+        }
+
+        @Override
+        public void write(byte[] b, int off, int len) throws IOException {
+            target.write(b, off, len);
+        }
+
+        @Override
+        public void flush() throws IOException {
+            target.flush();
+        }
+    }
+
+    public static void main(String[] args) throws Exception {
+        Method main = Class.forName(args[0]).getMethod("main",
+                                                       String[].class);
+        OutputStream responses = new BufferedOutputStream(
+            new FileOutputStream(FileDescriptor.out));
+        BufferedReader requests = new BufferedReader(
+            new InputStreamReader(System.in, StandardCharsets.UTF_8));
+
+        // Scala tools keep a reference to the first System.out they see, so
+        // the streams are only set once and redirected for each request.
+        RedirectedOutputStream out = new RedirectedOutputStream();
+        RedirectedOutputStream err = new RedirectedOutputStream();
+        System.setOut(new PrintStream(out, true, "UTF-8"));
+        System.setErr(new PrintStream(err, true, "UTF-8"));
+        System.setSecurityManager(new SecurityManager() {
+            @Override
+            public void checkPermission(Permission permission) {
+            }
+
+            @Override
+            public void checkExit(int status) {
+                throw new ExitException(status);
+            }
+        });
+
+        String request;
+        while ((request = requests.readLine()) != null) {
+            ByteArrayOutputStream stdout = new ByteArrayOutputStream();
+            ByteArrayOutputStream stderr = new ByteArrayOutputStream();
+            out.target = stdout;
+            err.target = stderr;
+
+            int status = 0;
+            try {
+                main.invoke(null, (Object) (request.isEmpty()
+                                            ? new String[0]
+                                            : request.split("\t", -1)));
+            } catch (InvocationTargetException exception) {
+                Throwable cause = exception.getCause();
+                if (cause instanceof ExitException) {
+                    status = ((ExitException) cause).status;
+                } else {
+                    cause.printStackTrace();
+                    status = 1;
+                }
+            }
+            System.out.flush();
+            System.err.flush();
+
+            responses.write((status + " " + stdout.size() + " "
+                             + stderr.size() + "\n")
+                            .getBytes(StandardCharsets.UTF_8));
+            stdout.writeTo(responses);
+            stderr.writeTo(responses);
+            responses.flush();
+        }
+    }
+}
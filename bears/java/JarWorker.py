@@ -0,0 +1,213 @@
+from functools import lru_cache
+import os
+import subprocess
+import threading
+from zipfile import BadZipFile, ZipFile
+
+from coalib.settings.FunctionMetadata import FunctionMetadata
+
+
+JAR_WORKER_SOURCE = os.path.join(os.path.dirname(os.path.abspath(__file__)),
+                                 'JarWorker.java')
+
+
+class JarWorkerError(Exception):
+    """
+    Raised if a ``JarWorker`` cannot run a request.
+    """
+
+
+def get_main_class(jar_file):
+    """
+    Reads the main class of an executable jar from its manifest.
+
+    :param jar_file: The path of the jar.
+    :return:         The fully qualified name of the main class or None if
+                     there is none.
+    """
+    try:
+        with ZipFile(jar_file) as jar:
+            manifest = jar.read('META-INF/MANIFEST.MF').decode('utf-8')
+    except (OSError, KeyError, BadZipFile):
+        return None
+
+    # Long manifest lines are continued on the next line after a space.
+    manifest = manifest.replace('\r\n', '\n').replace('\n ', '')
+    for line in manifest.splitlines():
+        key, _, value = line.partition(':')
+        if key.strip() == 'Main-Class':
+            return value.strip()
+    return None
+
+
+class JarWorker:
+    """
+    Keeps a JVM running the main class of an executable jar, so a Java
+    command line tool can be run many times while the JVM is only started
+    once.
+
+    The JVM runs ``JarWorker.java`` (which needs Java 12 or later to be
+    launched from source and a JVM that still allows installing a security
+    manager) and is started on the first request. Requests are sent as tab
+    separated arguments on a line of its stdin, see ``JarWorker.java``. If
+    the JVM dies, it is restarted once for the next request.
+    """
+
+    def __init__(self, jar_file, cwd=None, executable='java'):
+        """
+        :param jar_file:   The path of the executable jar of the tool.
+        :param cwd:        The working directory of the JVM.
+        :param executable: The java executable to start the JVM with.
+        """
+        self.jar_file = jar_file
+        self.cwd = cwd
+        self.executable = executable
+        self.process = None
+        # The reason the worker stopped working for good, if it did.
+        self.error = None
+        self._lock = threading.Lock()
+
+    def start(self):
+        """
+        Starts the JVM if it is not running.
+
+        :raises JarWorkerError: If the jar has no main class.
+        """
+        if self.process is not None and self.process.poll() is None:
+            return
+
+        main_class = get_main_class(self.jar_file)
+        if main_class is None:
+            raise JarWorkerError(
+                '{} has no main class.'.format(self.jar_file))
+
+        try:
+            self.process = subprocess.Popen(
+                (self.executable, '-Djava.security.manager=allow',
+                 '-cp', self.jar_file, JAR_WORKER_SOURCE, main_class),
+                stdin=subprocess.PIPE,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.DEVNULL,
+                cwd=self.cwd)
+        except OSError as error:
+            raise JarWorkerError(str(error)) from error
+
+    def stop(self):
+        """
+        Stops the JVM if it is running.
+        """
+        if self.process is not None:
+            try:
+                self.process.stdin.close()
+            except OSError:
+                pass
+            try:
+                self.process.wait(timeout=5)
+            except subprocess.TimeoutExpired:
+                self.process.kill()
+                self.process.wait()
+            self.process.stdout.close()
+            self.process = None
+
+    def _request(self, arguments):
+        self.start()
+        self.process.stdin.write(
+            ('\t'.join(arguments) + '\n').encode('utf-8'))
+        self.process.stdin.flush()
+
+        header = self.process.stdout.readline().split()
+        if len(header) != 3:
+            raise JarWorkerError('The JVM of {} exited.'.format(
+                self.jar_file))
+
+        status, stdout_length, stderr_length = map(int, header)
+        stdout = self.process.stdout.read(stdout_length)
+        stderr = self.process.stdout.read(stderr_length)
+        if len(stdout) + len(stderr) != stdout_length + stderr_length:
+            raise JarWorkerError('The JVM of {} exited.'.format(
+                self.jar_file))
+
+        return (status,
+                stdout.decode('utf-8', 'replace'),
+                stderr.decode('utf-8', 'replace'))
+
+    def run(self, arguments):
+        """
+        Runs the tool with the given arguments, restarting the JVM once if it
+        died.
+
+        :param arguments:       The command line arguments for the tool. Any
+                                number of files may be passed at once.
+                                Arguments must not contain tabs or newlines.
+        :raises JarWorkerError: If the request could not be run. If the
+                                JVM failed twice in a row, all further
+                                requests fail immediately.
+        :return:                A tuple holding the exit status and the
+                                output of the tool on stdout and stderr.
+        """
+        arguments = tuple(str(argument) for argument in arguments)
+        if any('\t' in argument or '\n' in argument
+               for argument in arguments):
+            raise JarWorkerError('Arguments containing tabs or newlines '
+                                 'cannot be sent to the JVM.')
+
+        with self._lock:
+            if self.error is not None:
+                raise JarWorkerError(self.error)
+
+            for attempt in range(2):
+                try:
+                    return self._request(arguments)
+                except (OSError, ValueError, JarWorkerError) as error:
+                    self.stop()
+                    if attempt:
+                        self.error = str(error) or type(error).__name__
+                        raise JarWorkerError(self.error) from error
+
+
+@lru_cache()
+def get_jar_worker(jar_file, cwd=None):
+    """
+    Retrieves the ``JarWorker`` of a jar shared by all files checked in this
+    process.
+
+    :param jar_file: The path of the executable jar.
+    :param cwd:      The working directory of the JVM.
+    :return:         The ``JarWorker`` instance.
+    """
+    return JarWorker(jar_file, cwd)
+
+
+def run_linter_in_jar_worker(bear, filename, file, kwargs):
+    """
+    Runs a ``@linter`` bear whose arguments are ``-jar <jar> ...`` in a
+    ``JarWorker`` instead of starting a new JVM.
+
+    If the worker fails, e.g. because the installed Java is too old, the
+    bear falls back to starting a JVM for every file.
+
+    :param bear:     The linter bear instance.
+    :param filename: The name of the file to check.
+    :param file:     The lines of the file.
+    :param kwargs:   The settings given to the ``run`` method of the bear.
+    :return:         The results of ``process_output`` of the bear or None
+                     if the worker failed.
+    """
+    arguments = tuple(bear.create_arguments(
+        filename, file, None,
+        **FunctionMetadata.filter_parameters(
+            bear._get_create_arguments_metadata(), kwargs)))
+    assert arguments[0] == '-jar'
+
+    worker = get_jar_worker(arguments[1], bear.get_config_dir())
+    if worker.error is not None:
+        return None
+
+    try:
+        _, stdout, _ = worker.run(arguments[2:])
+    except JarWorkerError as error:
+        bear.warn('Falling back to starting a JVM for every file: ' +
+                  str(error))
+        return None
+
+    return bear.process_output(stdout, filename, file)
@@ -0,0 +1,39 @@
+from coalib.settings.FunctionMetadata import FunctionMetadata
+
+
+def run_linter_in_process(bear, filename, file, kwargs):
+    """
+    Runs a ``@linter`` bear wrapping a Python tool by calling the tool in this
+    interpreter instead of starting a new one for every file.
+
+    The bear has to implement ``check_in_process(arguments, filename, file)``
+    which checks the file with the arguments given by ``create_arguments`` and
+    returns the output the tool would have written, in the form expected by
+    ``process_output``.
+
+    If the tool cannot be imported, e.g. because it is only installed as
+    executable in another environment, the bear falls back to starting the
+    executable.
+
+    :param bear:     The linter bear instance.
+    :param filename: The name of the file to check.
+    :param file:     The lines of the file.
+    :param kwargs:   The settings given to the ``run`` method of the bear.
+    :return:         The results of ``process_output`` of the bear or None
+                     if the tool cannot be imported.
+    """
+    arguments = bear.create_arguments(
+        filename, file, None,
+        **FunctionMetadata.filter_parameters(
+            bear._get_create_arguments_metadata(), kwargs))
+    if arguments is None:
+        return ()
+
+    try:
+        output = bear.check_in_process(tuple(arguments), filename, file)
+    except ImportError as error:
+        bear.debug('Falling back to running {}: {}'.format(
+            bear.get_executable(), error))
+        return None
+
+    return bear.process_output(output, filename, file)
@@ -1,6 +1,9 @@
-import autopep8
+import difflib
 import sys
 
+import autopep8
+import pycodestyle
+
 from coalib.bearlib import deprecate_settings
 from coalib.bearlib.spacing.SpacingHelper import SpacingHelper
 from coalib.bears.LocalBear import LocalBear
@@ -10,15 +13,124 @@ from coalib.results.Result import Result
 from coalib.settings.Setting import typed_list
 
 
+# The pycodestyle codes of indentation autopep8 may change.
+INDENTATION_CODES = ('E101', 'E111', 'E117', 'W191')
+
+
+def checks_over_indentation():
+    """
+    Checks whether the installed pycodestyle reports over-indented code as
+    E117, which it only does from version 2.5 on.
+
+    :return: True if pycodestyle reports over-indented code.
+    """
+    checker = pycodestyle.Checker(lines=['if True:\n', '        pass\n'],
+                                  select=['E117'],
+                                  reporter=pycodestyle.BaseReport)
+    return checker.check_all() > 0
+
+
+CHECKS_OVER_INDENTATION = checks_over_indentation()
+
+
+def get_changed_region_diff(file, corrected):
+    """
+    Creates the diff between the lines of a file and their corrected version.
+    Only the lines between the common beginning and end of both are compared.
+
+    :param file:      The lines of the file.
+    :param corrected: The corrected lines.
+    :return:          A ``Diff`` that turns ``file`` into ``corrected``.
+    """
+    start = 0
+    common_length = min(len(file), len(corrected))
+    while start < common_length and file[start] == corrected[start]:
+        start += 1
+    end = 0
+    while (end < common_length - start and
+           file[-1 - end] == corrected[-1 - end]):
+        end += 1
+
+    diff = Diff(file)
+    matcher = difflib.SequenceMatcher(None,
+                                      file[start:len(file) - end],
+                                      corrected[start:len(corrected) - end])
+    # The same construction as in ``Diff.from_string_arrays``, with the line
+    # numbers shifted by the unchanged beginning.
+    for change_group in matcher.get_grouped_opcodes(1):
+        for tag, a_index_1, a_index_2, b_index_1, b_index_2 in change_group:
+            a_index_1 += start
+            a_index_2 += start
+            b_index_1 += start
+            b_index_2 += start
+            if tag == 'delete':
+                for index in range(a_index_1 + 1, a_index_2 + 1):
+                    diff.delete_line(index)
+            elif tag == 'insert':
+                diff.add_lines(a_index_1, corrected[b_index_1:b_index_2])
+            elif tag == 'replace':
+                diff.modify_line(a_index_1 + 1, corrected[b_index_1])
+                diff.add_lines(a_index_1 + 1,
+                               corrected[b_index_1 + 1:b_index_2])
+                for index in range(a_index_1 + 2, a_index_2 + 1):
+                    diff.delete_line(index)
+
+    return diff
+
+
 class PEP8Bear(LocalBear):
     LANGUAGES = {'Python', 'Python 2', 'Python 3'}
-    REQUIREMENTS = {PipRequirement('autopep8', '1.2')}
+    REQUIREMENTS = {PipRequirement('autopep8', '1.2'),
+                    PipRequirement('pycodestyle', '2.2')}
     AUTHORS = {'The coala developers'}
     AUTHORS_EMAILS = {'coala-devel@googlegroups.com'}
     LICENSE = 'AGPL-3.0'
     CAN_FIX = {'Formatting'}
     ASCIINEMA_URL = 'https://asciinema.org/a/165394'
 
+    @staticmethod
+    def is_clean(filename, file, source, options):
+        """
+        Checks whether autopep8 would leave a file unchanged by running only
+        the pycodestyle checks autopep8 starts with, which is a lot faster
+        than fixing the file.
+
+        :param filename: The name of the file.
+        :param file:     The lines of the file.
+        :param source:   The content of the file.
+        :param options:  The options for autopep8.
+        :return:         True if pycodestyle finds nothing to fix and the
+                         file has consistent line endings.
+        """
+        # autopep8 reindents files to indent_size, pycodestyle only notices
+        # wrong indentation for an indent size of 4 and only notices
+        # over-indentation if it has the E117 check.
+        if options['indent_size'] != 4 or not CHECKS_OVER_INDENTATION:
+            return False
+
+        lines = source.splitlines(True)
+        # autopep8 changes mixed line endings to the most common one.
+        newlines = {line[len(line.rstrip('\r\n')):] for line in lines}
+        if lines != list(file) or len(newlines - {''}) > 1:
+            return False
+
+        # Only the codes autopep8 does not fix are ignored: the given ones
+        # and, unless codes are selected, W503 and W504 which contradict
+        # each other. The indentation is always checked, since autopep8
+        # reindents files unless E101 and E111 are ignored.
+        ignore = [code for code in options['ignore']
+                  if not any(indentation_code.startswith(code)
+                             for indentation_code in INDENTATION_CODES)]
+        if not options['select']:
+            ignore += ['W503', 'W504']
+        checker = pycodestyle.Checker(
+            filename, lines=lines,
+            select=list(options['select']),
+            ignore=ignore,
+            max_line_length=options['max_line_length'],
+            reporter=pycodestyle.BaseReport)
+        return checker.check_all() == 0
+
     @deprecate_settings(indent_size='tab_width')
     def run(self, filename, file,
             max_line_length: int = 79,
@@ -48,11 +160,16 @@ class PEP8Bear(LocalBear):
                    'max_line_length': max_line_length,
                    'indent_size': indent_size}
 
-        corrected = autopep8.fix_code(''.join(file),
+        source = ''.join(file)
+        if not local_pep8_config and self.is_clean(filename, file, source,
+                                                   options):
+            return
+
+        corrected = autopep8.fix_code(source,
                                       apply_config=local_pep8_config,
                                       options=options).splitlines(True)
 
-        diffs = Diff.from_string_arrays(file, corrected).split_diff()
+        diffs = get_changed_region_diff(file, corrected).split_diff()
 
         for diff in diffs:
             yield Result(self,
@@ -1,5 +1,7 @@
 import eradicate
 
+from bears.python.PythonAnalysisBear import (
+    get_python_analysis, PythonAnalysisBear)
 from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.results.Diff import Diff
@@ -13,12 +15,19 @@ class PyCommentedCodeBear(LocalBear):
     AUTHORS_EMAILS = {'coala-devel@googlegroups.com'}
     LICENSE = 'AGPL-3.0'
     CAN_DETECT = {'Commented Code'}
+    BEAR_DEPS = {PythonAnalysisBear}
 
-    def run(self, filename, file):
+    def run(self, filename, file, dependency_results: dict = None):
         """
         Detects commented out source code in Python.
         """
-        corrected = tuple(eradicate.filter_commented_out_code(''.join(file)))
+        # eradicate only looks at lines holding nothing but a comment.
+        analysis = get_python_analysis(dependency_results, filename, file)
+        if not analysis.has_comment_lines():
+            return
+
+        corrected = tuple(eradicate.filter_commented_out_code(
+            analysis.source))
 
         for diff in Diff.from_string_arrays(file, corrected).split_diff():
             yield Result(self,
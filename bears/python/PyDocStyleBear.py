@@ -1,3 +1,4 @@
+from bears.python.InProcessLinter import run_linter_in_process
 from coalib.bearlib.abstractions.Linter import linter
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.settings.Setting import typed_list
@@ -19,11 +20,57 @@ class PyDocStyleBear:
     LICENSE = 'AGPL-3.0'
     CAN_DETECT = {'Formatting', 'Documentation'}
 
+    def run(self, filename, file, **kwargs):
+        if kwargs.get('in_process', True):
+            results = run_linter_in_process(self, filename, file, kwargs)
+            if results is not None:
+                return results
+        return super().run(filename, file, **kwargs)
+
+    @staticmethod
+    def check_in_process(arguments, filename, file):
+        """
+        Checks the file with the pydocstyle API instead of the executable.
+        The arguments and configuration files are handled by the
+        configuration parser of pydocstyle, just like by the executable.
+        pydocstyle reads the file from disk itself.
+
+        :return: The output pydocstyle would have written to stdout and
+                 stderr.
+        """
+        from pydocstyle import check
+        from pydocstyle.config import ConfigurationParser, IllegalConfiguration
+
+        class Configuration(ConfigurationParser):
+
+            def _parse_args(self, args=None, values=None):
+                return super()._parse_args(
+                    list(arguments) if args is None else args, values)
+
+        configuration = Configuration()
+        errors = []
+        try:
+            configuration.parse()
+            for (name, checked_codes, ignore_decorators,
+                 *options) in configuration.get_files_to_check():
+                # Newer versions also yield these options for every file.
+                errors.extend(check(
+                    (name,), select=checked_codes,
+                    ignore_decorators=ignore_decorators,
+                    **dict(zip(('property_decorators',
+                                'ignore_self_only_init'), options))))
+        except IllegalConfiguration:
+            return '', ''
+
+        return ''.join('{}\n'.format(error) for error in errors
+                       if hasattr(error, 'code')), ''
+
     def create_arguments(self, filename, file, config_file,
                          pydocstyle_select: typed_list(str) = (),
                          pydocstyle_ignore: typed_list(str) = (),
                          pydocstyle_add_ignore: typed_list(str) = (),
                          pydocstyle_add_select: typed_list(str) = (),
+                         in_process: bool = True,
                          ):
         """
         :param pydocstyle_select:
@@ -39,6 +86,9 @@ class PyDocStyleBear:
         :param pydocstyle_add_select:
             List of checked errors to amend the list of default errors to
             check for by specifying more error codes to check.
+        :param in_process:
+            Run pydocstyle within coala instead of starting a new Python
+            interpreter for every file.
         """
         args = (filename,)
         if pydocstyle_ignore and pydocstyle_select:
@@ -1,3 +1,6 @@
+from io import StringIO
+
+from bears.python.InProcessLinter import run_linter_in_process
 from coalib.bearlib.abstractions.Linter import linter
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
@@ -25,6 +28,35 @@ class PyFlakesBear:
     ASCIINEMA_URL = 'https://asciinema.org/a/92503'
     CAN_DETECT = {'Syntax', 'Unused Code', 'Undefined Element'}
 
+    def run(self, filename, file, **kwargs):
+        if kwargs.get('in_process', True):
+            results = run_linter_in_process(self, filename, file, kwargs)
+            if results is not None:
+                return results
+        return super().run(filename, file, **kwargs)
+
+    @staticmethod
+    def check_in_process(arguments, filename, file):
+        """
+        Checks the file with the pyflakes API instead of the executable.
+
+        :return: The warnings and errors pyflakes would have written to
+                 stdout and stderr.
+        """
+        from pyflakes.api import check
+        from pyflakes.reporter import Reporter
+
+        warnings, errors = StringIO(), StringIO()
+        check(''.join(file), filename, Reporter(warnings, errors))
+        return warnings.getvalue(), errors.getvalue()
+
     @staticmethod
-    def create_arguments(filename, file, config_file):
+    def create_arguments(filename, file, config_file,
+                         in_process: bool = True,
+                         ):
+        """
+        :param in_process:
+            Run pyflakes within coala instead of starting a new Python
+            interpreter for every file.
+        """
         return filename,
@@ -0,0 +1,99 @@
+from concurrent.futures import ThreadPoolExecutor
+import os
+
+from bears.python.PyLintBear import (
+    get_pylint_arguments, PyLintBear, PYLINT_SEVERITY_MAP)
+from coalib.bearlib.abstractions.Linter import linter
+from coalib.misc.Shell import run_shell_command
+from coalib.settings.FunctionMetadata import FunctionMetadata
+from coalib.settings.Setting import typed_list
+
+
+def get_batches(filenames, batch_size, processes):
+    """
+    Splits files into batches to be checked by one pylint process each.
+
+    :param filenames:  The names of the files to check.
+    :param batch_size: The maximum number of files in a batch. If it is not
+                       positive, the files are split evenly over as many
+                       batches as there are processes.
+    :param processes:  The number of pylint processes run at once.
+    :return:           A list of lists of filenames.
+    """
+    if not filenames:
+        return []
+    if batch_size <= 0:
+        batch_size = -(-len(filenames) // max(processes, 1))
+    return [filenames[start:start + batch_size]
+            for start in range(0, len(filenames), batch_size)]
+
+
+@linter(executable='pylint',
+        global_bear=True,
+        output_format='regex',
+        output_regex=r'(?m)^(?P<filename>.+?):L(?P<line>\d+)C(?P<column>\d+): '
+                     r'(?P<message>(?P<origin>(?P<severity>[WFECRI])\d+) - '
+                     r'.*)',
+        severity_map=PYLINT_SEVERITY_MAP)
+class PyLintBatchBear:
+    """
+    Checks the code with pylint, passing many files to each pylint process.
+
+    Modules imported by several files are only analysed once per process
+    instead of once per file, which makes checking big projects a lot faster
+    than with ``PyLintBear``. The output of pylint is split back into results
+    for the single files.
+    """
+    LANGUAGES = PyLintBear.LANGUAGES
+    REQUIREMENTS = PyLintBear.REQUIREMENTS
+    AUTHORS = {'The coala developers'}
+    AUTHORS_EMAILS = {'coala-devel@googlegroups.com'}
+    LICENSE = 'AGPL-3.0'
+    CAN_DETECT = PyLintBear.CAN_DETECT
+
+    def run(self, **kwargs):
+        processes = kwargs.get('pylint_processes', 0) or os.cpu_count() or 1
+        batches = get_batches(sorted(self.file_dict),
+                              kwargs.get('pylint_batch_size', 0),
+                              processes)
+        arguments = (self.get_executable(),) + self.create_arguments(
+            None,
+            **FunctionMetadata.filter_parameters(
+                self._get_create_arguments_metadata(), kwargs))
+
+        def check_batch(batch):
+            self.debug('Running pylint on {} files'.format(len(batch)))
+            return run_shell_command(arguments + tuple(batch),
+                                     cwd=self.get_config_dir())[0]
+
+        with ThreadPoolExecutor(max_workers=processes) as executor:
+            for output in executor.map(check_batch, batches):
+                yield from self.process_output(output)
+
+    @staticmethod
+    def create_arguments(config_file,
+                         pylint_disable: typed_list(str) = None,
+                         pylint_enable: typed_list(str) = None,
+                         pylint_cli_options: str = '',
+                         pylint_rcfile: str = '',
+                         pylint_batch_size: int = 0,
+                         pylint_processes: int = 0,
+                         ):
+        """
+        :param pylint_disable:     Disable the message, report, category or
+                                   checker with the given id(s).
+        :param pylint_enable:      Enable the message, report, category or
+                                   checker with the given id(s).
+        :param pylint_cli_options: Any command line options you wish to be
+                                   passed to pylint.
+        :param pylint_rcfile:      The rcfile for PyLint.
+        :param pylint_batch_size:  The maximum number of files checked by one
+                                   pylint process. By default the files are
+                                   split evenly over the processes.
+        :param pylint_processes:   The number of pylint processes run at
+                                   once. Defaults to the number of CPUs.
+        """
+        # The files are appended per batch by ``run``.
+        return get_pylint_arguments(
+            '{abspath}:L{line}C{column}: {msg_id} - {msg}',
+            pylint_disable, pylint_enable, pylint_cli_options, pylint_rcfile)
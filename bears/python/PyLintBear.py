@@ -7,20 +7,57 @@ from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
 from coalib.settings.Setting import typed_list
 
 
+PYLINT_SEVERITY_MAP = {'F': RESULT_SEVERITY.MAJOR,
+                       'E': RESULT_SEVERITY.MAJOR,
+                       'W': RESULT_SEVERITY.NORMAL,
+                       'C': RESULT_SEVERITY.INFO,
+                       'R': RESULT_SEVERITY.INFO,
+                       'I': RESULT_SEVERITY.INFO}
+
+
+def get_pylint_arguments(msg_template,
+                         pylint_disable=None,
+                         pylint_enable=None,
+                         pylint_cli_options='',
+                         pylint_rcfile=''):
+    """
+    Creates the pylint arguments for the settings of the pylint bears, except
+    for the files to check.
+
+    :param msg_template:       The template pylint formats its messages with.
+    :param pylint_disable:     The ids of the messages, reports, categories or
+                               checkers to disable.
+    :param pylint_enable:      The ids of the messages, reports, categories or
+                               checkers to enable.
+    :param pylint_cli_options: Additional command line options for pylint.
+    :param pylint_rcfile:      The rcfile for pylint, an empty string to use
+                               none.
+    :return:                   A tuple of arguments.
+    """
+    args = ('--reports=n', '--persistent=n', '--msg-template=' + msg_template)
+    if pylint_disable:
+        args += ('--disable=' + ','.join(pylint_disable),)
+    if pylint_enable:
+        args += ('--enable=' + ','.join(pylint_enable),)
+    if pylint_cli_options:
+        args += tuple(shlex.split(pylint_cli_options))
+    if pylint_rcfile:
+        args += ('--rcfile=' + pylint_rcfile,)
+    else:
+        args += ('--rcfile=' + os.devnull,)
+    return args
+
+
 @linter(executable='pylint',
         output_format='regex',
         output_regex=r'L(?P<line>\d+)C(?P<column>\d+): (?P<message>'
                      r'(?P<origin>(?P<severity>[WFECRI])\d+) - .*)',
-        severity_map={'F': RESULT_SEVERITY.MAJOR,
-                      'E': RESULT_SEVERITY.MAJOR,
-                      'W': RESULT_SEVERITY.NORMAL,
-                      'C': RESULT_SEVERITY.INFO,
-                      'R': RESULT_SEVERITY.INFO,
-                      'I': RESULT_SEVERITY.INFO})
+        severity_map=PYLINT_SEVERITY_MAP)
 class PyLintBear:
     """
     Checks the code with pylint. This will run pylint over each file
-    separately.
+    separately. Use ``PyLintBatchBear`` to check many files with a few pylint
+    processes instead.
     """
     LANGUAGES = {'Python', 'Python 2', 'Python 3'}
     REQUIREMENTS = {PipRequirement('pylint', '1.7.2')}
@@ -46,17 +83,7 @@ class PyLintBear:
                                    passed to pylint.
         :param pylint_rcfile:      The rcfile for PyLint.
         """
-        args = ('--reports=n', '--persistent=n',
-                '--msg-template="L{line}C{column}: {msg_id} - {msg}"')
-        if pylint_disable:
-            args += ('--disable=' + ','.join(pylint_disable),)
-        if pylint_enable:
-            args += ('--enable=' + ','.join(pylint_enable),)
-        if pylint_cli_options:
-            args += tuple(shlex.split(pylint_cli_options))
-        if pylint_rcfile:
-            args += ('--rcfile=' + pylint_rcfile,)
-        else:
-            args += ('--rcfile=' + os.devnull,)
-
-        return args + (filename,)
+        return get_pylint_arguments(
+            '"L{line}C{column}: {msg_id} - {msg}"',
+            pylint_disable, pylint_enable, pylint_cli_options,
+            pylint_rcfile) + (filename,)
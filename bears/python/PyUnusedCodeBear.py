@@ -1,5 +1,9 @@
+import ast
+
 import autoflake
 
+from bears.python.PythonAnalysisBear import (
+    get_python_analysis, PythonAnalysisBear)
 from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.results.Diff import Diff
@@ -27,11 +31,13 @@ class PyUnusedCodeBear(
     AUTHORS_EMAILS = {'coala-devel@googlegroups.com'}
     LICENSE = 'AGPL-3.0'
     CAN_DETECT = {'Unused Code'}
+    BEAR_DEPS = {PythonAnalysisBear}
 
     @map_setting_to_aspect(
         remove_all_unused_imports=UnusedImport.remove_non_standard_import,
         remove_unused_variables=UnusedLocalVariable)
     def run(self, filename, file,
+            dependency_results: dict = None,
             remove_all_unused_imports: bool = True,
             remove_unused_variables: bool = True,
             ):
@@ -47,8 +53,19 @@ class PyUnusedCodeBear(
         :param remove_unused_variables:
             ``False`` keeps unused variables
         """
+        # autoflake only removes imports, pass statements and variables of
+        # functions or exception handlers, so there is nothing to remove if
+        # the file has none of them.
+        node_types = (ast.Import, ast.ImportFrom, ast.Pass)
+        if remove_unused_variables:
+            node_types += (ast.FunctionDef, ast.AsyncFunctionDef, ast.Lambda,
+                           ast.ExceptHandler)
+        analysis = get_python_analysis(dependency_results, filename, file)
+        if not analysis.has_node(*node_types):
+            return
+
         corrected = autoflake.fix_code(
-                       ''.join(file),
+                       analysis.source,
                        additional_imports=None,
                        remove_all_unused_imports=remove_all_unused_imports,
                        remove_unused_variables=remove_unused_variables
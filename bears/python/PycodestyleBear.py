@@ -1,5 +1,6 @@
 import sys
 
+from bears.python.InProcessLinter import run_linter_in_process
 from coalib.bearlib.abstractions.Linter import linter
 from coalib.settings.Setting import typed_list
 
@@ -21,6 +22,46 @@ class PycodestyleBear:
     LICENSE = 'AGPL-3.0'
     CAN_DETECT = {'Formatting'}
 
+    def run(self, filename, file, **kwargs):
+        if kwargs.get('in_process', True):
+            results = run_linter_in_process(self, filename, file, kwargs)
+            if results is not None:
+                return results
+        return super().run(filename, file, **kwargs)
+
+    @staticmethod
+    def check_in_process(arguments, filename, file):
+        """
+        Checks the file with the pycodestyle API instead of the executable.
+        The arguments are parsed the same way, so configuration files are
+        read just like by the executable.
+
+        :return: The output pycodestyle would have written to stdout.
+        """
+        import pycodestyle
+
+        output = []
+
+        class Report(pycodestyle.StandardReport):
+
+            def get_file_results(self):
+                self._deferred_print.sort()
+                for line_number, offset, code, text, _ in self._deferred_print:
+                    output.append(self._fmt % {
+                        'path': self.filename,
+                        'row': self.line_offset + line_number,
+                        'col': offset + 1,
+                        'code': code,
+                        'text': text,
+                    })
+                return self.file_errors
+
+        # ``paths`` is parsed as the command line if ``parse_argv`` is False.
+        style_guide = pycodestyle.StyleGuide(paths=list(arguments),
+                                             reporter=Report)
+        style_guide.input_file(filename, lines=list(file))
+        return '\n'.join(output)
+
     @staticmethod
     def create_arguments(
             filename, file, config_file,
@@ -30,6 +71,7 @@ class PycodestyleBear:
             ),
             pycodestyle_select: typed_list(str) = (),
             max_line_length: int = 79,
+            in_process: bool = True,
             ):
         """
         :param pycodestyle_ignore:
@@ -42,6 +84,9 @@ class PycodestyleBear:
         :param max_line_length:
             Limit lines to this length. Allows infinite line length when
             set to 0.
+        :param in_process:
+            Run pycodestyle within coala instead of starting a new Python
+            interpreter for every file.
         """
         arguments = [r'--format=%(row)d %(col)d %(code)s %(text)s']
 
@@ -0,0 +1,130 @@
+import ast
+import io
+import tokenize
+
+from coalib.bears.LocalBear import LocalBear
+from coalib.results.HiddenResult import HiddenResult
+
+
+# Marks the tokens or the tree as not computed yet, since None means that
+# the file cannot be tokenized or parsed.
+_NOT_COMPUTED = object()
+
+
+class PythonAnalysis:
+    """
+    The tokens and the abstract syntax tree of a Python file. Both are
+    computed on first use and then shared by all bears the analysis is passed
+    to.
+
+    When an analysis is sent to another process only the source is pickled,
+    the tokens and the tree are computed again there if they are needed.
+    Pickling them takes about as long as computing them.
+    """
+
+    def __init__(self, filename, file):
+        """
+        :param filename: The name of the file.
+        :param file:     The lines of the file.
+        """
+        self.filename = filename
+        self.source = ''.join(file)
+        self._tokens = _NOT_COMPUTED
+        self._tree = _NOT_COMPUTED
+
+    def __getstate__(self):
+        return {'filename': self.filename, 'source': self.source}
+
+    def __setstate__(self, state):
+        self.__init__(state['filename'], (state['source'],))
+
+    @property
+    def tokens(self):
+        """
+        The ``tokenize.TokenInfo`` tuples of the file or None if it cannot be
+        tokenized.
+        """
+        if self._tokens is _NOT_COMPUTED:
+            try:
+                self._tokens = tuple(tokenize.generate_tokens(
+                    io.StringIO(self.source).readline))
+            except (tokenize.TokenError, SyntaxError):
+                self._tokens = None
+        return self._tokens
+
+    @property
+    def tree(self):
+        """
+        The ``ast.Module`` of the file or None if it cannot be parsed.
+        """
+        if self._tree is _NOT_COMPUTED:
+            try:
+                self._tree = ast.parse(self.source, self.filename)
+            except (SyntaxError, ValueError):
+                self._tree = None
+        return self._tree
+
+    def has_comment_lines(self):
+        """
+        Checks whether a line of the file holds nothing but a comment.
+
+        :return: True if there is such a line or if the file cannot be
+                 tokenized.
+        """
+        if self.tokens is None:
+            return True
+        return any(token.type == tokenize.COMMENT and
+                   token.line.lstrip().startswith('#')
+                   for token in self.tokens)
+
+    def has_node(self, *node_types):
+        """
+        Checks whether the tree of the file contains a node of one of the
+        given types.
+
+        :param node_types: The ``ast.AST`` subclasses to look for.
+        :return:           True if there is such a node or if the file cannot
+                           be parsed.
+        """
+        if self.tree is None:
+            return True
+        return any(isinstance(node, node_types)
+                   for node in ast.walk(self.tree))
+
+
+def get_python_analysis(dependency_results, filename, file):
+    """
+    Retrieves the ``PythonAnalysis`` of a file from the results of
+    ``PythonAnalysisBear``.
+
+    :param dependency_results: The dependency results given to a bear or None
+                               if it is run on its own.
+    :param filename:           The name of the file.
+    :param file:               The lines of the file.
+    :return:                   The ``PythonAnalysis`` of the file, a new one
+                               if there is no result of
+                               ``PythonAnalysisBear``.
+    """
+    for result in (dependency_results or {}).get(PythonAnalysisBear.name, ()):
+        if isinstance(result, HiddenResult) and isinstance(result.contents,
+                                                           PythonAnalysis):
+            return result.contents
+    return PythonAnalysis(filename, file)
+
+
+class PythonAnalysisBear(LocalBear):
+    LANGUAGES = {'Python', 'Python 2', 'Python 3'}
+    AUTHORS = {'The coala developers'}
+    AUTHORS_EMAILS = {'coala-devel@googlegroups.com'}
+    LICENSE = 'AGPL-3.0'
+
+    def run(self, filename, file):
+        """
+        Shares the tokens and the abstract syntax tree of a Python file with
+        the bears depending on this bear, so the file is only tokenized and
+        parsed once.
+
+        :return: One HiddenResult containing the ``PythonAnalysis`` of the
+                 file.
+        """
+        yield HiddenResult(self, PythonAnalysis(filename, file))
@@ -2,6 +2,8 @@ import logging
 import radon.complexity
 import radon.visitors
 
+from bears.python.PythonAnalysisBear import (
+    get_python_analysis, PythonAnalysisBear)
 from coalib.bears.LocalBear import LocalBear
 from dependency_management.requirements.PipRequirement import PipRequirement
 from coalib.results.Result import Result
@@ -17,8 +19,10 @@ class RadonBear(LocalBear):
     AUTHORS_EMAILS = {'coala-devel@googlegroups.com'}
     LICENSE = 'AGPL-3.0'
     CAN_DETECT = {'Complexity'}
+    BEAR_DEPS = {PythonAnalysisBear}
 
     def run(self, filename, file,
+            dependency_results: dict = None,
             cyclomatic_complexity: int = None,
             radon_ranks_info: typed_list(str) = (),
             radon_ranks_normal: typed_list(str) = ('C', 'D'),
@@ -48,7 +52,14 @@ class RadonBear(LocalBear):
                             ' are deprecated. Please use '
                             '`cyclomatic_complexity` instead.')
 
-        for visitor in radon.complexity.cc_visit(''.join(file)):
+        analysis = get_python_analysis(dependency_results, filename, file)
+        if analysis.tree is None:
+            # Let radon raise the syntax error.
+            visitors = radon.complexity.cc_visit(analysis.source)
+        else:
+            visitors = radon.complexity.cc_visit_ast(analysis.tree)
+
+        for visitor in visitors:
             rank = radon.complexity.cc_rank(visitor.complexity)
             severity = None
             for result_severity, rank_list in severity_map.items():
@@ -1,5 +1,6 @@
 from os.path import abspath, dirname, join
 
+from bears.java.JarWorker import run_linter_in_jar_worker
 from coalib.bearlib.abstractions.Linter import linter
 from dependency_management.requirements.DistributionRequirement import (
     DistributionRequirement)
@@ -33,12 +34,24 @@ class ScalaLintBear:
             'scalastyle/scalastyle_2.10/0.8.0/scalastyle_2.10-0.8.0-batch.jar',
             'scalastyle.jar')
 
+    def run(self, filename, file, **kwargs):
+        if kwargs.get('persistent_jvm'):
+            results = run_linter_in_jar_worker(self, filename, file, kwargs)
+            if results is not None:
+                return results
+        return super().run(filename, file, **kwargs)
+
     @staticmethod
     def create_arguments(filename, file, config_file,
                          scalalint_config: str = scalastyle_config_file,
+                         persistent_jvm: bool = False,
                          ):
         """
         :param scalalint_config: Path to a custom configuration file.
+        :param persistent_jvm:   Set to true to check all files in one long
+                                 running JVM instead of starting a new one for
+                                 every file. Needs Java 12 or later and falls
+                                 back to a JVM per file if that fails.
         """
         return ('-jar', ScalaLintBear.jar, filename, '--config',
                 scalalint_config)
@@ -0,0 +1,90 @@
+"""
+Measures how much time the bears depending on ``PythonAnalysisBear`` save per
+file by sharing one tokenization and parse of the file.
+
+Usage: python benchmarks/python_analysis.py [FILE_OR_DIRECTORY ...]
+
+Without arguments the Python files of coala-bears are used.
+"""
+
+import glob
+import logging
+import os
+from queue import Queue
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(
+    __file__))))
+
+from bears.python.PyCommentedCodeBear import PyCommentedCodeBear  # noqa
+from bears.python.PythonAnalysisBear import PythonAnalysisBear  # noqa
+from bears.python.PyUnusedCodeBear import PyUnusedCodeBear  # noqa
+from bears.python.RadonBear import RadonBear  # noqa
+from coalib.settings.Section import Section  # noqa
+
+
+CONSUMERS = (RadonBear, PyUnusedCodeBear, PyCommentedCodeBear)
+
+
+def get_files(paths):
+    files = {}
+    for path in paths:
+        names = (glob.glob(os.path.join(path, '**', '*.py'), recursive=True)
+                 if os.path.isdir(path) else (path,))
+        for name in names:
+            with open(name, encoding='utf-8') as file:
+                files[name] = tuple(file.readlines())
+    return files
+
+
+def run_bears(bears, files, shared):
+    """
+    Runs the bears on all files.
+
+    :param shared: Whether the files are analysed once by
+                   ``PythonAnalysisBear`` or by every bear on its own.
+    :return:       The time taken in seconds.
+    """
+    hub = PythonAnalysisBear(Section(''), Queue())
+    start = time.perf_counter()
+    for filename, file in files.items():
+        dependency_results = ({PythonAnalysisBear.name:
+                               list(hub.run(filename, file))}
+                              if shared else None)
+        for bear in bears:
+            list(bear.run(filename, file, dependency_results))
+    return time.perf_counter() - start
+
+
+def main(paths):
+    # RadonBear warns about its deprecated default settings for every file.
+    logging.disable(logging.WARNING)
+    files = get_files(paths or [os.path.join(os.path.dirname(__file__),
+                                             os.pardir, 'bears')])
+    section = Section('')
+    bears = []
+    for bear_class in CONSUMERS:
+        bear = bear_class(section, Queue())
+        try:
+            run_bears((bear,), files, False)
+        except Exception as error:
+            print('Skipping {}: {!r}'.format(bear_class.name, error))
+        else:
+            bears.append(bear)
+
+    separate = min(run_bears(bears, files, False) for _ in range(3))
+    shared = min(run_bears(bears, files, True) for _ in range(3))
+
+    print('{} files, bears: {}'.format(
+        len(files), ', '.join(bear.name for bear in bears)))
+    print('separate analyses: {:8.2f} ms per file'.format(
+        separate / len(files) * 1000))
+    print('shared analysis:   {:8.2f} ms per file'.format(
+        shared / len(files) * 1000))
+    print('saved:             {:8.2f} ms per file'.format(
+        (separate - shared) / len(files) * 1000))
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -101,7 +101,8 @@ if __name__ == '__main__':
           extras_require=extras_require,
           tests_require=test_required,
           package_data={'bears': ['VERSION'],
-                        'bears.java': ['checkstyle.jar', 'google_checks.xml'],
+                        'bears.java': ['checkstyle.jar', 'google_checks.xml',
+                                       'JarWorker.java'],
                         'bears.scala': ['scalastyle.jar',
                                         'scalastyle_config.xml']},
           license='AGPL-3.0',
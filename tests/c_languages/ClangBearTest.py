@@ -1,9 +1,12 @@
 from collections import namedtuple
+import os
+from tempfile import TemporaryDirectory
 import unittest
 from unittest.mock import patch
 
 from bears.c_languages.ClangBear import (
-    ClangBear, diff_from_clang_fixit, sourcerange_from_clang_range)
+    ClangBear, diff_from_clang_fixit, sourcerange_from_clang_range,
+    walk_cursors)
 from coalib.results.SourceRange import SourceRange
 from coalib.settings.Section import Section
 from coalib.testing.LocalBearTestHelper import verify_local_bear
@@ -51,6 +54,50 @@ class ClangBearUtilitiesTest(unittest.TestCase):
         compare = SourceRange.from_values('t.c', 1, 2, 3, 4)
         self.assertEqual(uut, compare)
 
+    def test_walk_cursors(self):
+        try:
+            from clang.cindex import CursorKind, Index, LibclangError
+        except ImportError as err:
+            raise unittest.case.SkipTest(str(err))
+
+        with TemporaryDirectory() as directory:
+            header = os.path.join(directory, 't.h')
+            filename = os.path.join(directory, 't.c')
+            with open(header, 'w') as file:
+                file.write('int f(int a) { return a; }\n')
+            with open(filename, 'w') as file:
+                file.write('#include "t.h"\n'
+                           'int g(int b) { return f(b); }\n'
+                           'int h;\n')
+            try:
+                root = Index.create().parse(filename).cursor
+            except LibclangError as err:
+                raise unittest.case.SkipTest(str(err))
+
+            stacks = [[(cursor.kind, cursor.spelling, child_num)
+                       for cursor, child_num in stack]
+                      for stack in walk_cursors(root, filename)]
+            self.assertEqual(stacks[0][0][0], CursorKind.TRANSLATION_UNIT)
+            self.assertEqual(
+                [stack[1:] for stack in stacks[1:3]],
+                [[(CursorKind.FUNCTION_DECL, 'g', 1)],
+                 [(CursorKind.FUNCTION_DECL, 'g', 1),
+                  (CursorKind.PARM_DECL, 'b', 0)]])
+            self.assertEqual(stacks[-1][1:],
+                             [(CursorKind.VAR_DECL, 'h', 2)])
+            self.assertNotIn('f', [stack[-1][1] for stack in stacks
+                                   if stack[-1][0] ==
+                                   CursorKind.FUNCTION_DECL])
+
+            stacks = [[cursor.spelling for cursor, _ in stack]
+                      for stack in walk_cursors(
+                          root, filename,
+                          frozenset({CursorKind.FUNCTION_DECL}))]
+            self.assertEqual([stack[1:] for stack in stacks[1:]],
+                             [['g'], ['h']])
+            self.assertGreater(len(list(walk_cursors(root))),
+                               len(list(walk_cursors(root, filename))))
+
 
 ClangBearTest = verify_local_bear(
     ClangBear,
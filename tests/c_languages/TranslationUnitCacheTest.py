@@ -0,0 +1,70 @@
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+from bears.c_languages.TranslationUnitCache import (
+    get_translation_unit_cache, TranslationUnitCache)
+from tests.c_languages import skip_if_no_clang
+
+
+@skip_if_no_clang()
+class TranslationUnitCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.filename = os.path.join(self.directory.name, 'test.c')
+        with open(self.filename, 'w') as file:
+            file.write('int main() { return 0; }\n')
+        self.uut = TranslationUnitCache(max_units=2)
+
+    def tearDown(self):
+        self.directory.cleanup()
+
+    def test_parse(self):
+        unit = self.uut.parse(self.filename)
+        self.assertIs(self.uut.parse(self.filename), unit)
+        self.assertIs(self.uut.parse(self.filename,
+                                     content='int main() { return 0; }\n'),
+                      unit)
+        self.assertEqual(list(unit.diagnostics), [])
+
+        for index in range(2):
+            self.uut.parse(os.path.join(self.directory.name,
+                                        'missing{}.c'.format(index)),
+                           content='int x;\n')
+        # The least recently used unit was dropped.
+        self.assertEqual(len(self.uut.units), 2)
+        self.assertIsNot(self.uut.parse(self.filename), unit)
+
+    def test_parse_args(self):
+        unit = self.uut.parse(self.filename, ['-DTEST'])
+        self.assertIs(self.uut.parse(self.filename), unit)
+
+        # Further arguments are appended to the ones parsed with before.
+        union_unit = self.uut.parse(self.filename, ['-I', 'include'])
+        self.assertIsNot(union_unit, unit)
+        self.assertEqual(self.uut.units[self.filename][1],
+                         ('-DTEST', '-I', 'include'))
+        self.assertIs(self.uut.parse(self.filename, ['-DTEST']), union_unit)
+        self.assertIs(self.uut.parse(self.filename, ['-I', 'include']),
+                      union_unit)
+        self.assertEqual(len(self.uut.units), 1)
+
+    def test_reparse(self):
+        unit = self.uut.parse(self.filename)
+        self.assertIs(self.uut.parse(self.filename, content='int main() {'),
+                      unit)
+        self.assertNotEqual(list(unit.diagnostics), [])
+
+        self.assertIs(self.uut.parse(self.filename), unit)
+        self.assertEqual(list(unit.diagnostics), [])
+
+    def test_missing_file(self):
+        filename = os.path.join(self.directory.name, 'missing.c')
+        self.uut.parse(filename, content='int x;\n')
+        self.assertEqual(len(self.uut.units), 1)
+        self.assertIsNone(self.uut.get_digest(filename))
+
+    def test_get_translation_unit_cache(self):
+        self.assertIs(get_translation_unit_cache(),
+                      get_translation_unit_cache())
@@ -60,6 +60,42 @@ class ClangCloneDetectionBearTest(unittest.TestCase):
                                         lambda results, msg:
                                         self.assertNotEqual(results, [], msg))
 
+    @staticmethod
+    def get_file_dict(file):
+        with open(file, encoding='utf-8') as _file:
+            return {file: _file.readlines()}
+
+    def get_results(self, file):
+        file_dict = self.get_file_dict(file)
+        difference_results = ClangFunctionDifferenceBear(
+            file_dict,
+            self.section,
+            Queue()).run_bear_from_section([], {})
+        uut = ClangCloneDetectionBear(file_dict, self.section, Queue())
+        arg_dict = {'dependency_results':
+                    {ClangFunctionDifferenceBear.__name__:
+                     list(difference_results)}}
+        return list(uut.run_bear_from_section([], arg_dict))
+
+    def test_clone_groups(self):
+        file = os.path.join(self.base_test_path, 'clones',
+                            'several_duplicates.c')
+        results = self.get_results(file)
+
+        self.assertEqual(len(results), 1)
+        self.assertGreater(len(results[0].affected_code), 2)
+        self.assertEqual({code.file for code in results[0].affected_code},
+                         {file})
+        self.assertEqual(results[0].debug_msg, '')
+
+        self.section.append(Setting('max_clone_pairs', '2'))
+        self.section.append(Setting('debug_count_matrices', 'true'))
+        results = self.get_results(file)
+
+        self.assertEqual(len(results), 2)
+        self.assertTrue(all(len(result.debug_msg) == 2
+                            for result in results))
+
     def check_clone_detection_bear(self, files, result_check_function):
         """
         Checks the results of the CloneDetectionBear with the given function.
@@ -70,12 +106,13 @@ class ClangCloneDetectionBearTest(unittest.TestCase):
                                       results are invalid.
         """
         for file in files:
+            file_dict = self.get_file_dict(file)
             difference_results = ClangFunctionDifferenceBear(
-                {file: ''},
+                file_dict,
                 self.section,
                 Queue()).run_bear_from_section([], {})
             uut = ClangCloneDetectionBear(
-                {file: ''},
+                file_dict,
                 self.section,
                 Queue())
             arg_dict = {'dependency_results':
@@ -0,0 +1,108 @@
+import os
+import unittest
+from queue import Queue
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
+
+import numpy
+
+from bears.c_languages.codeclone_detection.ClangFunctionDifferenceBear import (
+    ClangFunctionDifferenceBear, compare_function_pairs, FunctionPairComparer)
+from bears.c_languages.codeclone_detection.ClangCountVectorCreator import (
+    ClangCountVectorCreator)
+from bears.c_languages.codeclone_detection.CloneDetectionRoutines import (
+    compare_count_arrays)
+from coalib.testing.BearTestHelper import generate_skip_decorator
+from coalib.settings.Section import Section
+from coalib.settings.Setting import Setting
+
+
+class FunctionPairComparisonTest(unittest.TestCase):
+
+    def setUp(self):
+        self.count_arrays = [numpy.array([[1, 2], [0, 3]], dtype=float),
+                             numpy.array([[0, 3], [1, 2.5]]),
+                             numpy.array([[7, 0]], dtype=float)]
+        self.uut = FunctionPairComparer(self.count_arrays, False, True, False)
+        self.index_pairs = [(0, 1), (0, 2), (1, 2)] * 150
+
+    def test_comparer(self):
+        self.assertEqual(
+            self.uut([(0, 1), (1, 2)]),
+            [(0, 1, compare_count_arrays(*self.count_arrays[:2])),
+             (1, 2, compare_count_arrays(*self.count_arrays[1:]))])
+
+    def test_compare_function_pairs(self):
+        chunks = list(compare_function_pairs(self.uut, self.index_pairs))
+        self.assertEqual(len(chunks), 3)
+        self.assertEqual(sum(chunks, []), self.uut(self.index_pairs))
+
+        self.assertEqual(
+            list(compare_function_pairs(self.uut, self.index_pairs, 2)),
+            chunks)
+        self.assertEqual(list(compare_function_pairs(self.uut, [], 2)), [])
+
+
+@generate_skip_decorator(ClangFunctionDifferenceBear)
+class ClangFunctionDifferenceBearTest(unittest.TestCase):
+
+    def setUp(self):
+        self.file = os.path.join(os.path.dirname(__file__),
+                                 'clone_detection_samples',
+                                 'clones',
+                                 'several_duplicates.c')
+        self.section = Section('default')
+        self.section.append(Setting('files', '', origin=self.file))
+
+    def get_differences(self, files=None):
+        file_dict = {}
+        for filename in files or [self.file]:
+            with open(filename, encoding='utf-8') as file:
+                file_dict[filename] = file.readlines()
+        results = list(ClangFunctionDifferenceBear(
+            file_dict,
+            self.section,
+            Queue()).run_bear_from_section([], {}))
+        return results[0].contents
+
+    def test_comparison_processes(self):
+        differences = []
+        for processes in ('1', '2'):
+            self.section.append(Setting('comparison_processes', processes))
+            differences.append(self.get_differences())
+
+        self.assertNotEqual(differences[0], [])
+        self.assertEqual(differences[0], differences[1])
+
+    def test_parsing_processes(self):
+        directory = os.path.dirname(self.file)
+        files = sorted(os.path.join(directory, filename)
+                       for filename in os.listdir(directory))
+        differences = []
+        for processes in ('1', '2'):
+            self.section.append(Setting('parsing_processes', processes))
+            differences.append(self.get_differences(files))
+
+        self.assertGreater(
+            len({file for (file, _, _), _, _ in differences[0]}), 1)
+        self.assertEqual(differences[0], differences[1])
+
+    def test_count_matrix_cache(self):
+        uncached = self.get_differences()
+        with TemporaryDirectory() as cache_dir:
+            self.section.append(Setting('count_matrix_cache_dir', cache_dir))
+            self.assertEqual(self.get_differences(), uncached)
+            self.assertEqual(len(os.listdir(cache_dir)), 1)
+
+            with patch.object(ClangCountVectorCreator,
+                              'get_vectors_for_file') as parse:
+                self.assertEqual(self.get_differences(), uncached)
+                self.assertFalse(parse.called)
+
+    def test_clones_only(self):
+        self.section.append(Setting('max_clone_difference', '0.1'))
+        differences = self.get_differences()
+        self.section.append(Setting('clones_only', 'true'))
+        self.assertEqual(self.get_differences(),
+                         [difference for difference in differences
+                          if difference[2] < 0.1])
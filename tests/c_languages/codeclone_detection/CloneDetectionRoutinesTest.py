@@ -1,7 +1,18 @@
 import unittest
 
 from bears.c_languages.codeclone_detection.CloneDetectionRoutines import (
-    relative_difference)
+    compare_count_arrays, compare_functions, CountArraySignatures,
+    get_candidate_pairs, get_clone_clusters, get_count_array,
+    get_difference_matrices, pad_count_arrays, relative_difference)
+from bears.c_languages.codeclone_detection.CountVector import CountVector
+
+
+def get_count_matrix(*count_vectors):
+    count_matrix = {}
+    for i, count_vector in enumerate(count_vectors):
+        count_matrix[i] = CountVector(i, conditions=[None]*len(count_vector))
+        count_matrix[i].count_vector = list(count_vector)
+    return count_matrix
 
 
 class CloneDetectionRoutinesTest(unittest.TestCase):
@@ -18,3 +29,82 @@ class CloneDetectionRoutinesTest(unittest.TestCase):
         self.assertEqual(relative_difference(0, 0), 1)
         self.assertEqual(relative_difference(1, 0), 1)
         self.assertEqual(relative_difference(0.5, 2), 0.25)
+
+    def test_get_count_array(self):
+        count_array = get_count_array(get_count_matrix((1, 2), (0, 3)))
+        self.assertEqual(count_array.tolist(), [[1, 2], [0, 3]])
+        self.assertEqual(get_count_array({}).shape, (0, 0))
+
+    def test_pad_count_arrays(self):
+        ca1 = get_count_array(get_count_matrix((1, 2)))
+        ca2 = get_count_array(get_count_matrix((0, 3), (4, 5), (6, 7)))
+        padded1, padded2 = pad_count_arrays(ca1, ca2)
+        self.assertIs(padded1, ca2)
+        self.assertEqual(padded2.tolist(), [[1, 2], [0, 0], [0, 0]])
+        self.assertEqual(ca1.tolist(), [[1, 2]])
+
+    def test_get_difference_matrices(self):
+        cm1 = get_count_matrix((1, 2, 0), (0, 3, 1.5))
+        cm2 = get_count_matrix((4, 0, 1), (1, 2, 0), (0, 0, 0))
+        differences, maxabs = get_difference_matrices(get_count_array(cm1),
+                                                      get_count_array(cm2))
+        for i, cv1 in cm1.items():
+            for j, cv2 in cm2.items():
+                self.assertAlmostEqual(differences[i, j],
+                                       cv1.difference(cv2))
+                self.assertAlmostEqual(maxabs[i, j], cv1.maxabs(cv2))
+
+    def test_compare_functions(self):
+        cm1 = get_count_matrix((1, 2, 0), (0, 3, 1.5))
+        cm2 = get_count_matrix((0, 3, 1.5), (1, 2, 0))
+        self.assertEqual(compare_functions(cm1, cm2), 0)
+        self.assertEqual(compare_functions(cm1,
+                                           get_count_matrix((0, 0, 0)),
+                                           poly_postprocessing=False),
+                         1)
+        self.assertEqual(compare_functions(get_count_matrix((2, 0)),
+                                           get_count_matrix((0, 2)),
+                                           poly_postprocessing=False),
+                         1)
+
+    def test_lower_bounds(self):
+        count_arrays = [
+            get_count_array(get_count_matrix(*count_matrix))
+            for count_matrix in (((1, 2, 0), (0, 3, 1.5)),
+                                 ((0, 3, 1.5), (1, 2, 0)),
+                                 ((0, 0.5, 0),),
+                                 ((9, 0, 4), (1, 1, 1), (0, 0, 0)),
+                                 ((0, 0, 0),))]
+        uut = CountArraySignatures(count_arrays)
+        for flags in ((False, True, False),
+                      (True, False, True),
+                      (False, True, True)):
+            for i, count_array in enumerate(count_arrays):
+                bounds = uut.get_lower_bounds(i, *flags)
+                self.assertEqual(len(bounds), len(count_arrays) - i - 1)
+                for bound, other in zip(bounds, count_arrays[i+1:]):
+                    self.assertLessEqual(
+                        bound,
+                        compare_count_arrays(count_array, other, *flags))
+
+    def test_get_candidate_pairs(self):
+        count_arrays = {
+            'a': get_count_array(get_count_matrix((10, 2), (0, 3))),
+            'b': get_count_array(get_count_matrix((0, 3), (10, 2))),
+            'c': get_count_array(get_count_matrix((0, 50), (1, 0))),
+            'd': get_count_array(get_count_matrix((10, 2), (0, 4)))}
+        self.assertEqual(list(get_candidate_pairs(count_arrays, None)),
+                         [('a', 'b'), ('a', 'c'), ('a', 'd'),
+                          ('b', 'c'), ('b', 'd'), ('c', 'd')])
+        self.assertEqual(list(get_candidate_pairs(count_arrays, 0.2)),
+                         [('a', 'b'), ('a', 'd'), ('b', 'd')])
+
+    def test_get_clone_clusters(self):
+        differences = [('a', 'b', 0.1), ('c', 'd', 0.05), ('b', 'c', 0.5),
+                       ('e', 'f', 0.2), ('f', 'a', 0.15), ('g', 'h', 0.3)]
+        self.assertEqual(get_clone_clusters(iter(differences), 0.25),
+                         [(('c', 'd'), 0.05), (('a', 'b', 'e', 'f'), 0.1)])
+        self.assertEqual(get_clone_clusters(differences, 1),
+                         [(('a', 'b', 'c', 'd', 'e', 'f'), 0.05),
+                          (('g', 'h'), 0.3)])
+        self.assertEqual(get_clone_clusters(differences, 0), [])
@@ -0,0 +1,81 @@
+import os
+import shutil
+import unittest
+from tempfile import mkdtemp
+
+from bears.c_languages.codeclone_detection.ClangCountingConditions import (
+    in_condition, used)
+from bears.c_languages.codeclone_detection.ClangCountVectorCreator import (
+    ClangCountVectorCreator)
+from bears.c_languages.codeclone_detection.CountMatrixCache import (
+    CountMatrixCache)
+from tests.c_languages import skip_if_no_clang
+
+
+class CountMatrixCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.cache_dir = mkdtemp()
+        self.testfile = os.path.abspath(os.path.join(
+            os.path.dirname(__file__),
+            'sample.c'))
+        self.conditions = [used, in_condition]
+        self.weightings = [1, 0.5]
+        self.uut = CountMatrixCache(self.cache_dir,
+                                    self.conditions,
+                                    self.weightings)
+
+    def tearDown(self):
+        shutil.rmtree(self.cache_dir)
+
+    def test_key(self):
+        key = self.uut.get_key(self.testfile, ['b', 'a'])
+        self.assertEqual(key, self.uut.get_key(self.testfile, ['a', 'b']))
+        self.assertNotEqual(key, self.uut.get_key(self.testfile, ['a']))
+        self.assertNotEqual(
+            key,
+            CountMatrixCache(self.cache_dir,
+                             self.conditions,
+                             [1, 1]).get_key(self.testfile, ['a', 'b']))
+        self.assertNotEqual(
+            key,
+            CountMatrixCache(self.cache_dir,
+                             [used],
+                             [1]).get_key(self.testfile, ['a', 'b']))
+
+        other_file = os.path.join(self.cache_dir, 'sample.c')
+        shutil.copy(self.testfile, other_file)
+        other_key = self.uut.get_key(other_file, ['a', 'b'])
+        self.assertNotEqual(key, other_key)
+        with open(other_file, 'a') as file:
+            file.write('\n')
+        self.assertNotEqual(other_key,
+                            self.uut.get_key(other_file, ['a', 'b']))
+
+    def test_missing_entry(self):
+        self.assertIsNone(self.uut.get('0123'))
+
+    @skip_if_no_clang()
+    def test_roundtrip(self):
+        count_dict = ClangCountVectorCreator(
+            self.conditions,
+            self.weightings).get_vectors_for_file(self.testfile)
+        key = self.uut.get_key(self.testfile, [])
+        self.uut.set(key, count_dict)
+
+        cached = CountMatrixCache(self.cache_dir,
+                                  self.conditions,
+                                  self.weightings).get(key)
+        self.assertEqual(sorted(cached), sorted(count_dict))
+        for function, count_matrix in count_dict.items():
+            self.assertEqual(sorted(cached[function]), sorted(count_matrix))
+            for name, count_vector in count_matrix.items():
+                cached_vector = cached[function][name]
+                self.assertEqual(cached_vector.name, count_vector.name)
+                self.assertEqual(cached_vector.category,
+                                 count_vector.category)
+                self.assertEqual(cached_vector.count_vector,
+                                 count_vector.count_vector)
+                self.assertEqual(cached_vector.unweighted,
+                                 count_vector.unweighted)
+                self.assertEqual(cached_vector.weightings, self.weightings)
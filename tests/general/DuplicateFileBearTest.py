@@ -1,9 +1,12 @@
+import json
 import unittest
 import os
+from tempfile import TemporaryDirectory
+from unittest.mock import patch
 
 from coalib.settings.Section import Section
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
-from bears.general.DuplicateFileBear import DuplicateFileBear
+from bears.general.DuplicateFileBear import DigestCache, DuplicateFileBear
 from queue import Queue
 
 
@@ -63,3 +66,47 @@ class DuplicateFileBearTest(unittest.TestCase):
         messages = [result.message for result in results]
         self.assertEqual(messages, ['You included only one file'])
         self.assertEqual(results[0].severity, RESULT_SEVERITY.MAJOR)
+
+    def test_results_grouped(self):
+        results = self.get_results(self.test_files)
+        self.assertEqual(len(results), 2)
+        self.assertEqual(
+            results[0].message,
+            'File ' + get_absolute_test_path('complexFirst.txt') +
+            ' is identical to File ' +
+            get_absolute_test_path('complexSecond.txt'))
+        self.assertEqual(
+            [code.file for code in results[1].affected_code],
+            [get_absolute_test_path('smallFirst.txt'),
+             get_absolute_test_path('smallSecond.txt')])
+
+        self.file_dict = {'a': ('x\n',), 'b': ('y\n',), 'c': ('x\n',),
+                          'd': ('x\n',), 'e': ('xy\n',)}
+        self.uut = DuplicateFileBear(self.file_dict, self.section,
+                                     self.queue)
+        results = list(self.uut.run())
+        self.assertEqual([result.message for result in results],
+                         ['File a is identical to File c and File d'])
+
+    def test_digest_cache(self):
+        with TemporaryDirectory() as directory:
+            cache_file = os.path.join(directory, 'digests.json')
+            results = self.get_results(self.test_files[3:])
+            self.assertEqual(len(results), 1)
+
+            results = list(self.uut.run(digest_cache_file=cache_file))
+            self.assertEqual(len(results), 1)
+            with open(cache_file) as _file:
+                digests = json.load(_file)
+            self.assertEqual(sorted(digests), sorted(self.files))
+
+            cache = DigestCache(cache_file)
+            with patch.object(DigestCache, 'compute_digest') as compute:
+                self.assertEqual(
+                    cache.get_digest(self.files[0],
+                                     self.file_dict[self.files[0]]),
+                    digests[self.files[0]][2])
+                self.assertFalse(compute.called)
+
+                cache.get_digest('nonexistent', ('a',))
+                self.assertTrue(compute.called)
@@ -5,7 +5,8 @@ import requests_mock
 import unittest
 import unittest.mock
 
-from bears.general.HTTPSBear import HTTPSBear
+from bears.general.HTTPSBear import get_https_prober, HTTPSBear, HTTPSProber
+from bears.general.LinkChecker import LinkChecker
 from bears.general.URLHeadBear import URLHeadBear
 from coalib.testing.LocalBearTestHelper import LocalBearTestHelper
 from coalib.settings.Section import Section
@@ -77,6 +78,7 @@ class HTTPSBearTest(LocalBearTestHelper):
         self.section = Section('')
         URLHeadBear.check_prerequisites = lambda *args: True
         self.uut = HTTPSBear(self.section, Queue())
+        get_https_prober.cache_clear()
 
     def tearDown(self):
         URLHeadBear.check_prerequisites = self.ub_check_prerequisites
@@ -107,3 +109,84 @@ class HTTPSBearTest(LocalBearTestHelper):
         with requests_mock.Mocker() as m:
             m.add_matcher(custom_matcher_https)
             self.check_validity(self.uut, test_link)
+
+    def test_host_without_https(self):
+        test_link = """
+        http://httpbin.org/status/v200
+        http://nohttps.org/status/v200
+        http://nohttps.org/status/v201
+        http://httpbin.org/status/v201
+        """.splitlines()
+
+        with requests_mock.Mocker() as m:
+            m.add_matcher(custom_matcher_https)
+            m.head(requests_mock.ANY, exc=requests.exceptions.SSLError)
+            m.head('https://httpbin.org/status/v200', status_code=200)
+            m.head('https://httpbin.org/status/v201', status_code=201)
+            self.check_line_result_count(self.uut, test_link, [1, 0, 0, 1])
+            self.assertEqual(
+                sorted(request.url for request in m.request_history
+                       if request.scheme == 'https'),
+                ['https://httpbin.org/status/v200',
+                 'https://httpbin.org/status/v201',
+                 'https://nohttps.org/status/v200'])
+
+
+class HTTPSProberTest(unittest.TestCase):
+
+    def setUp(self):
+        self.uut = HTTPSProber(LinkChecker())
+
+    def test_probe_all(self):
+        links = ['https://a.org/1', 'https://a.org/2', 'https://b.org/1',
+                 'https://b.org/2', 'https://a.org/1']
+
+        with requests_mock.Mocker() as m:
+            m.head('https://a.org/1', status_code=200)
+            m.head('https://a.org/2', status_code=404)
+            m.head('https://b.org/1', exc=requests.exceptions.SSLError)
+            m.head('https://a.org/3', status_code=200)
+            responses = self.uut.probe_all(links, lambda host: 5)
+
+            self.assertEqual(self.uut.hosts, {'a.org': True, 'b.org': False})
+            self.assertEqual(set(responses), {'https://a.org/1',
+                                              'https://a.org/2',
+                                              'https://b.org/1'})
+            self.assertEqual(responses['https://a.org/2'].status_code, 404)
+            self.assertEqual(m.call_count, 3)
+
+            responses = self.uut.probe_all(['https://b.org/3',
+                                            'https://a.org/3'],
+                                           lambda host: 5)
+            self.assertEqual(list(responses), ['https://a.org/3'])
+            self.assertEqual(m.call_count, 4)
+
+    def test_probe_all_timeout(self):
+        links = ['https://a.org/1', 'https://a.org/2']
+
+        with requests_mock.Mocker() as m:
+            m.head('https://a.org/1', exc=requests.exceptions.ConnectTimeout)
+            m.head('https://a.org/2', exc=requests.exceptions.ReadTimeout)
+            responses = self.uut.probe_all(links, lambda host: 5)
+
+            # Timeouts may be transient, the host is probed again.
+            self.assertEqual(self.uut.hosts, {})
+            self.assertEqual(set(responses), set(links))
+            self.assertEqual(m.call_count, 2)
+
+            m.head('https://a.org/1', status_code=200)
+            responses = self.uut.probe_all(links, lambda host: 5)
+            self.assertEqual(self.uut.hosts, {'a.org': True})
+            self.assertEqual(responses['https://a.org/1'].status_code, 200)
+            self.assertEqual(m.call_count, 4)
+
+    def test_lacks_https(self):
+        self.assertTrue(HTTPSProber.lacks_https(
+            requests.exceptions.SSLError()))
+        self.assertTrue(HTTPSProber.lacks_https(
+            requests.exceptions.ConnectionError()))
+        self.assertFalse(HTTPSProber.lacks_https(
+            requests.exceptions.ConnectTimeout()))
+        self.assertFalse(HTTPSProber.lacks_https(
+            requests.exceptions.ReadTimeout()))
+        self.assertFalse(HTTPSProber.lacks_https(requests.Response()))
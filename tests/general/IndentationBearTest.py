@@ -2,8 +2,10 @@ import unittest
 
 from queue import Queue
 
-from bears.general.IndentationBear import IndentationBear
+from bears.general.IndentationBear import IndentationBear, RangeIndex
 from bears.general.AnnotationBear import AnnotationBear
+from coalib.results.SourceRange import SourceRange
+from coalib.results.TextPosition import TextPosition
 from coalib.settings.Section import Section
 from coalib.settings.Setting import Setting
 from coalib.bearlib.languages import Language
@@ -291,3 +293,40 @@ class IndentationBearTest(unittest.TestCase):
         valid_file = ('This is a valid specifier: # A comment\n',
                       '\tand so it indents\n')
         self.verify_bear(valid_file)
+
+
+class RangeIndexTest(unittest.TestCase):
+
+    def setUp(self):
+        self.ranges = (SourceRange.from_values('F', 1, 5, 4, 2),
+                       SourceRange.from_values('F', 2, 1, 2, 8),
+                       SourceRange.from_values('F', 6, 3, 6, 4),
+                       SourceRange.from_values('F', 6, 7, 6, 9))
+        self.uut = RangeIndex(self.ranges)
+
+    def test_sequence(self):
+        self.assertEqual(len(self.uut), 4)
+        self.assertEqual(tuple(self.uut), self.ranges)
+        self.assertEqual(self.uut[1], self.ranges[1])
+        self.assertFalse(RangeIndex(()))
+
+    def test_covers(self):
+        self.assertFalse(self.uut.covers(TextPosition(1, 4)))
+        self.assertTrue(self.uut.covers(TextPosition(1, 5)))
+        self.assertTrue(self.uut.covers(TextPosition(3, 80)))
+        self.assertTrue(self.uut.covers(TextPosition(4, 2)))
+        self.assertFalse(self.uut.covers(TextPosition(4, 3)))
+        self.assertFalse(self.uut.covers(TextPosition(6, 5)))
+        self.assertTrue(self.uut.covers(TextPosition(6, 9)))
+
+    def test_covers_line(self):
+        self.assertFalse(self.uut.covers_line(1))
+        self.assertTrue(self.uut.covers_line(2))
+        self.assertTrue(self.uut.covers_line(4))
+        self.assertFalse(self.uut.covers_line(5))
+        self.assertFalse(self.uut.covers_line(6))
+
+    def test_on_line(self):
+        self.assertEqual(self.uut.on_line(6), [self.ranges[2],
+                                               self.ranges[3]])
+        self.assertEqual(self.uut.on_line(1), [])
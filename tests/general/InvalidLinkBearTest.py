@@ -439,7 +439,7 @@ class InvalidLinkBearTest(LocalBearTestHelper):
             return res
 
         with unittest.mock.patch(
-                'tests.general.InvalidLinkBearTest.requests.head',
+                'tests.general.InvalidLinkBearTest.requests.Session.head',
                 return_value=response(status_code=200)) as mock:
             self.check_validity(self.uut, file_contents,
                                 settings={'network_timeout': nt})
@@ -467,4 +467,6 @@ class InvalidLinkBearTest(LocalBearTestHelper):
                 unittest.mock.call('https://coala.io/som/thingg/page/123',
                                    timeout=20, allow_redirects=False),
                 unittest.mock.call('https://gitmate.io',
-                                   timeout=15, allow_redirects=False)])
+                                   timeout=15, allow_redirects=False)
+            ], any_order=True)
+            self.assertEqual(mock.call_count, 7)
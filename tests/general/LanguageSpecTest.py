@@ -0,0 +1,59 @@
+import unittest
+
+from bears.general.LanguageSpec import (
+    AnnotationScanner, LanguageSpec, get_language_spec)
+from coalib.bearlib.languages.LanguageDefinition import LanguageDefinition
+from coalib.results.SourceRange import SourceRange
+
+
+class AnnotationScannerTest(unittest.TestCase):
+
+    def test_scanner_reuse(self):
+        scanner = AnnotationScanner({'"': '"'}, {}, {'#': ''}, {})
+        text1 = ['a = "b" # c\n']
+        text2 = ['# "b"\n', '"#"\n']
+        self.assertEqual(
+            scanner.scan(text1, 'F'),
+            ((SourceRange.from_values('F', 1, 5, 1, 7),),
+             (SourceRange.from_values('F', 1, 9, 1, 12),)))
+        self.assertEqual(
+            scanner.scan(text2, 'F'),
+            ((SourceRange.from_values('F', 2, 1, 2, 3),),
+             (SourceRange.from_values('F', 1, 1, 1, 6),)))
+        self.assertEqual(scanner.scan(text1, 'F'),
+                         scanner.scan(text1, 'F'))
+
+    def test_no_delimiters(self):
+        scanner = AnnotationScanner({}, {}, {}, {})
+        self.assertEqual(scanner.scan(['"a" # b\n'], 'F'), ((), ()))
+
+
+class LanguageSpecTest(unittest.TestCase):
+
+    def setUp(self):
+        get_language_spec.cache_clear()
+
+    def test_spec(self):
+        uut = LanguageSpec(LanguageDefinition('python 3'))
+        self.assertEqual(uut.comments, {'#': ''})
+        self.assertIn("'''", uut.multiline_string_delimiters)
+        with self.assertRaises(TypeError):
+            uut.string_delimiters['`'] = '`'
+
+        uut = LanguageSpec(LanguageDefinition('c'))
+        self.assertEqual(uut.indent_types, {'{': '}'})
+        self.assertEqual(uut.encapsulators, {'(': ')', '[': ']'})
+        self.assertEqual(uut.comments, {'//': '', '/*': '*/'})
+
+    def test_cache(self):
+        spec = get_language_spec('c')
+        self.assertIs(get_language_spec('c'), spec)
+        self.assertIsNot(get_language_spec('python 3'), spec)
+        cache_info = get_language_spec.cache_info()
+        self.assertEqual(cache_info.hits, 1)
+        self.assertEqual(cache_info.misses, 2)
+
+    def test_unknown_language(self):
+        with self.assertRaises(FileNotFoundError):
+            get_language_spec('Valyrian')
+        self.assertEqual(get_language_spec.cache_info().currsize, 0)
@@ -0,0 +1,117 @@
+from collections import Counter
+import os
+from queue import Queue
+import unittest
+
+import requests
+import requests_mock
+
+from bears.general.HTTPSBear import get_https_prober
+from bears.general.LinkCheckBear import LinkCheckBear
+from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
+from coalib.settings.Section import Section
+
+
+def custom_matcher(request):
+    """
+    Mocks the status code of every request with the last three characters of
+    the request URL. ``insecure.org`` can not be connected to with https and
+    ``/redirect/301`` redirects to ``/redirect/200``.
+
+    :param request: The ``request`` that the mocker receives.
+    :return:        A mocked ``Response`` object.
+    """
+    if request.scheme == 'https' and request.netloc == 'insecure.org':
+        raise requests.exceptions.SSLError
+    try:
+        status_code = int(request.path_url[-3:])
+    except ValueError:
+        raise requests.exceptions.ConnectionError
+
+    headers = ({'Location': '/redirect/200'}
+               if request.path_url == '/redirect/301' else {})
+    return requests_mock.create_response(request, status_code=status_code,
+                                         headers=headers)
+
+
+class LinkCheckBearTest(unittest.TestCase):
+
+    def setUp(self):
+        get_https_prober.cache_clear()
+        self.section = Section('')
+        self.file_dict = {
+            'a.md': ('https://coala.io/200\n',
+                     'http://secure.org/200 https://coala.io/404\n'),
+            'b.md': ('https://coala.io/404\n',
+                     'http://insecure.org/200\n',
+                     'https://coala.io/redirect/301\n'),
+            'c.md': ('https://coala.io/200 http://secure.org/200\n',
+                     'https://unreachable.org/\n'),
+        }
+
+    def get_results(self, **kwargs):
+        uut = LinkCheckBear(self.file_dict, self.section, Queue())
+        with requests_mock.Mocker() as m:
+            m.add_matcher(custom_matcher)
+            results = list(uut.run(**kwargs))
+        return results, Counter(request.url for request in m.request_history)
+
+    def test_run(self):
+        results, requests_sent = self.get_results()
+
+        self.assertEqual(
+            [(os.path.basename(result.affected_code[0].file),
+              result.affected_code[0].start.line,
+              result.message, result.severity)
+             for result in results],
+            [('a.md', 2, 'https can be used instead of http',
+              RESULT_SEVERITY.NORMAL),
+             ('a.md', 2, 'Broken link - HTTP Error: 404 generated when '
+                         'connecting to https://coala.io/404',
+              RESULT_SEVERITY.NORMAL),
+             ('b.md', 1, 'Broken link - HTTP Error: 404 generated when '
+                         'connecting to https://coala.io/404',
+              RESULT_SEVERITY.NORMAL),
+             ('c.md', 1, 'https can be used instead of http',
+              RESULT_SEVERITY.NORMAL),
+             ('c.md', 2, 'Broken link - unable to connect to '
+                         'https://unreachable.org/',
+              RESULT_SEVERITY.MAJOR)])
+        self.assertEqual(results[0].diffs['a.md'].modified,
+                         ['https://coala.io/200\n',
+                          'https://secure.org/200 https://coala.io/404\n'])
+
+        # Every distinct link is requested once, no matter how often it
+        # occurs. Redirects are not followed by default.
+        self.assertEqual(set(requests_sent.values()), {1})
+        self.assertEqual(set(requests_sent), {
+            'https://coala.io/200', 'https://coala.io/404',
+            'https://coala.io/redirect/301', 'https://unreachable.org/',
+            'http://secure.org/200', 'http://insecure.org/200',
+            'https://secure.org/200', 'https://insecure.org/200'})
+
+    def test_follow_redirects(self):
+        results, requests_sent = self.get_results(follow_redirects=True,
+                                                  check_https=False)
+
+        redirects = [result for result in results
+                     if result.message.startswith('This link redirects')]
+        self.assertEqual(len(redirects), 1)
+        self.assertEqual(redirects[0].message,
+                         'This link redirects to '
+                         'https://coala.io/redirect/200')
+        self.assertEqual(redirects[0].diffs['b.md'].modified[2],
+                         'https://coala.io/redirect/200\n')
+        self.assertNotIn('https://secure.org/200', requests_sent)
+        self.assertEqual(requests_sent['https://coala.io/redirect/200'], 1)
+
+    def test_link_ignore_list(self):
+        results, requests_sent = self.get_results(
+            link_ignore_list=['https://coala.io/**'], check_https=False)
+
+        self.assertEqual([result.message for result in results],
+                         ['Broken link - unable to connect to '
+                          'https://unreachable.org/'])
+        self.assertEqual(set(requests_sent), {'http://secure.org/200',
+                                              'http://insecure.org/200',
+                                              'https://unreachable.org/'})
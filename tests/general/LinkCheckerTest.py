@@ -0,0 +1,180 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
+from socketserver import ThreadingMixIn
+import threading
+import time
+import unittest
+
+import requests
+
+from bears.general.LinkChecker import get_link_checker, LinkChecker
+from bears.general.LinkStatusCache import LinkStatusCache
+
+
+class ThreadingHTTPServer(ThreadingMixIn, HTTPServer):
+    daemon_threads = True
+
+
+class StatusHandler(BaseHTTPRequestHandler):
+    """
+    Responds with the status code given as last part of the path, after
+    waiting for ``delay`` seconds. The first request to a path starting with
+    ``/flaky/`` is rejected with HTTP 429.
+    """
+    protocol_version = 'HTTP/1.1'
+    delay = 0
+    lock = threading.Lock()
+    rejected = set()
+    requests = 0
+    running = 0
+    max_running = 0
+
+    def do_HEAD(self):
+        cls = type(self)
+        with cls.lock:
+            cls.requests += 1
+            cls.running += 1
+            cls.max_running = max(cls.max_running, cls.running)
+        time.sleep(cls.delay)
+        with cls.lock:
+            cls.running -= 1
+
+        path = self.path.split('?')[0]
+        if path.startswith('/flaky/') and path not in cls.rejected:
+            cls.rejected.add(path)
+            self.send_response(429)
+            self.send_header('Retry-After', '0')
+        else:
+            self.send_response(int(path.rsplit('/', 1)[-1]))
+        if path.startswith('/redirect/'):
+            self.send_header('Location', '/200')
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class LinkCheckerTest(unittest.TestCase):
+
+    def setUp(self):
+        StatusHandler.delay = 0
+        StatusHandler.max_running = 0
+        StatusHandler.requests = 0
+        StatusHandler.rejected = set()
+        self.server = ThreadingHTTPServer(('127.0.0.1', 0), StatusHandler)
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        self.base_url = 'http://127.0.0.1:%d' % self.server.server_port
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_head(self):
+        uut = LinkChecker()
+        self.assertEqual(uut.head(self.base_url + '/200', 5).status_code, 200)
+        self.assertEqual(uut.head(self.base_url + '/404', 5).status_code, 404)
+
+        response = uut.head(self.base_url + '/redirect/301', 5)
+        self.assertEqual(response.status_code, 301)
+        self.assertEqual(response.history, [])
+
+        self.assertIsInstance(uut.head('http://127.0.0.1:1/200', 5),
+                              requests.exceptions.ConnectionError)
+
+    def test_retry(self):
+        uut = LinkChecker()
+        self.assertEqual(uut.head(self.base_url + '/flaky/200', 5).status_code,
+                         200)
+        self.assertEqual(StatusHandler.requests, 2)
+
+        host = '127.0.0.1:%d' % self.server.server_port
+        self.assertEqual(uut.scheduler.metrics['requests'], {host: 2})
+        self.assertEqual(uut.scheduler.metrics['retries'], {host: 1})
+
+        uut = LinkChecker(max_retries=0)
+        self.assertEqual(
+            uut.head(self.base_url + '/flaky/201', 5).status_code, 429)
+
+    def test_session_reuse(self):
+        uut = LinkChecker()
+        host = '127.0.0.1:%d' % self.server.server_port
+        self.assertIs(uut.get_session(host), uut.get_session(host))
+        self.assertIsNot(uut.get_session(host), uut.get_session('coala.io'))
+        self.assertIs(get_link_checker(), get_link_checker())
+
+    def test_head_all(self):
+        urls = [self.base_url + '/' + str(code)
+                for code in (200, 404, 200, 500, 301)]
+        timeouts = []
+
+        def get_timeout(host):
+            timeouts.append(host)
+            return 5
+
+        responses = LinkChecker().head_all(urls, get_timeout)
+        self.assertEqual(list(responses), list(dict.fromkeys(urls)))
+        self.assertEqual(
+            [response.status_code for response in responses.values()],
+            [200, 404, 500, 301])
+        self.assertEqual(
+            timeouts, ['127.0.0.1:%d' % self.server.server_port] * 4)
+
+    def test_status_cache(self):
+        uut = LinkChecker()
+        status_cache = LinkStatusCache()
+        urls = [self.base_url + '/200', self.base_url + '/404']
+        for _ in range(2):
+            responses = uut.head_all(urls, lambda host: 5, status_cache)
+            self.assertEqual(
+                [response.status_code for response in responses.values()],
+                [200, 404])
+        self.assertEqual(StatusHandler.requests, 2)
+
+        self.assertEqual(
+            uut.head(self.base_url + '/404', 5, status_cache).status_code,
+            404)
+        self.assertEqual(StatusHandler.requests, 2)
+
+    def test_follow_redirects(self):
+        uut = LinkChecker()
+        responses = uut.follow_redirects(self.base_url + '/redirect/301', 5)
+        self.assertEqual([response.status_code for response in responses],
+                         [301, 200])
+        self.assertEqual([response.url for response in responses],
+                         [self.base_url + '/redirect/301',
+                          self.base_url + '/200'])
+
+        responses = uut.follow_redirects(self.base_url + '/redirect/301', 5,
+                                         max_hops=0)
+        self.assertEqual(len(responses), 1)
+
+        status_cache = LinkStatusCache()
+        for _ in range(2):
+            responses = uut.follow_redirects(
+                self.base_url + '/redirect/302', 5, status_cache)
+            self.assertEqual(
+                [response.status_code for response in responses], [302, 200])
+        self.assertEqual(StatusHandler.requests, 5)
+
+    def test_follow_all_redirects(self):
+        uut = LinkChecker()
+        urls = [self.base_url + '/redirect/301', self.base_url + '/200',
+                self.base_url + '/redirect/302']
+        chains = uut.follow_all_redirects(
+            uut.head_all(urls, lambda host: 5), lambda host: 5)
+
+        self.assertEqual(list(chains), [urls[0], urls[2]])
+        self.assertEqual(
+            [[response.status_code for response in chain]
+             for chain in chains.values()],
+            [[301, 200], [302, 200]])
+        self.assertEqual(StatusHandler.requests, 5)
+
+    def test_max_per_host(self):
+        StatusHandler.delay = 0.05
+        urls = [self.base_url + '/200?' + str(i) for i in range(12)]
+        responses = LinkChecker(8, 3).head_all(urls, lambda host: 5)
+
+        self.assertEqual(len(responses), 12)
+        self.assertEqual(StatusHandler.max_running, 3)
@@ -0,0 +1,91 @@
+import os
+from tempfile import TemporaryDirectory
+import unittest
+
+import requests
+
+from bears.general.LinkStatusCache import (
+    get_link_status_cache, LinkStatus, LinkStatusCache, normalize_url)
+
+
+class NormalizeURLTest(unittest.TestCase):
+
+    def test_normalize_url(self):
+        self.assertEqual(normalize_url('HTTP://Coala.IO:80#about'),
+                         'http://coala.io/')
+        self.assertEqual(normalize_url('https://coala.io:443/a/B?c=D'),
+                         'https://coala.io/a/B?c=D')
+        self.assertEqual(normalize_url('https://coala.io:8080/'),
+                         'https://coala.io:8080/')
+        self.assertEqual(normalize_url('git+https://github.com:443/a'),
+                         'git+https://github.com/a')
+        self.assertEqual(normalize_url('xhttp://coala.io:80/'),
+                         'xhttp://coala.io:80/')
+
+
+class LinkStatusCacheTest(unittest.TestCase):
+
+    def setUp(self):
+        self.uut = LinkStatusCache()
+
+    def test_get_set(self):
+        self.assertIsNone(self.uut.get('https://coala.io'))
+
+        status = LinkStatus(200, None, 1e12, None, None)
+        self.uut.set('https://coala.io', status)
+        self.assertEqual(self.uut.get('https://COALA.io/#top'), status)
+        self.assertIsNone(self.uut.get('https://coala.io/about'))
+
+    def test_ttl(self):
+        uut = LinkStatusCache(ttls={'5xx': 0})
+        uut.set('https://coala.io/200', LinkStatus(200, None, 0, None, None))
+        uut.set('https://coala.io/503',
+                LinkStatus(503, None, 1e12, None, None))
+        self.assertIsNone(uut.get('https://coala.io/200'))
+        self.assertIsNotNone(uut.get('https://coala.io/503'))
+
+        uut.set('https://coala.io/503', LinkStatus(503, None, 0, None, None))
+        self.assertIsNone(uut.get('https://coala.io/503'))
+
+        self.assertEqual(uut.get_ttl(LinkStatus(404, None, 0, None, None)),
+                         LinkStatusCache.DEFAULT_TTLS['4xx'])
+        self.assertEqual(uut.get_ttl(LinkStatus(None, None, 0, 'Timeout',
+                                                'Timed out')),
+                         LinkStatusCache.DEFAULT_TTLS['error'])
+
+    def test_responses(self):
+        self.assertIsNone(self.uut.get_response('https://coala.io'))
+
+        response = requests.models.Response()
+        response.status_code = 301
+        response.headers['Location'] = 'https://coala.io/'
+        self.uut.set_response('http://coala.io', response)
+        cached = self.uut.get_response('http://coala.io')
+        self.assertEqual(cached.status_code, 301)
+        self.assertEqual(cached.url, 'http://coala.io')
+        self.assertTrue(cached.is_redirect)
+        self.assertEqual(self.uut.get('http://coala.io').redirect_target,
+                         'https://coala.io/')
+
+        self.uut.set_response('https://coala.io',
+                              requests.exceptions.ConnectTimeout('Timed out'))
+        cached = self.uut.get_response('https://coala.io')
+        self.assertIsInstance(cached, requests.exceptions.ConnectTimeout)
+        self.assertEqual(str(cached), 'Timed out')
+        self.assertEqual(self.uut.get('https://coala.io').error_class,
+                         'ConnectTimeout')
+
+    def test_cache_file(self):
+        with TemporaryDirectory() as directory:
+            cache_file = os.path.join(directory, 'links.sqlite')
+            status = LinkStatus(404, None, 1e12, None, None)
+            LinkStatusCache(cache_file).set('https://coala.io', status)
+
+            self.assertEqual(LinkStatusCache(cache_file).get(
+                'https://coala.io'), status)
+            self.assertIsNone(LinkStatusCache().get('https://coala.io'))
+
+    def test_get_link_status_cache(self):
+        self.assertIsNone(get_link_status_cache(''))
+        self.assertIs(get_link_status_cache(':memory:'),
+                      get_link_status_cache(':memory:'))
@@ -1,15 +1,22 @@
+from http.server import BaseHTTPRequestHandler, HTTPServer
 import io
 import json
 import os
 import requests
 import requests_mock
+from socketserver import ThreadingMixIn
+from tempfile import TemporaryDirectory
+import threading
+import time
 import unittest
 
-from bears.general.MementoBear import MementoBear
+from bears.general.MementoBear import (
+    ArchiveStatusCache, get_memento_archive, MementoArchive, MementoBear)
 from bears.general.URLHeadBear import URLHeadBear
 
 from coalib.results.Result import Result
 from coalib.settings.Section import Section
+from coalib.settings.Setting import Setting
 from coalib.results.RESULT_SEVERITY import RESULT_SEVERITY
 from coalib.testing.LocalBearTestHelper import LocalBearTestHelper
 
@@ -243,6 +250,10 @@ class MementoBearTest(LocalBearTestHelper):
         http://redirect9times.com
         """.splitlines()
 
+        # requests_mock does not patch requests made from other threads
+        # reliably, so the redirects are followed one at a time.
+        self.section.append(Setting('max_concurrent_requests', '1'))
+
         with requests_mock.Mocker() as m:
             m.add_matcher(custom_matcher)
 
@@ -266,6 +277,10 @@ class MementoBearTest(LocalBearTestHelper):
         http://redirect5times.com
         """.splitlines()
 
+        # requests_mock does not patch requests made from other threads
+        # reliably, so the redirects are followed one at a time.
+        self.section.append(Setting('max_concurrent_requests', '1'))
+
         with requests_mock.Mocker() as m:
             m.add_matcher(custom_matcher)
             generate_redirects(m, 'http://redirect5times.com', 5)
@@ -306,3 +321,118 @@ class MementoBearTest(LocalBearTestHelper):
             self.check_validity(
                 self.uut, valid_file,
                 settings={'link_ignore_list': link_ignore_list})
+
+
+class StubTimeGate(ThreadingMixIn, HTTPServer):
+    """
+    A Memento TimeGate redirecting to a memento for all paths containing
+    ``archived`` but not ``not``. All other paths respond with 200.
+    """
+    daemon_threads = True
+
+
+class StubTimeGateHandler(BaseHTTPRequestHandler):
+    protocol_version = 'HTTP/1.1'
+    lock = threading.Lock()
+    timegate_requests = 0
+
+    def do_HEAD(self):
+        base_uri = 'http://127.0.0.1:%d' % self.server.server_port
+        if self.path.startswith('/timegate/'):
+            with self.lock:
+                type(self).timegate_requests += 1
+            uri = self.path[len('/timegate/'):]
+            if 'archived' in uri and 'not' not in uri:
+                memento_uri = base_uri + '/memento/' + uri
+                self.send_response(302)
+                self.send_header('Location', memento_uri)
+                self.send_header('Vary', 'Accept-Datetime')
+                self.send_header(
+                    'Link',
+                    '<%s>; rel="original", <%s>; rel="memento first"; '
+                    'datetime="Fri, 21 Apr 2017 07:09:37 GMT"'
+                    % (uri, memento_uri))
+            else:
+                self.send_response(404)
+        elif self.path.startswith('/memento/'):
+            self.send_response(200)
+            self.send_header('Memento-Datetime',
+                             'Fri, 21 Apr 2017 07:09:37 GMT')
+        else:
+            self.send_response(200)
+        self.send_header('Content-Length', '0')
+        self.end_headers()
+
+    def log_message(self, *args):
+        pass
+
+
+class MementoArchiveTest(unittest.TestCase):
+
+    def setUp(self):
+        StubTimeGateHandler.timegate_requests = 0
+        self.server = StubTimeGate(('127.0.0.1', 0), StubTimeGateHandler)
+        threading.Thread(target=self.server.serve_forever,
+                         daemon=True).start()
+        self.base_uri = 'http://127.0.0.1:%d' % self.server.server_port
+        self.links = [self.base_uri + '/page/archived',
+                      self.base_uri + '/page/notarchived',
+                      self.base_uri + '/other/archived']
+
+    def tearDown(self):
+        self.server.shutdown()
+        self.server.server_close()
+
+    def test_check_all(self):
+        uut = MementoArchive(timegate_uri=self.base_uri + '/timegate/')
+        self.assertEqual(uut.check_all(self.links + self.links[:1]),
+                         dict(zip(self.links, [True, False, True])))
+        # memento_client asks the TimeGate twice for links without mementos.
+        self.assertEqual(StubTimeGateHandler.timegate_requests, 4)
+
+        self.assertEqual(
+            MementoArchive(1, timegate_uri=self.base_uri + '/timegate/'
+                           ).check_all(self.links),
+            dict(zip(self.links, [True, False, True])))
+
+    def test_cache(self):
+        uut = MementoArchive(cache=ArchiveStatusCache(),
+                             timegate_uri=self.base_uri + '/timegate/')
+        for _ in range(2):
+            self.assertEqual(uut.check_all(self.links),
+                             dict(zip(self.links, [True, False, True])))
+        self.assertEqual(StubTimeGateHandler.timegate_requests, 4)
+
+    def test_get_memento_archive(self):
+        self.assertIsNone(get_memento_archive(8, '').cache)
+        self.assertIs(get_memento_archive(8, ':memory:'),
+                      get_memento_archive(8, ':memory:'))
+
+
+class ArchiveStatusCacheTest(unittest.TestCase):
+
+    def test_get_set(self):
+        uut = ArchiveStatusCache()
+        self.assertIsNone(uut.get('https://coala.io'))
+        uut.set('https://coala.io', True)
+        uut.set('https://coala.io/new', False)
+        self.assertTrue(uut.get('https://Coala.io/'))
+        self.assertIs(uut.get('https://coala.io/new'), False)
+
+    def test_ttl(self):
+        uut = ArchiveStatusCache()
+        two_days_ago = time.time() - 2 * 24 * 60 * 60
+        uut.statuses['https://coala.io/'] = (1, two_days_ago)
+        uut.statuses['https://coala.io/new'] = (0, two_days_ago)
+        uut.statuses['https://coala.io/old'] = (
+            1, two_days_ago - ArchiveStatusCache.ARCHIVED_TTL)
+        self.assertTrue(uut.get('https://coala.io/'))
+        self.assertIsNone(uut.get('https://coala.io/new'))
+        self.assertIsNone(uut.get('https://coala.io/old'))
+
+    def test_cache_file(self):
+        with TemporaryDirectory() as directory:
+            cache_file = os.path.join(directory, 'archive.sqlite')
+            ArchiveStatusCache(cache_file).set('https://coala.io', False)
+            self.assertIs(
+                ArchiveStatusCache(cache_file).get('https://coala.io'), False)
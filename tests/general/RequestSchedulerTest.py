@@ -0,0 +1,132 @@
+from email.utils import formatdate
+import threading
+import time
+import unittest
+from unittest.mock import patch
+
+import requests
+
+from bears.general.RequestScheduler import (
+    parse_retry_after, RequestScheduler, TokenBucket)
+
+
+def get_response(status_code, retry_after=None):
+    response = requests.models.Response()
+    response.status_code = status_code
+    if retry_after is not None:
+        response.headers['Retry-After'] = retry_after
+    return response
+
+
+class TokenBucketTest(unittest.TestCase):
+
+    def test_take(self):
+        uut = TokenBucket(2)
+        self.assertEqual(uut.capacity, 2)
+        self.assertEqual(uut.take(), 0)
+        self.assertEqual(uut.take(), 0)
+        self.assertAlmostEqual(uut.take(), 0.5, places=2)
+        self.assertAlmostEqual(uut.take(), 1, places=2)
+
+        self.assertEqual(TokenBucket(0.5).capacity, 1)
+
+
+class ParseRetryAfterTest(unittest.TestCase):
+
+    def test_parse_retry_after(self):
+        self.assertEqual(parse_retry_after('120'), 120)
+        self.assertEqual(parse_retry_after('-1'), 0)
+        self.assertAlmostEqual(
+            parse_retry_after(formatdate(time.time() + 30, usegmt=True)),
+            30, delta=2)
+        self.assertEqual(
+            parse_retry_after(formatdate(time.time() - 30, usegmt=True)), 0)
+        self.assertIsNone(parse_retry_after('soon'))
+
+
+class RequestSchedulerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.uut = RequestScheduler(max_retries=2, backoff=0.5,
+                                    max_retry_wait=10)
+
+    def test_get_retry_delay(self):
+        self.assertIsNone(self.uut.get_retry_delay(get_response(200), 0))
+        self.assertIsNone(self.uut.get_retry_delay(get_response(404), 0))
+        self.assertIsNone(self.uut.get_retry_delay(
+            requests.exceptions.ConnectionError(), 0))
+        self.assertIsNone(self.uut.get_retry_delay(get_response(503), 0))
+
+        self.assertEqual(self.uut.get_retry_delay(get_response(429), 0), 0.5)
+        self.assertEqual(self.uut.get_retry_delay(get_response(429), 1), 1)
+        self.assertIsNone(self.uut.get_retry_delay(get_response(429), 2))
+        self.assertEqual(
+            self.uut.get_retry_delay(get_response(429, '3'), 0), 3)
+        self.assertEqual(
+            self.uut.get_retry_delay(get_response(503, '2'), 1), 2)
+        self.assertEqual(
+            self.uut.get_retry_delay(get_response(503, 'soon'), 1), 1)
+        self.assertIsNone(
+            self.uut.get_retry_delay(get_response(429, '3600'), 0))
+
+    def test_send(self):
+        responses = [get_response(429, '0'), get_response(503, '0'),
+                     get_response(200)]
+        with patch('time.sleep') as sleep:
+            self.assertEqual(
+                self.uut.send('coala.io', lambda: responses.pop(0))
+                .status_code,
+                200)
+            sleep.assert_called_with(0)
+
+        responses = [get_response(429, '0')] * 4
+        self.assertEqual(
+            self.uut.send('gitlab.com', lambda: responses.pop(0)).status_code,
+            429)
+        self.assertEqual(len(responses), 1)
+
+        metrics = self.uut.metrics
+        self.assertEqual(metrics['requests'], {'coala.io': 3,
+                                               'gitlab.com': 3})
+        self.assertEqual(metrics['retries'], {'coala.io': 2,
+                                              'gitlab.com': 2})
+        self.assertGreaterEqual(metrics['queue_wait'], 0)
+
+    def test_slot_limits(self):
+        uut = RequestScheduler(max_concurrent=3, max_per_host=2)
+        lock = threading.Lock()
+        running = {'a': 0, 'b': 0, 'c': 0, 'total': 0}
+        maximum = dict(running)
+
+        def request(host):
+            with uut.slot(host):
+                with lock:
+                    for key in (host, 'total'):
+                        running[key] += 1
+                        maximum[key] = max(maximum[key], running[key])
+                time.sleep(0.02)
+                with lock:
+                    running[host] -= 1
+                    running['total'] -= 1
+
+        threads = [threading.Thread(target=request, args=(host,))
+                   for host in 'abc' * 4]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        self.assertEqual(maximum['total'], 3)
+        self.assertLessEqual(max(maximum[host] for host in 'abc'), 2)
+        self.assertEqual(uut.metrics['requests'], {'a': 4, 'b': 4, 'c': 4})
+
+    def test_rate_limit(self):
+        uut = RequestScheduler(requests_per_second=20)
+        start = time.monotonic()
+        for _ in range(25):
+            with uut.slot('coala.io'):
+                pass
+        with uut.slot('gitlab.com'):
+            pass
+        self.assertGreaterEqual(time.monotonic() - start, 0.2)
+        self.assertGreater(uut.metrics['queue_wait'], 0.2)
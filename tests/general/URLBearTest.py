@@ -2,6 +2,7 @@ import unittest
 import requests_mock
 
 from bears.general.URLBear import URLBear, LINK_CONTEXT, URLResult
+from coalib.parsing.Globbing import fnmatch
 from coalib.results.SourceRange import SourceRange
 from coalib.testing.LocalBearTestHelper import get_results
 from coalib.settings.Section import Section
@@ -53,6 +54,35 @@ class URLBearTest(unittest.TestCase):
                                'yes-green.svg/200'),
                               LINK_CONTEXT.no_context])
 
+    def test_extract_links_from_file(self):
+        for file in (['http://a.org/1 http://b.org/2\n', '\n',
+                      '<x xmlns="http://c.org/3">http://d.org/4.</x>\n',
+                      'http://a.org/1'],
+                     ['http://a.org/1 http://b.org/2', '',
+                      '<x xmlns="http://c.org/3">http://d.org/4.</x>',
+                      'http://a.org/1']):
+            self.assertEqual(
+                list(URLBear.extract_links_from_file(file, 'b.org', '')),
+                [('http://a.org/1', 0, LINK_CONTEXT.no_context),
+                 ('http://c.org/3', 2, LINK_CONTEXT.xml_namespace),
+                 ('http://d.org/4', 2, LINK_CONTEXT.no_context),
+                 ('http://a.org/1', 3, LINK_CONTEXT.no_context)])
+
+        self.assertEqual(list(URLBear.extract_links_from_file([], '', '')),
+                         [])
+
+    def test_extract_links_from_file_ignore_list(self):
+        file = ['http://coala.io http://coala.io/docs/index.html\n',
+                'https://github.com/coala http://a.b/c\n']
+        for globs in [('',), ('http://coala.io/*',),
+                      ('http://coala.io/**', 'https://(github|gitlab).com/*'),
+                      ['http://[a-c].?/c']]:
+            self.assertEqual(
+                [link for link, _, _ in URLBear.extract_links_from_file(
+                    file, '$^', globs)],
+                [link for line in file for link in line.split()
+                 if not fnmatch(link, globs)])
+
 
 class URLResultTest(unittest.TestCase):
 
@@ -2,10 +2,12 @@ import unittest
 import requests
 import requests_mock
 
+from bears.general.LinkStatusCache import get_link_status_cache
 from bears.general.URLHeadBear import URLHeadBear, LINK_CONTEXT, URLHeadResult
 from coalib.results.SourceRange import SourceRange
 from coalib.testing.LocalBearTestHelper import get_results
 from coalib.settings.Section import Section
+from coalib.settings.Setting import Setting
 from queue import Queue
 from .InvalidLinkBearTest import custom_matcher
 
@@ -60,6 +62,54 @@ class URLHeadBearTest(unittest.TestCase):
                              [3, 'http://www.google.com/404',
                               404, LINK_CONTEXT.no_context])
 
+    def test_link_status_cache(self):
+        file_contents = """
+        http://www.facebook.com/200
+        http://www.google.com/404
+        """.splitlines()
+        self.section.append(Setting('link_status_cache', ':memory:'))
+        get_link_status_cache.cache_clear()
+
+        with requests_mock.Mocker() as m:
+            m.add_matcher(custom_matcher)
+            uncached = get_results(self.uut, file_contents)
+            cached = get_results(self.uut, file_contents)
+            self.assertEqual(m.call_count, 2)
+
+        self.assertEqual([result.contents for result in uncached],
+                         [result.contents for result in cached])
+
+    def test_redirect_chain(self):
+        file_contents = """
+        http://redirect.com
+        http://www.google.com/200
+        """.splitlines()
+
+        with requests_mock.Mocker() as m:
+            m.add_matcher(custom_matcher)
+            m.head('http://redirect.com', status_code=301,
+                   headers={'Location': 'https://redirect.com/'})
+            m.head('https://redirect.com/', status_code=302,
+                   headers={'Location': '/final'})
+            m.head('https://redirect.com/final', status_code=200)
+
+            results = get_results(self.uut, file_contents)
+            self.assertEqual(results[0].redirect_chain,
+                             ('http://redirect.com/',
+                              'https://redirect.com/',
+                              'https://redirect.com/final'))
+            self.assertIsNone(results[1].redirect_chain)
+            self.assertEqual(m.call_count, 4)
+
+            self.section.append(Setting('max_redirects', '1'))
+            self.assertIsNone(
+                get_results(self.uut, file_contents)[0].redirect_chain)
+
+            self.section.append(Setting('max_redirects', '0'))
+            self.assertIsNone(
+                get_results(self.uut, file_contents)[0].redirect_chain)
+            self.assertEqual(m.call_count, 4 + 3 + 2)
+
 
 class URLHeadResultTest(unittest.TestCase):
 
@@ -0,0 +1,93 @@
+import os
+import stat
+import sys
+from tempfile import TemporaryDirectory
+import unittest
+from zipfile import ZipFile
+
+from bears.java.JarWorker import (
+    get_jar_worker, get_main_class, JarWorker, JarWorkerError)
+
+
+# Answers requests like JarWorker.java, echoing the arguments. The request
+# "crash" makes it exit, if the file "broken" exists it fails to start.
+FAKE_JAVA = r"""#!{python}
+import os, sys
+if os.path.exists('broken'):
+    sys.exit(1)
+assert sys.argv[1:3] == ['-Djava.security.manager=allow', '-cp']
+assert sys.argv[-1] == 'org.example.Main'
+for request in sys.stdin.buffer:
+    request = request.rstrip(b'\n')
+    if request == b'crash':
+        sys.exit(1)
+    out = request.replace(b'\t', b' ') + b'\n'
+    err = b'warning\n'
+    sys.stdout.buffer.write(b'3 %d %d\n' % (len(out), len(err)) + out + err)
+    sys.stdout.buffer.flush()
+"""
+
+
+class JarWorkerTest(unittest.TestCase):
+
+    def setUp(self):
+        self.directory = TemporaryDirectory()
+        self.jar_file = os.path.join(self.directory.name, 'tool.jar')
+        with ZipFile(self.jar_file, 'w') as jar:
+            jar.writestr('META-INF/MANIFEST.MF',
+                         'Manifest-Version: 1.0\r\n'
+                         'Main-Class: org.example.Ma\r\n'
+                         ' in\r\n')
+        self.java = os.path.join(self.directory.name, 'java')
+        with open(self.java, 'w') as file:
+            file.write(FAKE_JAVA.format(python=sys.executable))
+        os.chmod(self.java, stat.S_IRWXU)
+        self.uut = JarWorker(self.jar_file, self.directory.name, self.java)
+
+    def tearDown(self):
+        self.uut.stop()
+        self.directory.cleanup()
+
+    def test_get_main_class(self):
+        self.assertEqual(get_main_class(self.jar_file), 'org.example.Main')
+        self.assertIsNone(get_main_class(self.java))
+        self.assertIsNone(get_main_class(
+            os.path.join(self.directory.name, 'missing.jar')))
+
+    def test_run(self):
+        self.assertEqual(self.uut.run(('-c', 'a.java', 'b.java')),
+                         (3, '-c a.java b.java\n', 'warning\n'))
+        process = self.uut.process
+        self.assertEqual(self.uut.run(()), (3, '\n', 'warning\n'))
+        self.assertIs(self.uut.process, process)
+
+        with self.assertRaisesRegex(JarWorkerError, 'tabs or newlines'):
+            self.uut.run(('a\tb.java',))
+
+    def test_restart(self):
+        self.uut.run(('a.java',))
+        self.uut.process.stdin.write(b'crash\n')
+        self.uut.process.stdin.flush()
+        self.uut.process.wait()
+
+        self.assertEqual(self.uut.run(('b.java',)),
+                         (3, 'b.java\n', 'warning\n'))
+
+    def test_broken(self):
+        open(os.path.join(self.directory.name, 'broken'), 'w').close()
+        with self.assertRaisesRegex(JarWorkerError, 'exited'):
+            self.uut.run(('a.java',))
+        self.assertIsNotNone(self.uut.error)
+
+        os.remove(os.path.join(self.directory.name, 'broken'))
+        with self.assertRaises(JarWorkerError):
+            self.uut.run(('a.java',))
+
+        self.uut.executable = os.path.join(self.directory.name, 'missing')
+        self.uut.error = None
+        with self.assertRaises(JarWorkerError):
+            self.uut.run(('a.java',))
+
+    def test_get_jar_worker(self):
+        self.assertIs(get_jar_worker(self.jar_file),
+                      get_jar_worker(self.jar_file))
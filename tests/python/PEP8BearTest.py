@@ -1,6 +1,10 @@
 from queue import Queue
+from unittest.case import skipUnless
+from unittest.mock import patch
 
-from bears.python.PEP8Bear import PEP8Bear
+from bears.python.PEP8Bear import (
+    CHECKS_OVER_INDENTATION, get_changed_region_diff, PEP8Bear)
+from coalib.results.Diff import Diff
 from coalib.testing.LocalBearTestHelper import LocalBearTestHelper
 from coalib.settings.Section import Section
 from coalib.settings.Setting import Setting
@@ -50,3 +54,56 @@ class PEP8BearTest(LocalBearTestHelper):
     def test_invalid(self):
         self.check_invalidity(self.uut, [''])
         self.check_invalidity(self.uut, ['a=1+1'])
+
+    @skipUnless(CHECKS_OVER_INDENTATION,
+                'pycodestyle before 2.5 has no E117 check')
+    def test_is_clean(self):
+        options = {'ignore': (), 'select': (), 'max_line_length': 79,
+                   'indent_size': 4}
+
+        def is_clean(file, **kwargs):
+            return PEP8Bear.is_clean('test.py', file, ''.join(file),
+                                     dict(options, **kwargs))
+
+        clean_file = ('def func():\n', '    return 1\n')
+        self.assertTrue(is_clean(clean_file))
+        self.assertFalse(is_clean(('a=1\n',)))
+        # autopep8 only fixes W503 and W504 if they are selected.
+        self.assertTrue(is_clean(('a = (1\n', '     + 1)\n')))
+        self.assertFalse(is_clean(('a = (1\n', '     + 1)\n'),
+                                  select=('W503',)))
+        self.assertFalse(is_clean(('a = 1*2\n',)))
+        # Mixed line endings are changed by autopep8.
+        self.assertFalse(is_clean(('a = 1\r\n', 'b = 2\n')))
+        self.assertFalse(is_clean(('',)))
+        self.assertFalse(is_clean(clean_file, indent_size=2))
+        # Wrong indentation is always checked, autopep8 reindents files
+        # unless E101 and E111 are ignored.
+        self.assertFalse(is_clean(('if True:\n', '        pass\n'),
+                                  ignore=('E1',)))
+        self.assertTrue(is_clean(('a = 1;\n',), ignore=('E703',)))
+
+    def test_is_clean_without_over_indentation_check(self):
+        options = {'ignore': (), 'select': (), 'max_line_length': 79,
+                   'indent_size': 4}
+        with patch('bears.python.PEP8Bear.CHECKS_OVER_INDENTATION', False):
+            self.assertFalse(PEP8Bear.is_clean('test.py', ['a = 1\n'],
+                                               'a = 1\n', options))
+
+    def test_changed_region_diff(self):
+        file = ['a = 1\n', 'b = 2\n', 'c = 3\n', 'd = 4\n']
+        for corrected in (['a = 1\n', 'b=2\n', 'c = 3\n', 'd = 4\n'],
+                          ['a = 1\n', 'd = 4\n'],
+                          ['x = 0\n'] + file + ['e = 5\n'],
+                          ['a = 1\n', 'b = 2\n', 'c = 3\n'],
+                          file):
+            diff = get_changed_region_diff(file, corrected)
+            self.assertEqual(diff.modified, corrected)
+            self.assertEqual(diff,
+                             Diff.from_string_arrays(file, corrected))
+
+        file += ['e = 5\n']
+        diff = get_changed_region_diff(file, ['a = 1\n', 'b=2\n', 'c = 3\n',
+                                              'd = 4\n', 'e=5\n'])
+        self.assertEqual([part.range('test.py').start.line
+                          for part in diff.split_diff()], [2, 5])
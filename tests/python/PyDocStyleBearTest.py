@@ -29,6 +29,13 @@ PyDocStyleBearTest = verify_local_bear(
     invalid_files=(bad_file,),
     tempfile_kwargs={'suffix': '.py'})
 
+PyDocStyleBearExecutableTest = verify_local_bear(
+    PyDocStyleBear,
+    valid_files=(good_file,),
+    invalid_files=(bad_file,),
+    settings={'in_process': 'false'},
+    tempfile_kwargs={'suffix': '.py'})
+
 PyDocStyleBearIgnoreAllTest = verify_local_bear(
     PyDocStyleBear,
     valid_files=(good_file, bad_file,),
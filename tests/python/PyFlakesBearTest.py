@@ -13,3 +13,9 @@ print("Hi")
 PyFlakesBearTest = verify_local_bear(PyFlakesBear,
                                      valid_files=(good_file,),
                                      invalid_files=(bad_file,))
+
+PyFlakesBearExecutableTest = verify_local_bear(
+    PyFlakesBear,
+    valid_files=(good_file,),
+    invalid_files=(bad_file,),
+    settings={'in_process': 'false'})
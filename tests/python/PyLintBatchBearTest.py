@@ -0,0 +1,74 @@
+import os
+from queue import Queue
+from shutil import which
+import unittest
+from unittest.case import skipIf
+
+from bears.python.PyLintBatchBear import get_batches, PyLintBatchBear
+from bears.python.PyLintBear import PyLintBear
+from coalib.settings.Section import Section
+from coalib.settings.Setting import Setting
+
+
+def get_test_file(name):
+    return os.path.join(os.path.dirname(__file__), 'test_files', name)
+
+
+class GetBatchesTest(unittest.TestCase):
+
+    def test_get_batches(self):
+        files = ['a.py', 'b.py', 'c.py', 'd.py', 'e.py']
+        self.assertEqual(get_batches(files, 2, 4),
+                         [['a.py', 'b.py'], ['c.py', 'd.py'], ['e.py']])
+        self.assertEqual(get_batches(files, 0, 2),
+                         [['a.py', 'b.py', 'c.py'], ['d.py', 'e.py']])
+        self.assertEqual(get_batches(files, 0, 8),
+                         [[file] for file in files])
+        self.assertEqual(get_batches([], 0, 2), [])
+
+
+@skipIf(which('pylint') is None, 'PyLint is not installed')
+class PyLintBatchBearTest(unittest.TestCase):
+
+    def setUp(self):
+        self.section = Section('test section')
+        self.section.append(Setting('pylint_disable', 'C0114,C0115,C0116'))
+        self.file_dict = {}
+        for name in ('pylint_test.py', 'pylint_batch_test.py'):
+            filename = get_test_file(name)
+            with open(filename) as file:
+                self.file_dict[filename] = tuple(file.readlines())
+
+    @staticmethod
+    def get_result_tuples(results):
+        return sorted((result.affected_code[0].file,
+                       result.affected_code[0].start.line,
+                       result.affected_code[0].start.column,
+                       result.message,
+                       result.severity)
+                      for result in results)
+
+    def get_results(self, **settings):
+        for key, value in settings.items():
+            self.section.append(Setting(key, value))
+        uut = PyLintBatchBear(self.file_dict, self.section, Queue())
+        return self.get_result_tuples(uut.run_bear_from_section([], {}))
+
+    def test_results_match_single_files(self):
+        uut = PyLintBear(self.section, Queue())
+        expected = self.get_result_tuples(
+            result
+            for filename, file in self.file_dict.items()
+            for result in uut.run_bear_from_section([], {'filename': filename,
+                                                         'file': file}))
+        self.assertEqual(
+            {os.path.basename(result[0]) for result in expected},
+            {'pylint_test.py', 'pylint_batch_test.py'})
+
+        self.assertEqual(self.get_results(), expected)
+        self.assertEqual(self.get_results(pylint_batch_size='1',
+                                          pylint_processes='2'),
+                         expected)
+
+    def test_pylint_disable(self):
+        self.assertEqual(self.get_results(pylint_disable='all'), [])
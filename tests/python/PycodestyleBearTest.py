@@ -25,6 +25,12 @@ PycodestyleBearTest = verify_local_bear(
     valid_files=(good_file,),
     invalid_files=(bad_file,))
 
+PycodestyleBearExecutableTest = verify_local_bear(
+    PycodestyleBear,
+    valid_files=(good_file,),
+    invalid_files=(bad_file,),
+    settings={'in_process': 'false'})
+
 PycodestyleBearNoIgnoreTest = verify_local_bear(
     PycodestyleBear,
     valid_files=(good_file,),
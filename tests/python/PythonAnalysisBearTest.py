@@ -0,0 +1,106 @@
+import ast
+import pickle
+from queue import Queue
+import tokenize
+import unittest
+
+from bears.python.PythonAnalysisBear import (
+    get_python_analysis, PythonAnalysis, PythonAnalysisBear)
+from bears.python.PyUnusedCodeBear import PyUnusedCodeBear
+from bears.python.RadonBear import RadonBear
+from coalib.results.HiddenResult import HiddenResult
+from coalib.settings.Section import Section
+
+
+test_file = """
+import os
+
+
+def f(x):
+    # return x
+    if x:
+        return x
+    return ''
+""".splitlines(True)
+
+invalid_file = ('def f(:\n',)
+
+
+class PythonAnalysisBearTest(unittest.TestCase):
+
+    def setUp(self):
+        self.section = Section('')
+        self.uut = PythonAnalysisBear(self.section, Queue())
+
+    def get_dependency_results(self, file):
+        return {PythonAnalysisBear.name: list(
+            self.uut.run('test.py', file))}
+
+    def test_run(self):
+        results = self.get_dependency_results(test_file)[
+            PythonAnalysisBear.name]
+        self.assertEqual(len(results), 1)
+        self.assertIsInstance(results[0], HiddenResult)
+
+        analysis = results[0].contents
+        self.assertEqual(analysis.source, ''.join(test_file))
+        self.assertIsInstance(analysis.tree, ast.Module)
+        self.assertIs(analysis.tree, analysis.tree)
+        self.assertEqual(analysis.tokens[0].type, tokenize.NL)
+        self.assertIs(analysis.tokens, analysis.tokens)
+
+        self.assertTrue(analysis.has_comment_lines())
+        self.assertTrue(analysis.has_node(ast.Import, ast.Pass))
+        self.assertFalse(analysis.has_node(ast.Pass))
+
+    def test_invalid_file(self):
+        analysis = PythonAnalysis('test.py', invalid_file)
+        self.assertIsNone(analysis.tree)
+        self.assertTrue(analysis.has_node(ast.Pass))
+
+        analysis = PythonAnalysis('test.py', ('x = (\n',))
+        self.assertIsNone(analysis.tokens)
+        self.assertTrue(analysis.has_comment_lines())
+
+    def test_pickle(self):
+        analysis = PythonAnalysis('test.py', test_file)
+        analysis.tokens, analysis.tree
+        state = pickle.dumps(analysis)
+        self.assertLess(len(state), len(pickle.dumps(analysis.tokens)))
+
+        copy = pickle.loads(state)
+        self.assertEqual(copy.filename, 'test.py')
+        self.assertEqual(copy.source, analysis.source)
+        self.assertEqual(copy.tokens, analysis.tokens)
+        self.assertEqual(ast.dump(copy.tree), ast.dump(analysis.tree))
+
+    def test_get_python_analysis(self):
+        dependency_results = self.get_dependency_results(test_file)
+        self.assertIs(
+            get_python_analysis(dependency_results, 'test.py', test_file),
+            dependency_results[PythonAnalysisBear.name][0].contents)
+
+        analysis = get_python_analysis(None, 'test.py', test_file)
+        self.assertEqual(analysis.source, ''.join(test_file))
+
+    def test_shared_by_bears(self):
+        dependency_results = self.get_dependency_results(test_file)
+        analysis = dependency_results[PythonAnalysisBear.name][0].contents
+
+        results = list(RadonBear(self.section, Queue()).run(
+            'test.py', test_file, dependency_results,
+            cyclomatic_complexity=1))
+        self.assertEqual([result.message for result in results],
+                         ['f has a cyclomatic complexity of 2'])
+        self.assertIsNotNone(analysis._tree)
+
+        results = list(PyUnusedCodeBear(self.section, Queue()).run(
+            'test.py', test_file, dependency_results))
+        self.assertEqual([result.diffs['test.py'].modified
+                          for result in results],
+                         [[line for line in test_file
+                           if line != 'import os\n']])
+
+        file = ('x = 1\n', 'print(x)\n')
+        self.assertEqual(list(PyUnusedCodeBear(self.section, Queue()).run(
+            'test.py', file, self.get_dependency_results(file))), [])